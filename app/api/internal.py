@@ -0,0 +1,70 @@
+"""외부 서비스가 호출하는 내부 콜백 엔드포인트 (/internal)."""
+
+from fastapi import APIRouter, HTTPException, Request
+from loguru import logger
+
+from app.services.callback_service import record_callback
+from app.services.jdpatent_service import JDPATENT_CALLBACK_SOURCE, verify_jdpatent_callback_token
+from app.services.runpod_webhook_service import record_webhook_status, verify_webhook_token
+from app.worker.tasks import check_jdpatent_status, check_ocr_status
+
+internal_router = APIRouter(prefix="/internal", include_in_schema=False)
+
+
+@internal_router.post("/runpod/webhook")
+async def runpod_webhook(request: Request, token: str | None = None):
+    """RunPod 작업 완료 webhook. 본문은 /status 응답과 같은 형식이다."""
+    if not verify_webhook_token(token):
+        raise HTTPException(status_code=403, detail="invalid webhook token")
+
+    payload = await _read_payload(request)
+    job_id = payload.get("id")
+    if not job_id:
+        raise HTTPException(status_code=400, detail="missing job id")
+
+    ctx = await record_webhook_status(job_id, payload)
+    if ctx is not None:
+        # 단계별 모드: fallback 조회를 기다리던 파이프라인을 바로 다음 단계로 보낸다.
+        check_ocr_status.apply_async(args=(ctx, True))
+
+    logger.bind(
+        event="runpod_webhook_received",
+        runpod_job_id=job_id,
+        runpod_status=payload.get("status"),
+        pipeline_dispatched=ctx is not None,
+    ).info("RunPod webhook 수신")
+    return {"success": True}
+
+
+@internal_router.post("/jdpatent/callback")
+async def jdpatent_callback(request: Request, token: str | None = None):
+    """JDPatent 작업 완료 callback. 본문은 GET /api/v1/jobs/{task_id} 응답과 같은 형식이다."""
+    if not verify_jdpatent_callback_token(token):
+        raise HTTPException(status_code=403, detail="invalid callback token")
+
+    payload = await _read_payload(request)
+    task_id = payload.get("task_id")
+    if not task_id:
+        raise HTTPException(status_code=400, detail="missing task_id")
+
+    ctx = await record_callback(JDPATENT_CALLBACK_SOURCE, task_id, payload)
+    if ctx is not None:
+        check_jdpatent_status.apply_async(args=(ctx, True))
+
+    logger.bind(
+        event="jdpatent_callback_received",
+        task_id=task_id,
+        jdpatent_status=payload.get("status"),
+        pipeline_dispatched=ctx is not None,
+    ).info("JDPatent callback 수신")
+    return {"success": True}
+
+
+async def _read_payload(request: Request) -> dict:
+    try:
+        payload = await request.json()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="invalid JSON body") from exc
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="JSON object body required")
+    return payload
@@ -1,15 +1,52 @@
+import asyncio
+import hashlib
 import json
 import re
 import uuid
-from functools import lru_cache
+import zipfile
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Any, Awaitable, Callable, TypeVar
 
-from celery.result import AsyncResult
-from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
-from fastapi.responses import FileResponse
+from celery import group, states
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from loguru import logger
+from pydantic import BaseModel, Field, ValidationError
 
-from app.services.s3_service import upload_pdf
+from app.config import settings
+from app.services.admission_service import check_admission
+from app.services.batch_service import fetch_task_metas, load_batch, save_batch
+from app.services.dedup_service import DedupHit, claim_or_attach, claim_upload, release, release_upload
+from app.services.lane_service import PRIORITIES, choose_analysis_lane, entry_queue
+from app.services.pdf_preflight_service import (
+    PdfPreflightReport,
+    PdfPreflightScanner,
+    inspect_pdf_parts,
+)
+from app.services.progress_stream_service import load_task_meta, resolve_completed_meta, subscribe_task_events
+from app.services.result_archive_service import get_archived_result_async
+from app.services.result_cache_service import (
+    IMMUTABLE_CACHE_CONTROL,
+    CachedResponse,
+    cache_completed_result,
+    etag_matches,
+    get_cached_result,
+)
+from app.services.result_store_service import resolve_result_ref_async
+from app.services.s3_service import (
+    delete_pdf_async,
+    generate_presigned_get_url_async,
+    generate_presigned_upload,
+    get_pdf_size,
+    read_pdf_range,
+    run_s3_io,
+)
+from app.services.storage_service import AsyncPdfWriter, S3PdfStorage, get_storage_backend
 from app.services.temp_pdf_service import resolve_temp_pdf_path, save_temp_pdf
 from app.worker.celery_app import celery_app
 from app.worker.tasks import process_patent
@@ -18,6 +55,15 @@ router = APIRouter()
 
 # 최대 업로드 크기: 100MB (200페이지 PDF 대비)
 _MAX_PDF_SIZE = 100 * 1024 * 1024
+# 업로드 파일을 S3로 흘려보낼 때 한 번에 읽는 크기
+_UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
+# S3 직접 업로드 PDF 사전 검사 시 ranged GET으로 읽는 앞/뒤 구간 크기
+_PREFLIGHT_PART_SIZE = 64 * 1024
+# POST /uploads가 발급하는 S3 키 형식 (임의 오브젝트 접근 방지)
+_UPLOAD_S3_KEY_PATTERN = re.compile(r"uploads/[0-9a-f]{32}\.pdf")
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+# SSE 진행 상태 스트림에서 상태 변화가 없을 때 프록시가 연결을 끊지 않도록 보내는 주석 간격
+_SSE_KEEPALIVE_SECONDS = 15.0
 _MOCK_OUTPUT_PATH = Path(__file__).resolve().parents[2] / "mock_output.json"
 _JDPATENT_ERROR_MESSAGES = {
     "not_a_patent_document": "평가 대상 특허가 아닙니다",
@@ -99,13 +145,20 @@ def _extract_jdpatent_error_code(raw_error: str) -> str | None:
                         "success": True,
                         "task_id": "a1b2c3d4-e5f6-7890-abcd-ef0123456789",
                         "status": "queued",
+                        "dedup": "none",
+                        "preflight": {
+                            "page_count": 12,
+                            "has_text_layer": True,
+                            "encrypted": False,
+                            "lane": "standard",
+                        },
                         "msg": "분석 요청이 접수되었습니다. GET /api/v1/result/{task_id}로 결과를 확인하세요.",
                     }
                 }
             },
         },
         400: {
-            "description": "잘못된 요청 (파일 형식/빈 파일/country 값 오류 등)",
+            "description": "잘못된 요청 (파일 형식/빈 파일/손상·암호화된 PDF/country 값 오류 등)",
             "content": {
                 "application/json": {
                     "examples": {
@@ -127,8 +180,9 @@ def _extract_jdpatent_error_code(raw_error: str) -> str | None:
                 }
             },
         },
+        409: {"description": "이미 분석 요청된 s3_key (직접 업로드 경로)"},
         413: {
-            "description": "파일 크기 초과",
+            "description": "파일 크기 또는 페이지 수 초과",
             "content": {
                 "application/json": {
                     "example": {
@@ -152,6 +206,19 @@ def _extract_jdpatent_error_code(raw_error: str) -> str | None:
                 }
             },
         },
+        429: {
+            "description": "분석 대기열 포화 (Retry-After 헤더의 초 이후 재시도)",
+            "headers": {"Retry-After": {"description": "재시도까지 기다릴 시간(초)", "schema": {"type": "integer"}}},
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": False,
+                        "msg": "분석 요청이 많아 잠시 후 다시 시도해 주세요. (약 600초 후)",
+                        "request_id": "abcd1234",
+                    }
+                }
+            },
+        },
         500: {
             "description": "서버 내부 오류",
             "content": {
@@ -168,86 +235,965 @@ def _extract_jdpatent_error_code(raw_error: str) -> str | None:
 )
 async def analyze_patent(
     request: Request,
-    file: UploadFile = File(...),
+    file: UploadFile | None = File(None, description="분석할 특허 PDF 파일 (multipart 요청 시 필수)"),
     country: str = Form("KR", description="특허 국가 코드. 'KR'(한국) 또는 'US'(미국)", enum=["KR", "US"]),
+    priority: str = Form("normal", description="처리 우선순위 (high / normal / low)", enum=list(PRIORITIES)),
 ):
     """특허 PDF를 업로드하여 분석을 시작한다.
 
     - 즉시 task_id를 반환(202 Accepted)
     - GET /result/{task_id} 로 결과를 폴링
+    - 동일 PDF+country 요청은 기존 task를 재사용 (`dedup`: none / inflight / completed)
+    - 업로드 중 PDF 구조를 사전 검사해 페이지 수 초과/손상 파일은 OCR 전에 거절하고,
+      페이지 수와 사전 검사 lane을 `preflight`로 반환
+    - 페이지 수/파일 크기/country/priority로 처리 lane(small / standard / large)을 정해 lane별 큐로 보낸다 (`lane`)
+    - 대기열(broker 대기 + 실행 중 task)이 가득 차면 저장소 기록/큐 등록 전에 429와 `Retry-After`로 거절
 
     **Request body (multipart/form-data)**
     - `file`: 분석할 특허 PDF 파일
     - `country`: 특허 국가 코드 (`KR` 또는 `US`)
+    - `priority`: 처리 우선순위 (`high` / `normal` / `low`, 선택)
+
+    **Request body (application/json)** — `POST /uploads`로 S3에 직접 올린 경우
+    - `s3_key`: `POST /uploads` 응답의 `s3_key`
+    - `country`: 특허 국가 코드 (`KR` 또는 `US`)
+    - `filename`: 원본 파일명 (선택)
+    - `priority`: 처리 우선순위 (선택)
     """
     request_id: str = getattr(request.state, "request_id", "unknown")
 
-    if country not in ("KR", "US"):
-        raise HTTPException(status_code=400, detail="country는 'KR' 또는 'US'만 허용됩니다.")
+    # 대기열이 가득 찼으면 저장소 기록/큐 등록 전에 거절한다 (multipart 본문은 이미 수신된 상태다).
+    await _enforce_admission()
+
+    task_id = str(uuid.uuid4())
+    upload_key: str | None = None
+    if _is_json_request(request):
+        body = await _parse_json_body(request, AnalyzeUploadedPdfRequest)
+        country, priority = body.country, body.priority
+        if country not in ("KR", "US"):
+            raise HTTPException(status_code=400, detail="country는 'KR' 또는 'US'만 허용됩니다.")
+        _validate_priority(priority)
+        ingested = await _ingest_uploaded_pdf(body.s3_key, body.filename, task_id)
+        upload_key = body.s3_key
+    else:
+        if country not in ("KR", "US"):
+            raise HTTPException(status_code=400, detail="country는 'KR' 또는 'US'만 허용됩니다.")
+        _validate_priority(priority)
+
+        # --- 파일 검증 ---
+        if file is None:
+            raise HTTPException(status_code=400, detail="file 또는 s3_key가 필요합니다.")
+        _validate_pdf_filename(file.filename)
+
+        ingested = await _ingest_pdf(file.read, file.filename, size_hint=file.size)
+
+    dedup_hit, dedup_claimed = await _claim_dedup(ingested, country, task_id)
+
+    if dedup_hit is not None:
+        await _discard_duplicate_upload(ingested, country, dedup_hit)
+        return _build_dedup_response(dedup_hit)
+
+    lane = _processing_lane(ingested, country, priority)
+    try:
+        # 큐는 celery_app의 router가 processing_lane으로 정한다.
+        task = process_patent.apply_async(
+            args=_process_patent_args(ingested, request_id, country),
+            kwargs=_process_patent_kwargs(ingested, lane),
+            task_id=task_id,
+        )
+    except Exception as exc:
+        logger.bind(
+            event="analysis_task_enqueue_failed",
+            filename=ingested.filename,
+            file_size_bytes=ingested.file_size,
+            country=country,
+            storage_backend=ingested.storage_backend,
+            storage_key=ingested.storage_key,
+        ).exception(f"분석 작업 큐 등록 실패: {exc}")
+        if dedup_claimed:
+            await _release_dedup(ingested, country, task_id)
+        if upload_key is not None:
+            await release_upload(upload_key, task_id)
+        raise
+
+    _log_task_enqueued(task.id, ingested, country, lane)
+
+    return {
+        "success": True,
+        "task_id": task.id,
+        "status": "queued",
+        "dedup": "none",
+        "lane": lane,
+        "preflight": _preflight_summary(ingested.preflight),
+        "msg": "분석 요청이 접수되었습니다. GET /api/v1/result/{task_id}로 결과를 확인하세요.",
+    }
+
+
+@dataclass(frozen=True)
+class _IngestedPdf:
+    filename: str
+    storage_backend: str
+    storage_key: str
+    pdf_url: str
+    file_size: int
+    # S3 직접 업로드는 API가 본문을 읽지 않으므로 해시가 없다.
+    pdf_sha256: str | None
+    preflight: PdfPreflightReport
+
+
+class CreateUploadRequest(BaseModel):
+    filename: str | None = Field(None, description="업로드할 PDF 파일명 (선택, 확장자 검증용)")
 
-    # --- 파일 검증 ---
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="파일명이 비어있습니다.")
 
-    if not file.filename.lower().endswith(".pdf"):
+class AnalyzeUploadedPdfRequest(BaseModel):
+    s3_key: str = Field(..., description="POST /uploads 응답의 s3_key")
+    country: str = Field("KR", description="특허 국가 코드. 'KR'(한국) 또는 'US'(미국)")
+    filename: str | None = Field(None, description="원본 파일명 (선택)")
+    priority: str = Field("normal", description="처리 우선순위 (high / normal / low)")
+
+
+class BulkResultRequest(BaseModel):
+    task_ids: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.RESULTS_BULK_MAX_TASKS,
+        description=f"조회할 task_id 목록 (최대 {settings.RESULTS_BULK_MAX_TASKS}개)",
+    )
+    include_result: bool = Field(False, description="완료된 task의 result 본문 포함 여부")
+
+
+def _is_json_request(request: Request) -> bool:
+    content_type = request.headers.get("content-type", "")
+    return content_type.split(";", 1)[0].strip().lower() == "application/json"
+
+
+async def _parse_json_body(request: Request, model: type[_ModelT]) -> _ModelT:
+    try:
+        payload = await request.json()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="JSON 본문을 해석할 수 없습니다.") from exc
+    try:
+        return model.model_validate(payload)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors()) from exc
+
+
+async def _ingest_uploaded_pdf(s3_key: str, filename: str | None, task_id: str) -> _IngestedPdf:
+    """클라이언트가 S3에 직접 올린 PDF를 검증한다.
+
+    파이프라인이 끝나면 업로드 객체를 지우므로, 같은 s3_key로 두 번 요청하면 먼저 끝난 쪽이 다른 쪽의 PDF를
+    지우게 된다. 그래서 s3_key를 task_id로 선점해 한 업로드가 파이프라인 하나만 시작하게 한다.
+    """
+    _require_s3_storage()
+    if not _UPLOAD_S3_KEY_PATTERN.fullmatch(s3_key):
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 s3_key 형식입니다: {s3_key}")
+    if not await claim_upload(s3_key, task_id):
+        raise HTTPException(status_code=409, detail=f"이미 분석 요청된 업로드입니다: {s3_key}")
+
+    try:
+        return await _inspect_uploaded_pdf(s3_key, filename)
+    except BaseException:
+        await release_upload(s3_key, task_id)
+        raise
+
+
+async def _inspect_uploaded_pdf(s3_key: str, filename: str | None) -> _IngestedPdf:
+    """업로드된 PDF를 크기 조회와 ranged GET으로 검증한다. 검증에 실패한 객체는 지운다."""
+    file_size = await run_s3_io(get_pdf_size, s3_key)
+    if file_size is None:
+        raise HTTPException(status_code=400, detail="업로드된 파일을 찾을 수 없습니다. 업로드 완료 후 요청해 주세요.")
+
+    if file_size == 0:
+        await delete_pdf_async(s3_key)
+        raise HTTPException(status_code=400, detail="빈 파일입니다.")
+
+    if file_size > _MAX_PDF_SIZE:
+        await delete_pdf_async(s3_key)
+        raise HTTPException(
+            status_code=413,
+            detail=f"파일 크기가 너무 큽니다. (최대 {_MAX_PDF_SIZE // (1024*1024)}MB)",
+        )
+
+    head = await run_s3_io(read_pdf_range, s3_key, 0, _PREFLIGHT_PART_SIZE - 1)
+    if not _is_valid_pdf_header(head):
+        await delete_pdf_async(s3_key)
         raise HTTPException(
             status_code=400,
-            detail=f"PDF 파일만 허용됩니다. (받은 파일: {file.filename})",
+            detail="유효한 PDF 파일이 아닙니다. 파일 형식을 확인해 주세요.",
         )
 
-    # PDF 바이트 읽기
-    pdf_bytes = await file.read()
+    # 본문 전체를 받지 않고 앞/뒤 구간(선형화 dict, trailer)만으로 사전 검사
+    if file_size > len(head):
+        tail_start = max(file_size - _PREFLIGHT_PART_SIZE, len(head))
+        tail = await run_s3_io(read_pdf_range, s3_key, tail_start, file_size - 1)
+    else:
+        tail = b""
+    preflight = inspect_pdf_parts(head, tail, file_size)
+    try:
+        _enforce_preflight(preflight, filename or s3_key)
+    except HTTPException:
+        await delete_pdf_async(s3_key)
+        raise
+
+    return _IngestedPdf(
+        filename=filename or Path(s3_key).name,
+        storage_backend=S3PdfStorage.name,
+        storage_key=s3_key,
+        pdf_url=await generate_presigned_get_url_async(s3_key),
+        file_size=file_size,
+        pdf_sha256=None,
+        preflight=preflight,
+    )
+
+
+def _validate_pdf_filename(filename: str | None) -> None:
+    if not filename:
+        raise HTTPException(status_code=400, detail="파일명이 비어있습니다.")
+
+    if not filename.lower().endswith(".pdf"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"PDF 파일만 허용됩니다. (받은 파일: {filename})",
+        )
 
-    if len(pdf_bytes) == 0:
-        raise HTTPException(status_code=400, detail="빈 파일입니다.")
 
-    if len(pdf_bytes) > _MAX_PDF_SIZE:
+async def _ingest_pdf(
+    read_chunk: Callable[[int], Awaitable[bytes]],
+    filename: str,
+    *,
+    size_hint: int | None = None,
+) -> _IngestedPdf:
+    """PDF를 청크 단위로 검증하며 설정된 저장소(기본 S3)에 스트리밍 기록한다."""
+    # 전송 전에 크기를 알 수 있으면 S3 업로드 없이 바로 거절
+    if size_hint is not None and size_hint > _MAX_PDF_SIZE:
         raise HTTPException(
             status_code=413,
             detail=f"파일 크기가 너무 큽니다. (최대 {_MAX_PDF_SIZE // (1024*1024)}MB)",
         )
-    if not _is_valid_pdf_header(pdf_bytes):
+
+    # 첫 청크로 빈 파일/PDF 헤더 검증 (S3 전송 전)
+    chunk = await read_chunk(_UPLOAD_READ_CHUNK_SIZE)
+
+    if len(chunk) == 0:
+        raise HTTPException(status_code=400, detail="빈 파일입니다.")
+
+    if not _is_valid_pdf_header(chunk):
         raise HTTPException(
             status_code=400,
             detail="유효한 PDF 파일이 아닙니다. 파일 형식을 확인해 주세요.",
         )
 
-    s3_key = f"uploads/{uuid.uuid4().hex}.pdf"
-    pdf_url = upload_pdf(pdf_bytes, s3_key)
+    # 청크 단위로 읽으면서 저장소로 흘려보내 파일 전체를 메모리에 올리지 않는다.
+    storage = get_storage_backend()
+    storage_key = storage.new_key()
+    upload = await AsyncPdfWriter.open(storage, storage_key)
+    file_size = 0
+    digest = hashlib.sha256()
+    scanner = PdfPreflightScanner()
+    try:
+        while chunk:
+            file_size += len(chunk)
+            if file_size > _MAX_PDF_SIZE:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"파일 크기가 너무 큽니다. (최대 {_MAX_PDF_SIZE // (1024*1024)}MB)",
+                )
+            # 해시 / 사전 검사는 청크당 CPU 작업이라 스레드에서 하고, 그동안 저장소 기록을 같이 진행한다.
+            await asyncio.gather(asyncio.to_thread(_inspect_chunk, digest, scanner, chunk), upload.write(chunk))
+            # 선형화 PDF는 첫 청크에 페이지 수가 있으므로 나머지를 받기 전에 거절할 수 있다.
+            _enforce_page_limit(scanner.page_count_hint, filename)
+            chunk = await read_chunk(_UPLOAD_READ_CHUNK_SIZE)
+        # 저장소 업로드를 확정하기 전에 검사해, 거절 시 multipart upload를 abort한다.
+        preflight = await asyncio.to_thread(scanner.finish)
+        _enforce_preflight(preflight, filename)
+        pdf_url = await upload.complete()
+    except BaseException:
+        await upload.abort()
+        raise
+
+    return _IngestedPdf(
+        filename=filename,
+        storage_backend=storage.name,
+        storage_key=storage_key,
+        pdf_url=pdf_url,
+        file_size=file_size,
+        pdf_sha256=digest.hexdigest(),
+        preflight=preflight,
+    )
+
+
+def _inspect_chunk(digest: Any, scanner: PdfPreflightScanner, chunk: bytes) -> None:
+    digest.update(chunk)
+    scanner.feed(chunk)
+
+
+def _enforce_page_limit(page_count: int | None, filename: str) -> None:
+    max_pages = settings.PREFLIGHT_MAX_PAGES
+    if page_count is None or page_count <= max_pages:
+        return
+    logger.bind(
+        event="pdf_preflight_rejected",
+        filename=filename,
+        reason="too_many_pages",
+        page_count=page_count,
+        max_pages=max_pages,
+    ).warning("PDF 사전 검사 거절")
+    raise HTTPException(
+        status_code=413,
+        detail=f"페이지 수가 너무 많습니다. ({page_count}페이지, 최대 {max_pages}페이지)",
+    )
+
+
+def _enforce_preflight(report: PdfPreflightReport, filename: str) -> None:
+    """OCR로 보내도 실패할 PDF(페이지 수 초과/잘린 파일/암호화)를 거절한다."""
+    _enforce_page_limit(report.page_count, filename)
+
+    reason, detail = None, None
+    if report.startxref is None and not report.has_eof:
+        reason, detail = "truncated", "PDF 파일이 손상되었거나 일부만 업로드되었습니다."
+    elif report.encrypted and settings.PREFLIGHT_REJECT_ENCRYPTED:
+        reason, detail = "encrypted", "암호화된 PDF는 분석할 수 없습니다. 암호를 해제한 후 다시 업로드해 주세요."
+
+    log = logger.bind(
+        event="pdf_preflight_rejected" if reason else "pdf_preflight_completed",
+        filename=filename,
+        reason=reason,
+        **report.to_dict(),
+    )
+    if reason is None:
+        log.info("PDF 사전 검사 완료")
+        return
+    log.warning("PDF 사전 검사 거절")
+    raise HTTPException(status_code=400, detail=detail)
+
+
+def _preflight_summary(report: PdfPreflightReport) -> dict:
+    return {
+        "page_count": report.page_count,
+        "has_text_layer": report.has_text_layer,
+        "encrypted": report.encrypted,
+        "lane": report.lane,
+    }
+
+
+async def _enforce_admission(incoming: int = 1) -> None:
+    decision = await check_admission(incoming)
+    if decision is None or decision.admitted:
+        return
+    logger.bind(
+        event="analysis_admission_rejected",
+        incoming=incoming,
+        queue_depth=decision.queue_depth,
+        inflight=decision.inflight,
+        backlog=decision.backlog,
+        max_backlog=settings.ADMISSION_MAX_BACKLOG,
+        avg_task_seconds=round(decision.avg_task_seconds, 1),
+        retry_after=decision.retry_after,
+    ).warning("분석 대기열 포화로 요청 거절")
+    raise HTTPException(
+        status_code=429,
+        detail=f"분석 요청이 많아 잠시 후 다시 시도해 주세요. (약 {decision.retry_after}초 후)",
+        headers={"Retry-After": str(decision.retry_after)},
+    )
 
+
+def _process_patent_args(ingested: _IngestedPdf, request_id: str, country: str) -> tuple:
+    return (None, request_id, ingested.filename, ingested.pdf_url, country, ingested.storage_key)
+
+
+def _process_patent_kwargs(ingested: _IngestedPdf, lane: str) -> dict:
+    return {
+        "pdf_sha256": ingested.pdf_sha256,
+        "storage_backend": ingested.storage_backend,
+        "page_count": ingested.preflight.page_count,
+        "processing_lane": lane,
+    }
+
+
+def _validate_priority(priority: str) -> None:
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail="priority는 'high', 'normal', 'low'만 허용됩니다.")
+
+
+def _processing_lane(ingested: _IngestedPdf, country: str, priority: str) -> str:
+    return choose_analysis_lane(
+        ingested.preflight.lane,
+        page_count=ingested.preflight.page_count,
+        file_size=ingested.file_size,
+        country=country,
+        priority=priority,
+    )
+
+
+def _require_s3_storage() -> None:
+    if settings.PDF_STORAGE_BACKEND.strip().lower() != S3PdfStorage.name:
+        raise HTTPException(
+            status_code=400,
+            detail="S3 직접 업로드는 PDF_STORAGE_BACKEND=s3 환경에서만 지원합니다.",
+        )
+
+
+async def _claim_dedup(
+    ingested: _IngestedPdf, country: str, task_id: str
+) -> tuple[DedupHit | None, bool]:
+    """같은 PDF가 이미 분석 중이거나 완료됐는지 확인하고, 아니면 task_id를 등록한다.
+
+    Returns:
+        (기존 task 정보, task_id 등록 여부)
+    """
+    if not settings.DEDUP_ENABLED or not ingested.pdf_sha256:
+        return None, False
     try:
-        task = process_patent.delay(None, request_id, file.filename, pdf_url, country, s3_key)
+        hit = await claim_or_attach(ingested.pdf_sha256, country, task_id)
     except Exception as exc:
         logger.bind(
-            event="analysis_task_enqueue_failed",
-            filename=file.filename,
-            file_size_bytes=len(pdf_bytes),
+            event="analysis_dedup_lookup_failed",
+            pdf_sha256=ingested.pdf_sha256,
             country=country,
-            s3_key=s3_key,
-        ).exception(f"분석 작업 큐 등록 실패: {exc}")
-        raise
+        ).warning(f"중복 요청 조회 실패, 새 작업으로 처리: {exc}")
+        return None, False
+    return hit, hit is None
+
+
+async def _release_dedup(ingested: _IngestedPdf, country: str, task_id: str) -> None:
+    if not ingested.pdf_sha256:
+        return
+    try:
+        await release(ingested.pdf_sha256, country, task_id)
+    except Exception as exc:
+        logger.warning(f"중복 요청 인덱스 정리 실패: {exc}")
+
 
+async def _discard_duplicate_upload(ingested: _IngestedPdf, country: str, hit: DedupHit) -> None:
+    storage = get_storage_backend(ingested.storage_backend)
+    await storage.run_io(storage.delete, ingested.storage_key)
+    logger.bind(
+        event="analysis_dedup_hit",
+        task_id=hit.task_id,
+        dedup=hit.kind,
+        task_state=hit.state,
+        filename=ingested.filename,
+        file_size_bytes=ingested.file_size,
+        country=country,
+        pdf_sha256=ingested.pdf_sha256,
+    ).info("중복 PDF 요청을 기존 작업에 연결")
+
+
+def _log_task_enqueued(task_id: str, ingested: _IngestedPdf, country: str, lane: str) -> None:
     logger.bind(
         event="pdf_upload_received",
-        task_id=task.id,
-        filename=file.filename,
-        file_size_bytes=len(pdf_bytes),
+        task_id=task_id,
+        filename=ingested.filename,
+        file_size_bytes=ingested.file_size,
         country=country,
-        s3_key=s3_key,
+        storage_backend=ingested.storage_backend,
+        storage_key=ingested.storage_key,
+        pdf_sha256=ingested.pdf_sha256,
+        page_count=ingested.preflight.page_count,
+        preflight_lane=ingested.preflight.lane,
+        processing_lane=lane,
     ).info("PDF 업로드 메타데이터 저장")
     logger.bind(
         event="analysis_task_enqueued",
-        task_id=task.id,
+        task_id=task_id,
+        processing_lane=lane,
+        queue=entry_queue(lane),
     ).info("분석 작업 큐 등록 성공")
 
+
+def _build_dedup_response(hit: DedupHit) -> dict:
+    if hit.kind == "completed":
+        return {
+            "success": True,
+            "task_id": hit.task_id,
+            "status": "completed",
+            "dedup": "completed",
+            "msg": "동일한 PDF의 분석 결과가 이미 있어 기존 결과를 반환합니다.",
+            "result": hit.result,
+        }
     return {
         "success": True,
-        "task_id": task.id,
+        "task_id": hit.task_id,
         "status": "queued",
-        "msg": "분석 요청이 접수되었습니다. GET /api/v1/result/{task_id}로 결과를 확인하세요.",
+        "dedup": "inflight",
+        "msg": "동일한 PDF가 이미 분석 중입니다. GET /api/v1/result/{task_id}로 결과를 확인하세요.",
+    }
+
+
+@router.post(
+    "/uploads",
+    status_code=201,
+    responses={
+        201: {
+            "description": "S3 직접 업로드용 presigned POST 발급",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "s3_key": "uploads/0123456789abcdef0123456789abcdef.pdf",
+                        "upload": {
+                            "method": "POST",
+                            "url": "https://bucket.s3.amazonaws.com/",
+                            "fields": {"key": "uploads/0123456789abcdef0123456789abcdef.pdf", "Content-Type": "application/pdf"},
+                        },
+                        "max_size_bytes": 104857600,
+                        "expires_in": 900,
+                        "msg": "upload.url로 fields와 file을 multipart POST한 뒤 POST /api/v1/analyze에 s3_key를 전달하세요.",
+                    }
+                }
+            },
+        },
+        400: {"description": "PDF가 아닌 파일명"},
+    },
+)
+async def create_upload(body: CreateUploadRequest | None = None):
+    """PDF를 API 서버를 거치지 않고 S3에 직접 올릴 수 있는 presigned POST를 발급한다.
+
+    1. 응답의 `upload.url`로 `upload.fields` + `file`을 multipart/form-data POST
+    2. `POST /analyze`에 JSON `{"s3_key": ..., "country": ...}` 전달
+    """
+    _require_s3_storage()
+    if body is not None and body.filename:
+        _validate_pdf_filename(body.filename)
+
+    s3_key = f"uploads/{uuid.uuid4().hex}.pdf"
+    presigned = await run_s3_io(generate_presigned_upload, s3_key, _MAX_PDF_SIZE)
+
+    logger.bind(
+        event="pdf_direct_upload_issued",
+        s3_key=s3_key,
+        filename=body.filename if body else None,
+    ).info("S3 직접 업로드 URL 발급")
+
+    return {
+        "success": True,
+        "s3_key": s3_key,
+        "upload": {"method": "POST", "url": presigned["url"], "fields": presigned["fields"]},
+        "max_size_bytes": _MAX_PDF_SIZE,
+        "expires_in": settings.AWS_S3_PRESIGNED_UPLOAD_EXPIRES,
+        "msg": "upload.url로 fields와 file을 multipart POST한 뒤 POST /api/v1/analyze에 s3_key를 전달하세요.",
+    }
+
+
+@router.post(
+    "/analyze/batch",
+    status_code=202,
+    responses={
+        202: {
+            "description": "배치 분석 요청 접수",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "batch_id": "0f9e8d7c-6b5a-4321-9876-543210fedcba",
+                        "status": "queued",
+                        "total": 2,
+                        "accepted": 1,
+                        "rejected": 1,
+                        "items": [
+                            {
+                                "index": 0,
+                                "filename": "KR1020230012345.pdf",
+                                "task_id": "a1b2c3d4-e5f6-7890-abcd-ef0123456789",
+                                "status": "queued",
+                                "dedup": "none",
+                            },
+                            {
+                                "index": 1,
+                                "filename": "readme.txt",
+                                "task_id": None,
+                                "status": "rejected",
+                                "msg": "PDF 파일만 허용됩니다. (받은 파일: readme.txt)",
+                            },
+                        ],
+                        "msg": "배치 분석 요청이 접수되었습니다. GET /api/v1/batch/{batch_id}로 진행 상황을 확인하세요.",
+                    }
+                }
+            },
+        },
+        400: {"description": "파일 없음/파일 수 초과/country 값 오류/잘못된 zip"},
+    },
+)
+async def analyze_patent_batch(
+    request: Request,
+    files: list[UploadFile] = File(..., description="분석할 특허 PDF 파일들 또는 PDF를 담은 zip 파일"),
+    country: str = Form("KR", description="특허 국가 코드. 'KR'(한국) 또는 'US'(미국)", enum=["KR", "US"]),
+    priority: str = Form("normal", description="처리 우선순위 (high / normal / low)", enum=list(PRIORITIES)),
+):
+    """여러 특허 PDF를 한 번에 업로드하여 분석을 시작한다.
+
+    - 파일들을 동시에 S3로 업로드하고 Celery group으로 한 번에 큐 등록
+    - 개별 파일 검증 실패는 전체를 실패시키지 않고 해당 item만 `rejected`로 표시
+    - GET /batch/{batch_id} 로 전체 진행률과 item별 상태를 조회
+
+    **Request body (multipart/form-data)**
+    - `files`: PDF 파일 여러 개, 또는 PDF들을 담은 `.zip` 파일
+    - `country`: 특허 국가 코드 (`KR` 또는 `US`), 모든 파일에 공통 적용
+    - `priority`: 처리 우선순위 (`high` / `normal` / `low`), 모든 파일에 공통 적용. lane은 파일별로 정한다.
+    """
+    request_id: str = getattr(request.state, "request_id", "unknown")
+
+    if country not in ("KR", "US"):
+        raise HTTPException(status_code=400, detail="country는 'KR' 또는 'US'만 허용됩니다.")
+    _validate_priority(priority)
+
+    with ExitStack() as stack:
+        # zip 중앙 디렉터리 읽기 / 항목 열기도 동기 I/O라 스레드에서 한다.
+        sources = await asyncio.to_thread(_collect_batch_sources, files, stack)
+        if not sources:
+            raise HTTPException(status_code=400, detail="분석할 PDF 파일이 없습니다.")
+        if len(sources) > settings.BATCH_MAX_FILES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"한 번에 처리할 수 있는 파일 수를 초과했습니다. (최대 {settings.BATCH_MAX_FILES}개)",
+            )
+
+        # 배치는 파일 수만큼 대기열을 차지한다. 임계값보다 큰 배치도 대기열이 비어 있으면 받을 수 있도록
+        # 요구량은 ADMISSION_MAX_BACKLOG로 자른다.
+        await _enforce_admission(min(len(sources), settings.ADMISSION_MAX_BACKLOG))
+
+        semaphore = asyncio.Semaphore(max(int(settings.BATCH_UPLOAD_CONCURRENCY), 1))
+
+        async def _ingest_item(index: int, source: _BatchSource) -> dict:
+            async with semaphore:
+                return await _ingest_batch_item(index, source, country)
+
+        items = await asyncio.gather(
+            *(_ingest_item(index, source) for index, source in enumerate(sources))
+        )
+
+    pending = [item for item in items if item["status"] == "pending"]
+    group_id = None
+    if pending:
+        for item in pending:
+            item["lane"] = _processing_lane(item["_pending"], country, priority)
+        signatures = [
+            process_patent.signature(
+                args=_process_patent_args(item["_pending"], request_id, country),
+                kwargs=_process_patent_kwargs(item["_pending"], item["lane"]),
+                task_id=item["task_id"],
+            )
+            for item in pending
+        ]
+        try:
+            group_id = group(signatures).apply_async().id
+        except Exception as exc:
+            logger.bind(
+                event="analysis_batch_enqueue_failed",
+                batch_size=len(pending),
+                country=country,
+            ).exception(f"배치 분석 작업 큐 등록 실패: {exc}")
+            for item in pending:
+                if item.pop("_dedup_claimed", False):
+                    await _release_dedup(item["_pending"], country, item["task_id"])
+            raise
+
+        for item in pending:
+            ingested = item.pop("_pending")
+            item.pop("_dedup_claimed", None)
+            item["status"] = "queued"
+            _log_task_enqueued(item["task_id"], ingested, country, item["lane"])
+
+    batch_id = str(uuid.uuid4())
+    await save_batch(
+        batch_id,
+        {
+            "batch_id": batch_id,
+            "group_id": group_id,
+            "country": country,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "items": items,
+        },
+    )
+
+    rejected = sum(1 for item in items if item["status"] == "rejected")
+    logger.bind(
+        event="analysis_batch_enqueued",
+        batch_id=batch_id,
+        group_id=group_id,
+        total=len(items),
+        enqueued=len(pending),
+        rejected=rejected,
+        country=country,
+    ).info("배치 분석 작업 큐 등록 성공")
+
+    return {
+        "success": True,
+        "batch_id": batch_id,
+        "status": "queued",
+        "total": len(items),
+        "accepted": len(items) - rejected,
+        "rejected": rejected,
+        "items": items,
+        "msg": "배치 분석 요청이 접수되었습니다. GET /api/v1/batch/{batch_id}로 진행 상황을 확인하세요.",
+    }
+
+
+@dataclass(frozen=True)
+class _BatchSource:
+    filename: str | None
+    read_chunk: Callable[[int], Awaitable[bytes]]
+    size_hint: int | None = None
+
+
+def _collect_batch_sources(files: list[UploadFile], stack: ExitStack) -> list[_BatchSource]:
+    """업로드 파일 목록을 PDF 단위 입력으로 펼친다. zip 파일은 내부 PDF들로 확장한다."""
+    sources: list[_BatchSource] = []
+    for upload in files:
+        if (upload.filename or "").lower().endswith(".zip"):
+            sources.extend(_zip_batch_sources(upload, stack))
+        else:
+            sources.append(_BatchSource(upload.filename, upload.read, upload.size))
+    return sources
+
+
+def _zip_batch_sources(upload: UploadFile, stack: ExitStack) -> list[_BatchSource]:
+    try:
+        archive = stack.enter_context(zipfile.ZipFile(upload.file))
+    except zipfile.BadZipFile as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=f"zip 파일을 열 수 없습니다. (받은 파일: {upload.filename})",
+        ) from exc
+
+    sources: list[_BatchSource] = []
+    for info in archive.infolist():
+        name = info.filename
+        if info.is_dir() or name.startswith("__MACOSX/") or Path(name).name.startswith("."):
+            continue
+        member = stack.enter_context(archive.open(info))
+        # zip 해제는 동기 I/O라 스레드에서 읽는다. 크기 제한은 실제로 읽은 바이트로 검사한다.
+        sources.append(
+            _BatchSource(
+                filename=Path(name).name,
+                read_chunk=partial(asyncio.to_thread, member.read),
+                size_hint=info.file_size,
+            )
+        )
+    return sources
+
+
+async def _ingest_batch_item(index: int, source: _BatchSource, country: str) -> dict:
+    """배치 item 하나를 검증/업로드하고 중복 여부를 확인한다. 실패는 item 상태로 기록한다."""
+    item: dict[str, Any] = {"index": index, "filename": source.filename, "task_id": None}
+    try:
+        _validate_pdf_filename(source.filename)
+        ingested = await _ingest_pdf(source.read_chunk, source.filename, size_hint=source.size_hint)
+    except HTTPException as exc:
+        item.update(status="rejected", msg=str(exc.detail))
+        return item
+
+    item["page_count"] = ingested.preflight.page_count
+    task_id = str(uuid.uuid4())
+    dedup_hit, dedup_claimed = await _claim_dedup(ingested, country, task_id)
+    if dedup_hit is not None:
+        await _discard_duplicate_upload(ingested, country, dedup_hit)
+        item.update(
+            task_id=dedup_hit.task_id,
+            status="completed" if dedup_hit.kind == "completed" else "queued",
+            dedup=dedup_hit.kind,
+        )
+        return item
+
+    item.update(
+        task_id=task_id,
+        status="pending",
+        dedup="none",
+        _pending=ingested,
+        _dedup_claimed=dedup_claimed,
+    )
+    return item
+
+
+@router.get(
+    "/batch/{batch_id}",
+    responses={
+        200: {
+            "description": "배치 진행률과 item별 상태",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "batch_id": "0f9e8d7c-6b5a-4321-9876-543210fedcba",
+                        "status": "processing",
+                        "total": 3,
+                        "progress": 0.3333,
+                        "counts": {
+                            "queued": 1,
+                            "processing": 1,
+                            "completed": 1,
+                            "failed": 0,
+                            "rejected": 0,
+                        },
+                        "items": [
+                            {
+                                "index": 0,
+                                "filename": "KR1020230012345.pdf",
+                                "task_id": "a1b2c3d4-e5f6-7890-abcd-ef0123456789",
+                                "status": "completed",
+                            },
+                        ],
+                    }
+                }
+            },
+        },
+        400: {"description": "유효하지 않은 batch_id 형식"},
+        404: {"description": "존재하지 않거나 만료된 batch_id"},
+    },
+)
+async def get_batch(batch_id: str):
+    """batch_id로 배치 전체 진행률과 item별 상태를 한 번에 조회한다.
+
+    item별 결과 본문은 포함하지 않으며, 완료된 item은 GET /result/{task_id}로 조회한다.
+    """
+    try:
+        uuid.UUID(batch_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"유효하지 않은 batch_id 형식입니다: {batch_id}",
+        )
+
+    batch = await load_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"존재하지 않는 batch_id입니다: {batch_id}")
+
+    items: list[dict] = batch.get("items", [])
+    task_ids = [item["task_id"] for item in items if item.get("task_id")]
+    metas = await fetch_task_metas(task_ids)
+
+    counts = {"queued": 0, "processing": 0, "completed": 0, "failed": 0, "rejected": 0}
+    out_items = []
+    for item in items:
+        out = {
+            "index": item.get("index"),
+            "filename": item.get("filename"),
+            "task_id": item.get("task_id"),
+        }
+        if not item.get("task_id"):
+            out.update(status="rejected", msg=item.get("msg", ""))
+            counts["rejected"] += 1
+        else:
+            response = _build_result_response_from_meta(item["task_id"], metas.get(item["task_id"]))
+            out["status"] = response["status"]
+            if response.get("msg"):
+                out["msg"] = response["msg"]
+            counts[_result_phase(response)] += 1
+        out_items.append(out)
+
+    total = len(out_items)
+    finished = counts["completed"] + counts["failed"] + counts["rejected"]
+    if finished == total:
+        batch_status = "completed"
+    elif counts["processing"] or finished:
+        batch_status = "processing"
+    else:
+        batch_status = "queued"
+
+    return {
+        "success": True,
+        "batch_id": batch_id,
+        "status": batch_status,
+        "total": total,
+        "progress": round(finished / total, 4) if total else 1.0,
+        "counts": counts,
+        "items": out_items,
     }
 
 
+def _result_phase(response: dict) -> str:
+    """result 응답을 배치 집계용 단계(queued/processing/completed/failed)로 분류."""
+    if response.get("success") is False:
+        return "failed"
+    status = response.get("status")
+    if status in ("queued", "completed"):
+        return status
+    return "processing"
+
+
+@router.post(
+    "/results",
+    summary="여러 task 결과 일괄 조회",
+    responses={
+        200: {
+            "description": "task_id별 상태 (GET /result/{task_id}와 같은 status / msg)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "total": 3,
+                        "counts": {"queued": 1, "processing": 1, "completed": 0, "failed": 1},
+                        "results": {
+                            "a1b2c3d4-e5f6-7890-abcd-ef0123456789": {"success": True, "status": "queued"},
+                            "b2c3d4e5-f6a7-8901-bcde-f01234567890": {
+                                "success": True,
+                                "status": "JDPATENT_PROCESSING",
+                                "msg": "JDPatent 결과 대기 중",
+                            },
+                            "c3d4e5f6-a7b8-9012-cdef-012345678901": {
+                                "success": False,
+                                "status": "not_a_patent_document",
+                                "msg": "평가 대상 특허가 아닙니다",
+                            },
+                        },
+                    }
+                }
+            },
+        },
+        400: {"description": "유효하지 않은 task_id 형식"},
+        422: {"description": "task_ids가 비었거나 RESULTS_BULK_MAX_TASKS개를 넘음"},
+    },
+)
+async def get_results_bulk(body: BulkResultRequest):
+    """여러 task의 상태를 Redis MGET 한 번으로 조회한다.
+
+    task별 status / msg는 GET /result/{task_id}와 같다. result 본문은 include_result=true일 때만 포함한다.
+    """
+    invalid = []
+    for task_id in body.task_ids:
+        try:
+            uuid.UUID(task_id)
+        except ValueError:
+            invalid.append(task_id)
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"유효하지 않은 task_id 형식입니다: {', '.join(invalid[:5])}",
+        )
+
+    task_ids = list(dict.fromkeys(body.task_ids))
+    metas = await fetch_task_metas(task_ids)
+    if body.include_result:
+        await _load_completed_results(metas)
+
+    counts = {"queued": 0, "processing": 0, "completed": 0, "failed": 0}
+    results = {}
+    for task_id in task_ids:
+        response = _build_result_response_from_meta(task_id, metas.get(task_id))
+        response.pop("task_id")
+        if not body.include_result:
+            response.pop("result", None)
+        counts[_result_phase(response)] += 1
+        results[task_id] = response
+
+    return {"success": True, "total": len(task_ids), "counts": counts, "results": results}
+
+
+async def _load_completed_results(metas: dict[str, dict | None]) -> None:
+    """fetch_task_metas가 상태만 채운 완료 메타에 blob 저장소 / 장기 보관소의 result를 채운다."""
+
+    async def _load(meta: dict) -> None:
+        if meta.get("archived"):
+            archived = await get_archived_result_async(meta["task_id"])
+            meta["result"] = archived.result if archived is not None else None
+        else:
+            await resolve_result_ref_async(meta)
+
+    await asyncio.gather(
+        *(_load(meta) for meta in metas.values() if meta and meta.get("status") == "SUCCESS")
+    )
+
+
 @router.get("/temp-pdf/{file_id}")
 async def get_temp_pdf(file_id: str, expires: int, sig: str):
     """RunPod worker가 접근할 임시 PDF 다운로드 엔드포인트."""
@@ -343,6 +1289,7 @@ async def get_temp_pdf(file_id: str, expires: int, sig: str):
                 }
             },
         },
+        304: {"description": "If-None-Match가 completed 결과의 ETag와 같음 (본문 없음)"},
         400: {
             "description": "유효하지 않은 task_id 형식",
             "content": {
@@ -394,15 +1341,37 @@ async def get_temp_pdf(file_id: str, expires: int, sig: str):
         },
     },
 )
-async def get_result(task_id: str):
+async def get_result(
+    request: Request,
+    task_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=settings.RESULT_LONG_POLL_MAX_SECONDS,
+        description="long-poll: 상태가 since와 달라지거나 완료/실패할 때까지 최대 wait초 기다린다.",
+    ),
+    since: str | None = Query(None, description="client가 마지막으로 본 status (예: queued, PARSING)"),
+):
     """task_id로 분석 결과를 조회한다.
 
     상태:
     - queued: 대기 중
     - PARSING / MODEL_1~5 / FORMATTING: 처리 중
-    - completed: 완료 (result 포함)
+      (스트리밍 OCR이면 PARSING에 progress.pages_done/pages_total과 감지된 patent_type 포함)
+    - completed: 완료 (result 포함, Redis 보관 시간이 지난 결과는 장기 보관소에서 조회)
     - failed: 실패 (error 포함)
+
+    wait > 0 이고 since가 현재 status와 같으면 상태가 바뀔 때까지(Redis pub/sub 알림) 응답을 보류한다.
+    completed 응답에는 ETag가 붙고, If-None-Match가 같으면 본문 없이 304를 반환한다.
     """
+    result = await fetch_result(task_id, wait=wait, since=since)
+    if isinstance(result, CachedResponse):
+        return cached_json_response(result, request)
+    return result
+
+
+async def fetch_result(task_id: str, *, wait: float = 0, since: str | None = None) -> dict | CachedResponse:
+    """GET /result의 조회 로직. completed는 직렬화된 캐시 응답, 그 외 상태는 응답 dict를 반환한다."""
     # task_id UUID 형식 검증
     try:
         uuid.UUID(task_id)
@@ -412,23 +1381,143 @@ async def get_result(task_id: str):
             detail=f"유효하지 않은 task_id 형식입니다: {task_id}",
         )
 
-    task = AsyncResult(task_id, app=celery_app)
+    # 완료 결과는 바뀌지 않으므로 한 번 직렬화한 응답을 Redis를 읽지 않고 재사용한다.
+    cached = get_cached_result(task_id)
+    if cached is not None:
+        return cached
+
+    if wait > 0 and since:
+        response = await _wait_for_result_change(task_id, since, wait)
+    else:
+        # AsyncResult.state / info는 속성마다 동기 Redis GET + decode를 이벤트 루프에서 실행하므로
+        # async client로 메타를 한 번만 읽는다 (Redis 결과가 만료된 완료 task는 장기 보관소에서 찾는다).
+        response = _build_result_response_from_meta(task_id, await load_task_meta(task_id))
+    if response["status"] != "completed":
+        return response
+    return cache_completed_result(task_id, response)
 
+
+def cached_json_response(entry: CachedResponse, request: Request) -> Response:
+    """캐시된 JSON 응답을 ETag와 함께 보낸다. If-None-Match가 같으면 304."""
+    headers = {"ETag": entry.etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/result/{task_id}/events",
+    summary="분석 진행 상태 스트림 (SSE)",
+    description=(
+        "task 상태가 바뀔 때마다 GET /result/{task_id}와 같은 본문을 Server-Sent Events로 보낸다.\n\n"
+        "- 연결 직후 현재 상태를 한 번 보낸다.\n"
+        "- event 이름은 queued / processing / completed / failed 이며, completed / failed 를 보낸 뒤 스트림을 닫는다.\n"
+        f"- 상태 변화가 없으면 {int(_SSE_KEEPALIVE_SECONDS)}초마다 keep-alive 주석을 보낸다."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "text/event-stream",
+            "content": {
+                "text/event-stream": {
+                    "example": (
+                        'event: processing\ndata: {"success": true, "task_id": "...", "status": "PARSING", "msg": "PDF 파싱 중"}\n\n'
+                        'event: completed\ndata: {"success": true, "task_id": "...", "status": "completed", "result": {}}\n\n'
+                    )
+                }
+            },
+        },
+        400: {"description": "유효하지 않은 task_id 형식"},
+    },
+)
+async def stream_result_events(task_id: str):
+    """task 진행 상태를 SSE로 보낸다. worker가 상태를 기록하면 Redis pub/sub으로 바로 전달된다."""
+    try:
+        uuid.UUID(task_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"유효하지 않은 task_id 형식입니다: {task_id}",
+        )
+    return StreamingResponse(
+        _result_event_stream(task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _wait_for_result_change(task_id: str, since: str, wait: float) -> dict:
+    """status가 since에서 바뀌거나 완료/실패하거나 wait초가 지나면 현재 상태를 반환한다."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    async with subscribe_task_events(task_id) as queue:
+        response = _build_result_response_from_meta(task_id, await load_task_meta(task_id))
+        while response["status"] == since and _result_phase(response) not in ("completed", "failed"):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                meta = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except TimeoutError:
+                break
+            response = _build_result_response_from_meta(task_id, await resolve_completed_meta(meta))
+    return response
+
+
+async def _result_event_stream(task_id: str):
+    async with subscribe_task_events(task_id) as queue:
+        # 구독한 뒤 현재 상태를 읽어야 그 사이에 바뀐 상태를 놓치지 않는다.
+        response = _build_result_response_from_meta(task_id, await load_task_meta(task_id))
+        yield _sse_event(response)
+        last = response
+        while _result_phase(response) not in ("completed", "failed"):
+            try:
+                meta = await asyncio.wait_for(queue.get(), timeout=_SSE_KEEPALIVE_SECONDS)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            response = _build_result_response_from_meta(task_id, await resolve_completed_meta(meta))
+            if response != last:
+                yield _sse_event(response)
+                last = response
+
+
+def _sse_event(response: dict) -> str:
+    data = json.dumps(response, ensure_ascii=False, default=str)
+    return f"event: {_result_phase(response)}\ndata: {data}\n\n"
+
+
+def _build_result_response_from_meta(task_id: str, meta: dict | None) -> dict:
+    """Redis에서 직접 읽은 celery-task-meta 값을 result 응답으로 변환한다."""
+    if not meta:
+        return _build_result_response(task_id, "PENDING", None)
+    state = str(meta.get("status") or "PENDING")
+    result = meta.get("result")
+    if state in states.EXCEPTION_STATES:
+        result = celery_app.backend.exception_to_python(result)
+    return _build_result_response(task_id, state, result)
+
+
+def _build_result_response(task_id: str, state: str, info: Any) -> dict:
+    """task 상태와 결과(info)를 API 응답 포맷으로 변환한다.
+
+    info는 SUCCESS일 때 task 반환값, FAILURE일 때 예외, 그 외 상태에서는 meta dict다.
+    """
     # PENDING은 대기열 혼잡 상황에서 정상 task도 길게 유지될 수 있으므로
     # 404로 판정하지 않고 queued로 응답한다.
-    if task.state == "PENDING":
+    if state == "PENDING":
         return {"success": True, "task_id": task_id, "status": "queued"}
 
-    elif task.state == "SUCCESS":
+    elif state == "SUCCESS":
         return {
             "success": True,
             "task_id": task_id,
             "status": "completed",
-            "result": task.result,
+            "result": info,
         }
 
-    elif task.state == "FAILURE":
-        raw_error = str(task.info)
+    elif state == "FAILURE":
+        raw_error = str(info)
         error_code = _extract_jdpatent_error_code(raw_error)
         if error_code:
             return {
@@ -449,10 +1538,15 @@ async def get_result(task_id: str):
 
     else:
         # 커스텀 상태: PARSING, MODEL_1, MODEL_2, ... FORMATTING
-        meta = task.info if isinstance(task.info, dict) else {}
-        return {
+        meta = info if isinstance(info, dict) else {}
+        response = {
             "success": True,
             "task_id": task_id,
-            "status": task.state,
+            "status": state,
             "msg": meta.get("msg", ""),
         }
+        # 스트리밍 OCR 중이면 페이지 진행률과 앞면으로 감지한 특허 타입을 함께 준다.
+        for key in ("progress", "patent_type", "patent_kind_code"):
+            if key in meta:
+                response[key] = meta[key]
+        return response
@@ -12,12 +12,47 @@ class Settings(BaseSettings):
     RUNPOD_RUN_URL: str | None = None
     RUNPOD_STATUS_URL: str | None = None
     RUNPOD_OCR_DUMP_DIR: str = "/app/logs/ocr_results"
+    # 완료 webhook: /run에 PUBLIC_BASE_URL/internal/runpod/webhook 을 넘기고 /status 조회는 fallback으로만 한다.
+    RUNPOD_WEBHOOK_ENABLED: bool = False
+    RUNPOD_WEBHOOK_SECRET: str = ""  # webhook URL의 token (비어 있으면 webhook 비활성)
+    RUNPOD_WEBHOOK_FALLBACK_POLL_SECONDS: float = 30.0  # webhook 유실 대비 /status 조회 간격
+    RUNPOD_SUBMIT_TIMEOUT_SECONDS: float = 30.0  # /run 응답 대기
+    RUNPOD_STATUS_TIMEOUT_SECONDS: float = 20.0  # /status 응답 대기
+    # 스트리밍 OCR: handler가 페이지별 결과를 yield할 때 /stream으로 페이지를 모아 진행률/타입 감지를 앞당긴다.
+    RUNPOD_STREAM_ENABLED: bool = False
+    RUNPOD_STREAM_URL: str | None = None
+    RUNPOD_STREAM_POLL_SECONDS: float = 3.0  # 실행 중 /stream 조회 간격 상한
+
+    # OCR 텍스트 캐시 (PDF SHA-256 + patent_origin + 모델 버전)
+    OCR_CACHE_ENABLED: bool = True
+    OCR_CACHE_DIR: str = "/app/logs/ocr_cache"
+    OCR_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    OCR_MODEL_VERSION: str = "deepseek-ocr2"
+
+    # PDF 사전 검사(preflight): 업로드 스트림에서 페이지 수/암호화/텍스트 레이어 확인
+    PREFLIGHT_MAX_PAGES: int = 500  # 초과 시 S3/OCR 전에 413으로 거절
+    PREFLIGHT_REJECT_ENCRYPTED: bool = False  # True면 /Encrypt가 있는 PDF를 거절
+    PREFLIGHT_SMALL_MAX_PAGES: int = 10  # 이하: small lane
+    PREFLIGHT_LARGE_MIN_PAGES: int = 100  # 이상: large lane
+    PREFLIGHT_LARGE_MIN_BYTES: int = 30 * 1024 * 1024  # 페이지 수를 모를 때 large lane 기준
+    # lane별 큐 라우팅 (small / standard / large). 끄면 모든 작업이 기존 celery / pipeline-stages 큐로 간다.
+    LANE_ROUTING_ENABLED: bool = True
+    LANE_SMALL_MAX_BYTES_WITHOUT_PAGES: int = 1024 * 1024  # 페이지 수를 모르는 KR 공보의 small lane 기준
+
+    # 업로드 PDF 저장소: "s3" | "local"(TEMP_PDF_DIR + 서명 URL) | "memory"(eager/벤치마크 전용)
+    PDF_STORAGE_BACKEND: str = "s3"
+    # task를 worker 없이 호출 프로세스에서 바로 실행 (로컬 검증용)
+    CELERY_TASK_ALWAYS_EAGER: bool = False
+    # app/test 벤치마크 스크립트가 켠다 (memory 저장소 허용 등)
+    BENCH_MODE: bool = False
 
     # 임시 PDF URL 전달용
     PUBLIC_BASE_URL: str = "http://localhost:8000"
     TEMP_PDF_DIR: str = "/app/tmp/pdfs"
     TEMP_PDF_TTL_SECONDS: int = 600
     TEMP_PDF_CLEANUP_INTERVAL_SECONDS: int = 60
+    # PDF_STORAGE_BACKEND=local 파이프라인 PDF 중 worker 비정상 종료 등으로 남은 파일 정리 기준 (대기열 대기 + 처리 시간보다 길게)
+    TEMP_PDF_PIPELINE_MAX_AGE_SECONDS: int = 86400
     TEMP_PDF_SIGNING_KEY: str = ""
 
     # AWS S3
@@ -26,15 +61,77 @@ class Settings(BaseSettings):
     AWS_REGION: str = "ap-northeast-2"
     AWS_S3_BUCKET: str = ""
     AWS_S3_PRESIGNED_URL_EXPIRES: int = 600  # presigned URL 유효 시간 (초)
+    AWS_S3_PRESIGNED_UPLOAD_EXPIRES: int = 900  # 직접 업로드용 presigned POST 유효 시간 (초)
+    AWS_S3_MULTIPART_PART_SIZE: int = 5 * 1024 * 1024  # 스트리밍 업로드 part 크기 (최소 5MB)
+    AWS_S3_IO_MAX_WORKERS: int = 8  # API 프로세스의 S3 I/O 전용 스레드 수
+    AWS_S3_MAX_POOL_CONNECTIONS: int = 16  # 프로세스당 S3 keep-alive 연결 풀 크기
+
+    # Celery 결과 저장: 큰 결과 메타는 gzip 압축하고, 압축 후에도 크면 blob 저장소에 두고 Redis에는 위치만 남긴다.
+    RESULT_EXPIRES_SECONDS: int = 3600  # Celery result_expires, local blob 보관 시간
+    RESULT_COMPRESSION_ENABLED: bool = True
+    RESULT_COMPRESS_MIN_BYTES: int = 1024  # 이보다 작은 메타(진행 상태 등)는 JSON 그대로
+    RESULT_COMPRESS_LEVEL: int = 6
+    RESULT_OFFLOAD_ENABLED: bool = True
+    RESULT_OFFLOAD_MIN_BYTES: int = 8 * 1024  # 압축 후 크기 기준
+    RESULT_OFFLOAD_BACKEND: str = "local"  # "local"(RESULT_OFFLOAD_DIR, API/Worker 공유) | "s3"(AWS_S3_BUCKET/results/)
+    RESULT_OFFLOAD_DIR: str = "/app/logs/results"
+    # 완료 결과 장기 보관 (SQLite, task_id / PDF 해시로 조회). Redis 결과가 만료된 뒤의 조회와 중복 요청에 쓴다.
+    RESULT_ARCHIVE_ENABLED: bool = True
+    RESULT_ARCHIVE_PATH: str = "/app/logs/result_archive.sqlite3"  # API/Worker가 같은 호스트 디스크에서 공유
+    RESULT_ARCHIVE_RETENTION_DAYS: int = 90
+    # GET /result?wait= long-poll 최대 대기 시간. ALB 기본 idle timeout(60초)보다 짧게 둔다.
+    RESULT_LONG_POLL_MAX_SECONDS: float = 55.0
+    # POST /results 한 번에 조회할 수 있는 최대 task 수 (MGET 한 번)
+    RESULTS_BULK_MAX_TASKS: int = 500
+    # 완료 결과 응답 캐시 (프로세스 메모리 LRU, 직렬화된 본문 기준 크기 제한)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
 
     # App
     LOG_LEVEL: str = "INFO"
 
+    # 동일 PDF 중복 분석 방지 (SHA-256 + country → task_id)
+    DEDUP_ENABLED: bool = True
+    DEDUP_TTL_SECONDS: int = 3600
+
+    # 수락 제어: broker 대기 + 실행 중 task가 ADMISSION_MAX_BACKLOG를 넘으면 429 + Retry-After
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_BACKLOG: int = 30
+    ADMISSION_WORKER_SLOTS: int = 3  # 전체 worker 동시 처리 수 (worker_concurrency x worker 수)
+    ADMISSION_DEFAULT_TASK_SECONDS: float = 300.0  # 처리 시간 기록이 없을 때 task당 예상 시간
+    ADMISSION_RETRY_AFTER_MIN_SECONDS: int = 5
+    ADMISSION_RETRY_AFTER_MAX_SECONDS: int = 1800
+
+    # 배치 분석 (POST /api/v1/analyze/batch)
+    BATCH_MAX_FILES: int = 500
+    BATCH_UPLOAD_CONCURRENCY: int = 8
+    BATCH_TTL_SECONDS: int = 86400
+
     # JDPatent Internal API
     JDPATENT_API_URL: str = "http://jdpatent-api:8001"
     JDPATENT_SUBMIT_TIMEOUT_SECONDS: float = 15.0
     JDPATENT_POLL_TIMEOUT_SECONDS: float = 900.0
     JDPATENT_POLL_INTERVAL_SECONDS: float = 2.0
+    # 완료 callback: 작업 등록 시 PUBLIC_BASE_URL/internal/jdpatent/callback 을 넘기고 상태 조회는 fallback으로만 한다.
+    JDPATENT_CALLBACK_ENABLED: bool = False
+    JDPATENT_CALLBACK_SECRET: str = ""  # callback URL의 token (비어 있으면 callback 비활성)
+    JDPATENT_CALLBACK_FALLBACK_POLL_SECONDS: float = 60.0  # callback 유실 대비 상태 조회 간격
+
+    # RunPod/JDPatent HTTP client: 프로세스당 서비스별 client 하나를 재사용한다 (keep-alive 연결 풀).
+    HTTP_CLIENT_HTTP2: bool = True  # h2 패키지가 없으면 HTTP/1.1로 동작
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20  # 서비스별 프로세스당 최대 연결 수
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 10  # 유휴 상태로 유지할 연결 수
+    HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS: float = 90.0  # fallback 조회 간격(최대 60초)보다 길게
+    HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = 5.0  # 연결 수립 / 풀에서 연결 대기
+    HTTP_CLIENT_METRICS_FLUSH_SECONDS: float = 30.0  # 연결 재사용 지표를 Redis에 합산하는 주기
+
+    # Worker 실행 모드: "stages"(단계별 Celery task) | "asyncio"(프로세스 하나의 이벤트 루프에서 coroutine 실행)
+    WORKER_RUNTIME: str = "stages"
+    # 파이프라인 전체 마감 (단계별 모드의 context deadline, asyncio 모드의 asyncio.timeout)
+    PIPELINE_SOFT_TIME_LIMIT_SECONDS: int = 1500
+    # Celery task_time_limit. 수락 제어는 이 시간이 지난 진행 중 기록을 유령으로 보고 제외한다.
+    PIPELINE_TIME_LIMIT_SECONDS: int = 1800
+    ASYNC_WORKER_MAX_INFLIGHT: int = 256  # asyncio 모드에서 동시에 진행하는 파이프라인 수 상한
 
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
@@ -14,9 +14,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from loguru import logger
 
-from app.api.routes import get_result as get_v1_result, router
+from app.api.internal import internal_router
+from app.api.routes import cached_json_response, fetch_result as fetch_v1_result, router
 from app.config import settings
 from app.logging_config import setup_logging
+from app.services.admission_service import get_inflight_task_ids
+from app.services.http_client_service import get_http_client_metrics
+from app.services.lane_service import lane_queues
+from app.services.progress_stream_service import close_task_event_hub
+from app.services.redis_service import close_async_redis
+from app.services.result_cache_service import CachedResponse, load_static_json
+from app.services.s3_service import S3NotConfiguredError, get_s3_io_metrics, shutdown_s3_io_executor
+from app.services.storage_service import check_storage_backend_settings
 from app.services.temp_pdf_service import cleanup_expired_temp_pdfs
 from app.worker.celery_app import celery_app
 
@@ -73,6 +82,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
             "msg": str(exc.detail),
             "request_id": request_id,
         },
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -92,6 +102,22 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.exception_handler(S3NotConfiguredError)
+async def s3_not_configured_handler(request: Request, exc: S3NotConfiguredError):
+    """S3 설정 누락은 서버 설정 문제이므로 traceback 없이 503으로 응답."""
+    request_id = getattr(request.state, "request_id", "unknown")
+    logger.bind(event="s3_not_configured").error(f"S3 미설정 - request_id={request_id}: {exc}")
+    return JSONResponse(
+        status_code=503,
+        content={
+            "success": False,
+            "error": "Service Unavailable",
+            "msg": "PDF 저장소가 설정되지 않았습니다. 관리자에게 문의해 주세요.",
+            "request_id": request_id,
+        },
+    )
+
+
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
     """잘못된 입력값 예외 처리."""
@@ -129,6 +155,7 @@ async def logging_middleware(request: Request, call_next):
 # Router 등록
 # ---------------------------------------------------------------------------
 app.include_router(router, prefix="/api/v1")
+app.include_router(internal_router)
 
 
 async def _temp_pdf_cleanup_loop() -> None:
@@ -143,6 +170,12 @@ async def _temp_pdf_cleanup_loop() -> None:
         await sleep(interval_seconds)
 
 
+@app.on_event("startup")
+async def startup_check_storage_backend() -> None:
+    # 잘못된 저장소 설정은 첫 업로드가 아니라 시작 시점에 드러나게 한다.
+    check_storage_backend_settings()
+
+
 @app.on_event("startup")
 async def startup_temp_pdf_cleanup_task() -> None:
     app.state.temp_pdf_cleanup_task = create_task(_temp_pdf_cleanup_loop())
@@ -155,6 +188,17 @@ async def shutdown_temp_pdf_cleanup_task() -> None:
         cleanup_task.cancel()
 
 
+@app.on_event("shutdown")
+async def shutdown_s3_io() -> None:
+    shutdown_s3_io_executor()
+
+
+@app.on_event("shutdown")
+async def shutdown_redis() -> None:
+    await close_task_event_hub()
+    await close_async_redis()
+
+
 @app.get("/health")
 async def health_check():
     return {"success": True, "status": "ok"}
@@ -385,20 +429,19 @@ def _state_to_stage(state: str) -> str:
         },
     },
 )
-async def get_v3_result(task_id: str):
-    v1_response = await get_v1_result(task_id)
+async def get_v3_result(task_id: str, request: Request):
+    v1_response = await fetch_v1_result(task_id)
+    # v1 조회는 completed 결과만 직렬화된 캐시 응답으로 돌려준다.
+    if not isinstance(v1_response, CachedResponse):
+        return v1_response
 
-    if isinstance(v1_response, dict) and v1_response.get("status") == "completed":
-        if not _V3_RESULT_PATH.exists():
-            raise HTTPException(status_code=404, detail="output_v3.json 파일을 찾을 수 없습니다.")
-
-        try:
-            mock_payload = json.loads(_V3_RESULT_PATH.read_text(encoding="utf-8"))
-            return mock_payload
-        except json.JSONDecodeError as exc:
-            raise HTTPException(status_code=500, detail="output_v3.json JSON 파싱에 실패했습니다.") from exc
-
-    return v1_response
+    try:
+        fixture = load_static_json(_V3_RESULT_PATH)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail="output_v3.json 파일을 찾을 수 없습니다.") from exc
+    except json.JSONDecodeError as exc:
+        raise HTTPException(status_code=500, detail="output_v3.json JSON 파싱에 실패했습니다.") from exc
+    return cached_json_response(fixture, request)
 
 
 @app.get("/log")
@@ -477,19 +520,37 @@ async def log_queue_snapshot():
         "other_active": [],
     }
 
-    for task_id in active_ids:
+    # 파이프라인은 짧은 단계 task로 나뉘어 있어 worker의 active task로는 단계를 알 수 없다.
+    # 진행 중 파이프라인(root task_id)의 상태로 단계를 집계한다.
+    try:
+        inflight_ids = get_inflight_task_ids()
+    except Exception as exc:
+        logger.warning(f"진행 중 파이프라인 조회 실패: {exc}")
+        inflight_ids = []
+
+    for task_id in inflight_ids:
         state = AsyncResult(task_id, app=celery_app).state
         stage = _state_to_stage(state)
         stage_counts[stage] += 1
         stage_task_ids.setdefault(stage, []).append(task_id)
 
-    broker_ready_count = 0
+    # lane별 진입 큐 / 단계 큐 대기 수 (broker list 키 = 큐 이름)
+    lanes = {lane: {**queues, "ready_count": 0, "stage_ready_count": 0} for lane, queues in lane_queues().items()}
     try:
         backend_client = getattr(celery_app.backend, "client", None)
         if backend_client is not None:
-            broker_ready_count = int(backend_client.llen("celery") or 0)
+            with backend_client.pipeline(transaction=False) as pipe:
+                for lane in lanes.values():
+                    pipe.llen(lane["queue"])
+                    pipe.llen(lane["stage_queue"])
+                lengths = iter(pipe.execute())
+            for lane in lanes.values():
+                lane["ready_count"] = int(next(lengths) or 0)
+                lane["stage_ready_count"] = int(next(lengths) or 0)
     except Exception as exc:
         logger.warning(f"큐 길이 조회 실패: {exc}")
+    broker_ready_count = sum(lane["ready_count"] for lane in lanes.values())
+    stage_queue_ready_count = sum(lane["stage_ready_count"] for lane in lanes.values())
 
     queued_estimate = broker_ready_count + len(reserved_ids) + len(scheduled_ids)
     queued_known_ids = sorted(set(reserved_ids + scheduled_ids))
@@ -500,6 +561,7 @@ async def log_queue_snapshot():
             "active_count": len(active_ids),
             "reserved_count": len(reserved_ids),
             "scheduled_count": len(scheduled_ids),
+            "inflight_pipeline_count": len(inflight_ids),
         },
         "queue": {
             "broker_ready_count": broker_ready_count,
@@ -508,7 +570,9 @@ async def log_queue_snapshot():
             "queued_estimate": queued_estimate,
             "queued_known_ids_count": len(queued_known_ids),
             "queued_unknown_ids_count": broker_ready_count,
+            "stage_queue_ready_count": stage_queue_ready_count,
         },
+        "lanes": lanes,
         "stages": {
             "queued": queued_estimate,
             "runpod_parsing": stage_counts["runpod_parsing"],
@@ -530,6 +594,23 @@ async def log_queue_snapshot():
     }
 
 
+@app.get("/log/s3")
+async def log_s3_io_snapshot():
+    return {
+        "snapshot_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "executor": get_s3_io_metrics(),
+    }
+
+
+@app.get("/log/http")
+def log_http_client_snapshot():
+    """worker의 RunPod/JDPatent 연결 재사용 지표 (HTTP_CLIENT_METRICS_FLUSH_SECONDS 주기로 합산)."""
+    return {
+        "snapshot_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "clients": get_http_client_metrics(),
+    }
+
+
 @app.get("/sample")
 async def sample_report():
     return FileResponse(_STATIC_DIR / "sample.html", media_type="text/html")
@@ -0,0 +1,141 @@
+"""분석 요청 수락(admission) 제어 서비스.
+
+broker 대기열 길이(lane별 진입 큐 `llen` 합계)와 진행 중인 파이프라인 수를 합친 backlog가
+ADMISSION_MAX_BACKLOG를 넘으면 새 요청을 받지 않고, 최근 task 처리 시간으로
+언제 다시 시도하면 될지(Retry-After)를 계산한다.
+
+진행 중 파이프라인은 worker가 시작/종료 시 Redis sorted set에 기록한다(score=시작 시각).
+worker가 비정상 종료해도 남은 항목은 파이프라인 제한 시간이 지나면 집계에서 제외된다.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+
+from app.config import settings
+from app.services.lane_service import entry_queue_names
+from app.services.redis_service import get_async_redis, get_redis
+
+_INFLIGHT_KEY = "jd-admission:inflight"
+_DURATIONS_KEY = "jd-admission:durations"
+# 평균 처리 시간 계산에 쓰는 최근 task 수
+_DURATION_SAMPLES = 50
+# 진행 중 집합에서 제외하는 기준의 여유 (파이프라인 제한 시간에 더한다)
+_INFLIGHT_STALE_MARGIN_SECONDS = 60
+
+
+def _inflight_stale_seconds() -> float:
+    """이보다 오래된 진행 중 기록은 종료 기록 없이 죽은 task로 본다 (파이프라인 제한 시간 + 여유)."""
+    limit = max(settings.PIPELINE_TIME_LIMIT_SECONDS, settings.PIPELINE_SOFT_TIME_LIMIT_SECONDS)
+    return limit + _INFLIGHT_STALE_MARGIN_SECONDS
+
+
+@dataclass(frozen=True)
+class AdmissionDecision:
+    admitted: bool
+    queue_depth: int
+    inflight: int
+    backlog: int
+    avg_task_seconds: float
+    retry_after: int = 0
+
+
+async def check_admission(incoming: int = 1) -> AdmissionDecision | None:
+    """요청 incoming건을 받아도 되는지 판단한다.
+
+    Returns:
+        비활성화됐거나 Redis 조회에 실패하면 None (요청은 그대로 수락).
+    """
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return None
+
+    now = time.time()
+    try:
+        client = get_async_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(_INFLIGHT_KEY, "-inf", now - _inflight_stale_seconds())
+            pipe.zcard(_INFLIGHT_KEY)
+            pipe.lrange(_DURATIONS_KEY, 0, _DURATION_SAMPLES - 1)
+            # broker list 키 = 큐 이름 (/log/queue와 동일)
+            for queue in entry_queue_names():
+                pipe.llen(queue)
+            _, inflight, durations, *queue_lengths = await pipe.execute()
+    except Exception as exc:
+        logger.bind(event="admission_check_failed").warning(f"admission 조회 실패, 요청 수락: {exc}")
+        return None
+
+    queue_depth = sum(int(length or 0) for length in queue_lengths)
+    inflight = int(inflight or 0)
+    avg_task_seconds = _average_seconds(durations)
+    backlog = queue_depth + inflight
+    max_backlog = max(int(settings.ADMISSION_MAX_BACKLOG), 1)
+
+    if backlog + incoming <= max_backlog:
+        return AdmissionDecision(
+            admitted=True,
+            queue_depth=queue_depth,
+            inflight=inflight,
+            backlog=backlog,
+            avg_task_seconds=avg_task_seconds,
+        )
+
+    return AdmissionDecision(
+        admitted=False,
+        queue_depth=queue_depth,
+        inflight=inflight,
+        backlog=backlog,
+        avg_task_seconds=avg_task_seconds,
+        retry_after=_retry_after_seconds(backlog + incoming - max_backlog, avg_task_seconds),
+    )
+
+
+def _average_seconds(raw_durations: list) -> float:
+    samples = []
+    for raw in raw_durations or []:
+        try:
+            samples.append(float(raw))
+        except (TypeError, ValueError):
+            continue
+    if not samples:
+        return float(settings.ADMISSION_DEFAULT_TASK_SECONDS)
+    return sum(samples) / len(samples)
+
+
+def _retry_after_seconds(excess: int, avg_task_seconds: float) -> int:
+    """초과분 excess건이 빠질 때까지 걸리는 시간을 worker slot 수로 나눠 추정한다."""
+    slots = max(int(settings.ADMISSION_WORKER_SLOTS), 1)
+    estimate = math.ceil(excess / slots) * avg_task_seconds
+    lower = int(settings.ADMISSION_RETRY_AFTER_MIN_SECONDS)
+    upper = int(settings.ADMISSION_RETRY_AFTER_MAX_SECONDS)
+    return int(min(max(math.ceil(estimate), lower), upper))
+
+
+def mark_task_started(task_id: str) -> None:
+    """worker에서 파이프라인을 시작할 때 호출한다."""
+    try:
+        get_redis().zadd(_INFLIGHT_KEY, {task_id: time.time()})
+    except Exception as exc:
+        logger.warning(f"실행 중 task 기록 실패 - task_id={task_id}, error={exc}")
+
+
+def mark_task_finished(task_id: str) -> None:
+    """파이프라인이 끝나면(성공/실패 무관) 호출해 처리 시간을 기록한다."""
+    try:
+        client = get_redis()
+        started_at = client.zscore(_INFLIGHT_KEY, task_id)
+        with client.pipeline(transaction=False) as pipe:
+            pipe.zrem(_INFLIGHT_KEY, task_id)
+            if started_at is not None:
+                pipe.lpush(_DURATIONS_KEY, round(time.time() - float(started_at), 3))
+                pipe.ltrim(_DURATIONS_KEY, 0, _DURATION_SAMPLES - 1)
+            pipe.execute()
+    except Exception as exc:
+        logger.warning(f"실행 중 task 정리 실패 - task_id={task_id}, error={exc}")
+
+
+def get_inflight_task_ids() -> list[str]:
+    """진행 중인 파이프라인의 root task_id 목록 (오래된 항목 제외)."""
+    members = get_redis().zrangebyscore(_INFLIGHT_KEY, time.time() - _inflight_stale_seconds(), "+inf")
+    return [member.decode() if isinstance(member, bytes) else str(member) for member in members]
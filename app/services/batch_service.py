@@ -0,0 +1,55 @@
+"""배치 분석 요청 기록 및 task 메타 일괄 조회 서비스."""
+
+import json
+from typing import Any
+
+from app.config import settings
+from app.services.redis_service import get_async_redis
+from app.services.result_archive_service import archived_task_ids_async
+from app.services.result_store_service import decode_task_meta
+
+_BATCH_KEY_PREFIX = "jd-batch"
+_TASK_META_KEY_PREFIX = "celery-task-meta-"
+
+
+def _batch_key(batch_id: str) -> str:
+    return f"{_BATCH_KEY_PREFIX}:{batch_id}"
+
+
+async def save_batch(batch_id: str, record: dict[str, Any]) -> None:
+    """배치 구성(item별 파일명/task_id)을 TTL과 함께 저장한다."""
+    client = get_async_redis()
+    await client.set(
+        _batch_key(batch_id),
+        json.dumps(record, ensure_ascii=False),
+        ex=max(int(settings.BATCH_TTL_SECONDS), 1),
+    )
+
+
+async def load_batch(batch_id: str) -> dict[str, Any] | None:
+    client = get_async_redis()
+    raw = await client.get(_batch_key(batch_id))
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+async def fetch_task_metas(task_ids: list[str]) -> dict[str, dict[str, Any] | None]:
+    """여러 task의 celery-task-meta를 MGET 한 번으로 읽어 decode한다.
+
+    결과 메타가 아직 없는 task(PENDING)는 None으로 채운다. 외부 저장되거나 장기 보관소에만 있는
+    완료 결과는 상태만 채우고 result는 None이다.
+    """
+    if not task_ids:
+        return {}
+    client = get_async_redis()
+    raw_values = await client.mget([f"{_TASK_META_KEY_PREFIX}{task_id}" for task_id in task_ids])
+
+    # 배치 상태 집계는 상태만 쓰므로 blob으로 옮겨진 결과는 읽지 않는다.
+    metas = {task_id: decode_task_meta(raw, load_result=False) for task_id, raw in zip(task_ids, raw_values)}
+
+    # Redis 결과가 만료된 task는 장기 보관소에 있으면 완료로 본다.
+    missing = [task_id for task_id, meta in metas.items() if meta is None]
+    for task_id in await archived_task_ids_async(missing):
+        metas[task_id] = {"status": "SUCCESS", "result": None, "task_id": task_id, "archived": True}
+    return metas
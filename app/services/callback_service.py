@@ -0,0 +1,188 @@
+"""외부 작업 완료 알림(webhook/callback) 저장과 대기 처리.
+
+RunPod, JDPatent처럼 작업이 끝나면 우리 API를 호출해 주는 서비스를 위해
+알림 본문을 Redis에 저장하고 기다리는 쪽을 깨운다. 키는 (source, 작업 ID) 단위다.
+
+- 단계별 Celery 모드: 작업 등록 시 맡겨 둔 파이프라인 context(waiter)를 알림을 받은 쪽이 회수해
+  다음 상태 확인 단계를 바로 예약한다.
+- asyncio 모드: 작업별 pub/sub 채널로 알린다. 이벤트 루프마다 pub/sub 연결 하나(CallbackHub)를 두고
+  대기 중인 coroutine들이 나눠 쓴다 (progress_stream_service.TaskEventHub와 같은 구조).
+"""
+
+import asyncio
+import hmac
+import json
+import os
+from typing import Any
+
+from loguru import logger
+
+from app.services.redis_service import get_async_redis, get_redis
+
+_KEY_PREFIX = "jd-callback"
+# 외부 작업 최대 대기(RunPod 600초, JDPatent 900초)보다 충분히 길게 보관한다.
+_KEY_TTL_SECONDS = 3600
+
+
+def _status_key(source: str, job_id: str) -> str:
+    return f"{_KEY_PREFIX}:{source}:status:{job_id}"
+
+
+def _waiter_key(source: str, job_id: str) -> str:
+    return f"{_KEY_PREFIX}:{source}:waiter:{job_id}"
+
+
+def _channel(source: str, job_id: str) -> str:
+    return f"{_KEY_PREFIX}:{source}:done:{job_id}"
+
+
+def verify_token(token: str | None, secret: str) -> bool:
+    if not secret or not token:
+        return False
+    # str끼리 비교하면 ASCII가 아닌 문자가 섞였을 때 TypeError가 나므로 bytes로 비교한다.
+    return hmac.compare_digest(token.encode("utf-8"), secret.encode("utf-8"))
+
+
+async def record_callback(source: str, job_id: str, payload: dict[str, Any]) -> dict[str, Any] | None:
+    """알림 본문을 저장하고 대기 중인 쪽에 알린다.
+
+    Returns:
+        단계별 모드에서 맡겨 둔 파이프라인 context. 반환받은 호출자가 다음 단계를 예약한다.
+    """
+    client = get_async_redis()
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.set(_status_key(source, job_id), json.dumps(payload, ensure_ascii=False), ex=_KEY_TTL_SECONDS)
+        pipe.getdel(_waiter_key(source, job_id))
+        pipe.publish(_channel(source, job_id), "1")
+        _, waiter, _ = await pipe.execute()
+    return json.loads(waiter) if waiter is not None else None
+
+
+def get_callback(source: str, job_id: str) -> dict[str, Any] | None:
+    raw = get_redis().get(_status_key(source, job_id))
+    return json.loads(raw) if raw is not None else None
+
+
+def register_waiter(source: str, job_id: str, ctx: dict[str, Any]) -> None:
+    """알림이 도착하면 이어서 실행할 파이프라인 context를 맡긴다."""
+    get_redis().set(_waiter_key(source, job_id), json.dumps(ctx, ensure_ascii=False), ex=_KEY_TTL_SECONDS)
+
+
+def claim_waiter(source: str, job_id: str) -> bool:
+    """맡겨 둔 context를 회수한다. 알림을 받은 쪽이 먼저 가져갔으면 False."""
+    return get_redis().getdel(_waiter_key(source, job_id)) is not None
+
+
+class CallbackHub:
+    """이벤트 루프당 pub/sub 연결 하나로 여러 작업의 완료 알림 채널을 구독한다."""
+
+    def __init__(self) -> None:
+        self._pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+        self._waiters: dict[str, set[asyncio.Event]] = {}
+        self._lock = asyncio.Lock()
+        self._active = asyncio.Event()
+        self._reader: asyncio.Task | None = None
+
+    async def subscribe(self, channel: str) -> asyncio.Event:
+        event = asyncio.Event()
+        async with self._lock:
+            waiters = self._waiters.setdefault(channel, set())
+            if not waiters:
+                await self._pubsub.subscribe(channel)
+            waiters.add(event)
+            self._active.set()
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read_loop())
+        return event
+
+    async def unsubscribe(self, channel: str, event: asyncio.Event) -> None:
+        async with self._lock:
+            waiters = self._waiters.get(channel)
+            if waiters is None:
+                return
+            waiters.discard(event)
+            if waiters:
+                return
+            del self._waiters[channel]
+            if not self._waiters:
+                self._active.clear()
+            try:
+                await self._pubsub.unsubscribe(channel)
+            except Exception as exc:
+                logger.warning(f"완료 알림 채널 구독 해제 실패 - channel={channel}, error={exc}")
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                if not self._waiters:
+                    await self._active.wait()
+                    continue
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # 연결이 끊기면 redis-py가 재연결 시 기존 채널을 다시 구독한다.
+                logger.warning(f"완료 알림 pub/sub 수신 실패: {exc}")
+                await asyncio.sleep(1.0)
+                continue
+            if message is not None and message.get("type") == "message":
+                self._dispatch(message)
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        for event in self._waiters.get(channel, ()):
+            event.set()
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self._pubsub.aclose()
+        self._waiters.clear()
+
+
+_hub: CallbackHub | None = None
+_hub_key: tuple[int, int] | None = None
+
+
+def get_callback_hub() -> CallbackHub:
+    """현재 이벤트 루프의 CallbackHub (get_async_redis와 같이 (pid, loop) 단위)."""
+    global _hub, _hub_key
+    key = (os.getpid(), id(asyncio.get_running_loop()))
+    if _hub is None or _hub_key != key:
+        _hub = CallbackHub()
+        _hub_key = key
+    return _hub
+
+
+async def close_callback_hub() -> None:
+    """이벤트 루프 종료 시 pub/sub 연결을 닫는다."""
+    global _hub, _hub_key
+    hub, _hub, _hub_key = _hub, None, None
+    if hub is not None:
+        await hub.close()
+
+
+async def wait_for_callback_async(source: str, job_id: str, timeout: float) -> dict[str, Any] | None:
+    """알림을 최대 timeout초 기다린다. 오지 않으면 None."""
+    client = get_async_redis()
+    hub = get_callback_hub()
+    channel = _channel(source, job_id)
+    event = await hub.subscribe(channel)
+    try:
+        # 구독 전에 도착한 알림
+        raw = await client.get(_status_key(source, job_id))
+        if raw is None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except TimeoutError:
+                return None
+            raw = await client.get(_status_key(source, job_id))
+        return json.loads(raw) if raw is not None else None
+    finally:
+        await hub.unsubscribe(channel, event)
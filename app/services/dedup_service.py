@@ -0,0 +1,149 @@
+"""PDF 내용 해시 기반 중복 분석 요청 제거 서비스.
+
+같은 PDF(SHA-256)와 country 조합이 TTL 안에 다시 들어오면 새 파이프라인을 만들지 않고
+진행 중인 task에 붙이거나(single-flight) 완료된 결과를 그대로 돌려준다.
+TTL이 지난 PDF도 장기 보관소(result_archive_service)에 완료 결과가 있으면 그 결과를 돌려준다.
+
+S3 직접 업로드(s3_key)는 해시를 모르므로 key 자체를 선점해 한 업로드가 파이프라인 하나만 시작하게 한다.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from app.config import settings
+from app.services.redis_service import get_async_redis
+from app.services.result_archive_service import (
+    ArchivedResult,
+    find_archived_result_async,
+    get_archived_result_async,
+)
+from app.services.result_store_service import decode_task_meta, resolve_result_ref_async
+
+_DEDUP_KEY_PREFIX = "jd-dedup"
+_UPLOAD_CLAIM_KEY_PREFIX = "jd-upload-claim"
+# 파이프라인이 끝나면 업로드 객체가 지워지므로 대기열 + 처리 시간보다 넉넉하면 된다.
+_UPLOAD_CLAIM_TTL_SECONDS = 86400
+_TASK_META_KEY_PREFIX = "celery-task-meta-"
+# 이 상태의 task에는 붙이지 않고 새 task로 대체한다.
+_REPLACEABLE_STATES = {"FAILURE", "REVOKED"}
+_CLAIM_ATTEMPTS = 3
+# 인덱스 값이 ARGV[1]일 때만 바꾼다 / 지운다.
+_COMPARE_AND_SET_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+_COMPARE_AND_DELETE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class DedupHit:
+    kind: str  # "inflight" | "completed"
+    task_id: str
+    state: str
+    result: Any = None
+
+
+def _archived_hit(archived: ArchivedResult) -> DedupHit:
+    return DedupHit(kind="completed", task_id=archived.task_id, state="SUCCESS", result=archived.result)
+
+
+def _dedup_key(pdf_sha256: str, country: str) -> str:
+    return f"{_DEDUP_KEY_PREFIX}:{country}:{pdf_sha256}"
+
+
+async def claim_or_attach(pdf_sha256: str, country: str, task_id: str) -> DedupHit | None:
+    """해시 인덱스에 task_id를 등록하거나, 이미 등록된 task 정보를 반환한다.
+
+    Returns:
+        None이면 task_id가 새로 등록된 것이므로 호출자가 task를 큐에 넣어야 한다.
+        DedupHit이면 기존 task를 재사용한다.
+    """
+    client = get_async_redis()
+    key = _dedup_key(pdf_sha256, country)
+    ttl = max(int(settings.DEDUP_TTL_SECONDS), 1)
+
+    if not await client.exists(key):
+        # Redis 인덱스가 만료된 PDF라도 장기 보관소에 완료 결과가 있으면 다시 분석하지 않는다.
+        archived = await find_archived_result_async(pdf_sha256, country)
+        if archived is not None:
+            return _archived_hit(archived)
+
+    # 다른 요청이 그 사이 인덱스를 바꾸면(만료 / 실패 task 대체) 새 값으로 다시 판단한다.
+    for _ in range(_CLAIM_ATTEMPTS):
+        if await client.set(key, task_id, nx=True, ex=ttl):
+            return None
+
+        existing = await client.get(key)
+        if existing is None:
+            # NX 실패 직후 만료된 경우
+            continue
+        existing_task_id = existing.decode("utf-8")
+
+        raw_meta = await client.get(f"{_TASK_META_KEY_PREFIX}{existing_task_id}")
+        if raw_meta is None:
+            # 결과 메타가 만료됐으면 보관소에서 찾고, 없으면 아직 worker가 집어가지 않은 task로 본다.
+            archived = await get_archived_result_async(existing_task_id)
+            if archived is not None:
+                return _archived_hit(archived)
+            return DedupHit(kind="inflight", task_id=existing_task_id, state="PENDING")
+
+        meta = decode_task_meta(raw_meta, load_result=False) or {}
+        state = str(meta.get("status") or "PENDING")
+
+        if state == "SUCCESS":
+            meta = await resolve_result_ref_async(meta)
+            return DedupHit(
+                kind="completed",
+                task_id=existing_task_id,
+                state=state,
+                result=meta.get("result"),
+            )
+
+        if state in _REPLACEABLE_STATES:
+            # 동시에 재요청한 여러 요청 중 하나만 실패 task를 대체하도록 GET 비교와 SET을 원자적으로 한다.
+            if not await client.eval(_COMPARE_AND_SET_SCRIPT, 1, key, existing_task_id, task_id, ttl):
+                continue
+            logger.bind(
+                event="analysis_dedup_replaced",
+                pdf_sha256=pdf_sha256,
+                country=country,
+                previous_task_id=existing_task_id,
+                previous_state=state,
+            ).debug("실패한 기존 task를 새 task로 대체")
+            return None
+
+        return DedupHit(kind="inflight", task_id=existing_task_id, state=state)
+
+    logger.bind(event="analysis_dedup_contended", pdf_sha256=pdf_sha256, country=country).warning(
+        "중복 제거 인덱스 경합으로 새 task를 등록합니다"
+    )
+    return None
+
+
+async def release(pdf_sha256: str, country: str, task_id: str) -> None:
+    """task 등록에 실패했을 때 자신이 등록한 인덱스만 제거한다."""
+    await get_async_redis().eval(_COMPARE_AND_DELETE_SCRIPT, 1, _dedup_key(pdf_sha256, country), task_id)
+
+
+async def claim_upload(s3_key: str, task_id: str) -> bool:
+    """직접 업로드된 s3_key를 선점한다. 이미 다른 요청이 선점했으면 False."""
+    return bool(
+        await get_async_redis().set(
+            f"{_UPLOAD_CLAIM_KEY_PREFIX}:{s3_key}", task_id, nx=True, ex=_UPLOAD_CLAIM_TTL_SECONDS
+        )
+    )
+
+
+async def release_upload(s3_key: str, task_id: str) -> None:
+    """파이프라인을 시작하지 못했을 때 자신이 선점한 s3_key만 풀어 준다."""
+    await get_async_redis().eval(_COMPARE_AND_DELETE_SCRIPT, 1, f"{_UPLOAD_CLAIM_KEY_PREFIX}:{s3_key}", task_id)
@@ -0,0 +1,256 @@
+"""RunPod / JDPatent HTTP client 재사용 서비스.
+
+작업마다 httpx.Client를 새로 만들면 상태 조회 때마다 TCP/TLS 연결을 다시 맺는다.
+프로세스당 서비스별 client 하나를 두고 keep-alive 연결 풀(가능하면 HTTP/2)을 재사용한다.
+
+- Celery prefork 자식은 worker_process_init에서 reset 후 미리 만들고, 종료 시 닫는다.
+- fork 이후 부모의 소켓을 공유하지 않도록 생성한 pid를 기록하고, pid가 바뀌면 새로 만든다.
+- asyncio runtime은 build_async_http_client로 같은 설정의 AsyncClient를 만든다.
+
+연결 재사용 지표(요청 수, 새 연결 수, TLS handshake 수, HTTP/2 요청 수)는 프로세스에서 모았다가
+HTTP_CLIENT_METRICS_FLUSH_SECONDS마다 Redis hash(jd-http:{service})에 합산한다. 조회: GET /log/http
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from functools import partial
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from app.config import settings
+from app.services.redis_service import get_redis
+
+RUNPOD = "runpod"
+JDPATENT = "jdpatent"
+SERVICES = (RUNPOD, JDPATENT)
+
+_METRICS_KEY_PREFIX = "jd-http"
+_METRIC_FIELDS = ("requests", "connections", "tls_handshakes", "http2_requests", "errors")
+
+_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+_clients_pid: int | None = None
+_http2_unavailable = False
+
+_stats_lock = threading.Lock()
+_stats: dict[str, Counter] = {}
+_last_flush = time.monotonic()
+
+
+def _service_timeout(service: str) -> float:
+    if service == JDPATENT:
+        return settings.JDPATENT_SUBMIT_TIMEOUT_SECONDS
+    return settings.RUNPOD_STATUS_TIMEOUT_SECONDS
+
+
+def http_timeout(seconds: float) -> httpx.Timeout:
+    """응답 대기 seconds, 연결 수립/풀 대기는 HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS인 timeout."""
+    connect = min(settings.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS, seconds)
+    return httpx.Timeout(seconds, connect=connect, pool=connect)
+
+
+def _limits(max_connections: int | None = None, max_keepalive: int | None = None) -> httpx.Limits:
+    max_connections = max(int(max_connections or settings.HTTP_CLIENT_MAX_CONNECTIONS), 1)
+    max_keepalive = max(int(max_keepalive or settings.HTTP_CLIENT_MAX_KEEPALIVE), 1)
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(max_keepalive, max_connections),
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def _with_http2_fallback(factory, **kwargs):
+    """HTTP/2를 켜고 client를 만든다. h2 패키지가 없으면 HTTP/1.1로 만든다."""
+    global _http2_unavailable
+    if settings.HTTP_CLIENT_HTTP2 and not _http2_unavailable:
+        try:
+            return factory(http2=True, **kwargs)
+        except ImportError:
+            _http2_unavailable = True
+            logger.warning("h2 패키지가 없어 HTTP/1.1 keep-alive로 동작합니다 (pip install 'httpx[http2]')")
+    return factory(**kwargs)
+
+
+def _build_client(service: str) -> httpx.Client:
+    return _with_http2_fallback(
+        httpx.Client,
+        timeout=http_timeout(_service_timeout(service)),
+        limits=_limits(),
+        event_hooks={
+            "request": [partial(_on_request, service)],
+            "response": [partial(_on_response, service)],
+        },
+    )
+
+
+def get_http_client(service: str) -> httpx.Client:
+    """현재 프로세스의 서비스별(runpod / jdpatent) HTTP client를 반환한다."""
+    global _clients_pid
+    pid = os.getpid()
+    client = _clients.get(service)
+    if client is not None and _clients_pid == pid:
+        return client
+    with _lock:
+        if _clients_pid != pid:
+            _clients.clear()
+            _clients_pid = pid
+        if service not in _clients:
+            _clients[service] = _build_client(service)
+            logger.debug(f"{service} HTTP client 생성 - pid={pid}")
+        return _clients[service]
+
+
+def warm_http_clients() -> None:
+    """첫 task가 client 생성 비용을 치르지 않도록 미리 만든다."""
+    for service in SERVICES:
+        get_http_client(service)
+
+
+def reset_http_clients() -> None:
+    """캐시된 client를 닫지 않고 버린다. fork 직후 자식 프로세스에서 호출한다.
+
+    부모와 공유하는 소켓을 자식이 닫거나 종료 프레임을 보내면 안 되므로 참조만 지운다.
+    """
+    global _lock, _stats_lock, _clients, _clients_pid, _stats, _last_flush
+    _lock = threading.Lock()
+    _stats_lock = threading.Lock()
+    _clients = {}
+    _clients_pid = None
+    _stats = {}
+    _last_flush = time.monotonic()
+
+
+def close_http_clients() -> None:
+    """프로세스 종료 시 연결 풀을 닫고 남은 지표를 Redis에 합산한다."""
+    global _clients_pid
+    with _lock:
+        clients = list(_clients.values()) if _clients_pid == os.getpid() else []
+        _clients.clear()
+        _clients_pid = None
+    for client in clients:
+        try:
+            client.close()
+        except Exception as exc:
+            logger.warning(f"HTTP client 종료 실패: {exc}")
+    flush_http_metrics()
+
+
+def build_async_http_client(
+    *, max_connections: int | None = None, transport: httpx.AsyncBaseTransport | None = None
+) -> httpx.AsyncClient:
+    """asyncio runtime용 AsyncClient. RunPod/JDPatent 요청을 host로 구분해 지표를 모은다.
+
+    동시 파이프라인 수백 건이 한 client를 쓰므로 유휴 연결은 max_connections 기준(최대 64개)으로 유지한다.
+    """
+    keepalive = min(max_connections, 64) if max_connections else None
+    return _with_http2_fallback(
+        httpx.AsyncClient,
+        transport=transport,
+        timeout=http_timeout(settings.RUNPOD_STATUS_TIMEOUT_SECONDS),
+        limits=_limits(max_connections, keepalive),
+        event_hooks={"request": [_on_request_async], "response": [_on_response_async]},
+    )
+
+
+# ---------------------------------------------------------------------------
+# 연결 재사용 지표
+# ---------------------------------------------------------------------------
+def _jdpatent_host() -> str:
+    return urlsplit(settings.JDPATENT_API_URL).netloc
+
+
+def _service_for(request: httpx.Request) -> str:
+    return JDPATENT if request.url.netloc.decode() == _jdpatent_host() else RUNPOD
+
+
+def _count(service: str, field: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats.setdefault(service, Counter())[field] += amount
+
+
+def _trace_event(service: str, event_name: str) -> None:
+    # httpcore trace: 풀에 쓸 연결이 없어 새로 맺을 때만 connect_tcp / start_tls 이벤트가 온다.
+    if event_name == "connection.connect_tcp.complete":
+        _count(service, "connections")
+    elif event_name == "connection.start_tls.complete":
+        _count(service, "tls_handshakes")
+
+
+def _on_request(service: str, request: httpx.Request) -> None:
+    request.extensions["trace"] = lambda event_name, _info: _trace_event(service, event_name)
+
+
+def _on_response(service: str, response: httpx.Response) -> None:
+    _record_response(service, response)
+    if _flush_due():
+        flush_http_metrics()
+
+
+async def _on_request_async(request: httpx.Request) -> None:
+    service = _service_for(request)
+
+    async def trace(event_name: str, _info: dict) -> None:
+        _trace_event(service, event_name)
+
+    request.extensions["trace"] = trace
+
+
+async def _on_response_async(response: httpx.Response) -> None:
+    _record_response(_service_for(response.request), response)
+    if _flush_due():
+        await asyncio.to_thread(flush_http_metrics)
+
+
+def _record_response(service: str, response: httpx.Response) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(service, Counter())
+        stats["requests"] += 1
+        if response.http_version == "HTTP/2":
+            stats["http2_requests"] += 1
+        if response.status_code >= 500:
+            stats["errors"] += 1
+
+
+def _flush_due() -> bool:
+    return time.monotonic() - _last_flush >= settings.HTTP_CLIENT_METRICS_FLUSH_SECONDS
+
+
+def flush_http_metrics() -> None:
+    """프로세스에서 모은 지표를 Redis hash에 합산하고 비운다."""
+    global _stats, _last_flush
+    with _stats_lock:
+        stats, _stats = _stats, {}
+        _last_flush = time.monotonic()
+    if not any(stats.values()):
+        return
+    try:
+        with get_redis().pipeline(transaction=False) as pipe:
+            for service, counter in stats.items():
+                for field, value in counter.items():
+                    if value:
+                        pipe.hincrby(f"{_METRICS_KEY_PREFIX}:{service}", field, value)
+            pipe.execute()
+    except Exception as exc:
+        logger.warning(f"HTTP client 지표 기록 실패: {exc}")
+
+
+def get_http_client_metrics() -> dict[str, Any]:
+    """서비스별 누적 연결 재사용 지표 (모든 worker 합산)."""
+    client = get_redis()
+    metrics: dict[str, Any] = {}
+    for service in SERVICES:
+        raw = client.hgetall(f"{_METRICS_KEY_PREFIX}:{service}")
+        values = {field: int(raw.get(field.encode(), 0)) for field in _METRIC_FIELDS}
+        requests = values["requests"]
+        metrics[service] = {
+            **values,
+            "reused_requests": max(requests - values["connections"], 0),
+            "reuse_ratio": round(1 - values["connections"] / requests, 4) if requests else None,
+        }
+    return metrics
@@ -1,12 +1,31 @@
 """JDPatent internal HTTP client service."""
 
+import asyncio
 import time
-from typing import Any
+from typing import Any, NoReturn
 
 import httpx
 from loguru import logger
 
 from app.config import settings
+from app.services.callback_service import (
+    claim_waiter,
+    get_callback,
+    register_waiter,
+    verify_token,
+    wait_for_callback_async,
+)
+from app.services.http_client_service import JDPATENT, get_http_client, http_timeout
+from app.services.polling_service import (
+    JDPATENT_POLL_POLICY,
+    DurationEstimate,
+    estimate_duration,
+    next_poll_delay,
+    record_duration,
+)
+
+# 완료 callback 저장/대기 키의 source 이름
+JDPATENT_CALLBACK_SOURCE = "jdpatent"
 
 
 def submit_jdpatent_job(
@@ -19,8 +38,14 @@ def submit_jdpatent_job(
     user_prefer_area: str | None = None,
     patent_type: str | None = None,
     patent_kind_code: str | None = None,
-) -> None:
-    url = f"{settings.JDPATENT_API_URL}/api/v1/jobs"
+) -> dict[str, Any]:
+    """JDPatent에 리포트 생성 작업을 등록하고 상태 조회에 필요한 작업 정보를 반환한다.
+
+    반환값은 JSON 직렬화 가능한 dict라 단계별 Celery task 사이에 그대로 전달할 수 있다.
+    (task_id, callback, submitted_at, expected_seconds, expected_spread, last_status, status_polls)
+    callback이 True면 완료 callback URL을 함께 등록했으므로 상태 조회는 fallback으로만 한다.
+    """
+    estimate = estimate_duration(JDPATENT_POLL_POLICY)
     payload = {
         "task_id": task_id,
         "raw_text": raw_text,
@@ -30,88 +55,228 @@ def submit_jdpatent_job(
         "user_prefer_area": user_prefer_area,
         "patent_type": patent_type,
         "patent_kind_code": patent_kind_code,
+        **_callback_fields(),
     }
     try:
-        with httpx.Client(timeout=settings.JDPATENT_SUBMIT_TIMEOUT_SECONDS) as client:
-            response = client.post(url, json=payload)
-            response.raise_for_status()
+        response = get_http_client(JDPATENT).post(_jobs_url(), json=payload)
+        response.raise_for_status()
     except Exception as exc:
-        logger.bind(
-            event="report_generation_enqueue_failed",
-            task_id=task_id,
-            error=str(exc),
-        ).error("리포트 생성 작업 큐 등록 실패")
+        _log_submit_failed(task_id, exc)
+        raise
+    _log_submitted(payload)
+    return _new_job(payload, estimate)
+
+
+async def submit_jdpatent_job_async(
+    client: httpx.AsyncClient,
+    *,
+    task_id: str,
+    raw_text: str,
+    user_id: str | None = None,
+    user_prefer: str = "nation",
+    user_prefer_nation: str | None = "South Korea",
+    user_prefer_area: str | None = None,
+    patent_type: str | None = None,
+    patent_kind_code: str | None = None,
+) -> dict[str, Any]:
+    """submit_jdpatent_job의 async 버전 (공유 AsyncClient 사용)."""
+    estimate = await asyncio.to_thread(estimate_duration, JDPATENT_POLL_POLICY)
+    payload = {
+        "task_id": task_id,
+        "raw_text": raw_text,
+        "user_id": user_id,
+        "user_prefer": user_prefer,
+        "user_prefer_nation": user_prefer_nation,
+        "user_prefer_area": user_prefer_area,
+        "patent_type": patent_type,
+        "patent_kind_code": patent_kind_code,
+        **_callback_fields(),
+    }
+    try:
+        response = await client.post(
+            _jobs_url(), json=payload, timeout=http_timeout(settings.JDPATENT_SUBMIT_TIMEOUT_SECONDS)
+        )
+        response.raise_for_status()
+    except Exception as exc:
+        _log_submit_failed(task_id, exc)
         raise
+    _log_submitted(payload)
+    return _new_job(payload, estimate)
+
+
+def jdpatent_callback_enabled() -> bool:
+    return settings.JDPATENT_CALLBACK_ENABLED and bool(settings.JDPATENT_CALLBACK_SECRET)
+
+
+def verify_jdpatent_callback_token(token: str | None) -> bool:
+    return jdpatent_callback_enabled() and verify_token(token, settings.JDPATENT_CALLBACK_SECRET)
+
+
+def _new_job(payload: dict[str, Any], estimate: DurationEstimate) -> dict[str, Any]:
+    return {
+        "task_id": payload["task_id"],
+        "callback": "callback_url" in payload,
+        "submitted_at": time.time(),
+        "expected_seconds": estimate.expected_seconds,
+        "expected_spread": estimate.spread,
+        "last_status": "PENDING",
+        "status_polls": 0,
+    }
+
+
+def _elapsed_seconds(job: dict[str, Any]) -> float:
+    return round(time.time() - float(job["submitted_at"]), 3)
+
+
+def jdpatent_poll_interval(job: dict[str, Any]) -> float:
+    """다음 상태 조회까지의 간격.
+
+    마지막으로 본 상태와 예상 처리 시간으로 polling_service가 정한다.
+    완료 callback을 등록한 작업은 fallback 간격으로만 조회한다.
+    """
+    if job["callback"]:
+        return max(float(settings.JDPATENT_CALLBACK_FALLBACK_POLL_SECONDS), JDPATENT_POLL_POLICY.min_interval)
+    return next_poll_delay(
+        JDPATENT_POLL_POLICY,
+        elapsed=_elapsed_seconds(job),
+        estimate=DurationEstimate(job["expected_seconds"], job["expected_spread"]),
+        queued=job["last_status"] == "PENDING",
+    )
+
+
+def _callback_fields() -> dict[str, str]:
+    """작업이 끝나면 JDPatent가 상태 조회 응답과 같은 본문을 POST할 callback URL."""
+    if not jdpatent_callback_enabled():
+        return {}
+    base_url = settings.PUBLIC_BASE_URL.rstrip("/")
+    return {"callback_url": f"{base_url}/internal/jdpatent/callback?token={settings.JDPATENT_CALLBACK_SECRET}"}
+
+
+def get_jdpatent_callback(task_id: str) -> dict[str, Any] | None:
+    return get_callback(JDPATENT_CALLBACK_SOURCE, task_id)
+
+
+def register_jdpatent_waiter(task_id: str, ctx: dict[str, Any]) -> None:
+    register_waiter(JDPATENT_CALLBACK_SOURCE, task_id, ctx)
+
+
+def claim_jdpatent_waiter(task_id: str) -> bool:
+    return claim_waiter(JDPATENT_CALLBACK_SOURCE, task_id)
+
 
+async def wait_for_jdpatent_callback_async(task_id: str, timeout: float) -> dict[str, Any] | None:
+    return await wait_for_callback_async(JDPATENT_CALLBACK_SOURCE, task_id, timeout)
+
+
+def _jobs_url() -> str:
+    return f"{settings.JDPATENT_API_URL}/api/v1/jobs"
+
+
+def _log_submit_failed(task_id: str, exc: Exception) -> None:
     logger.bind(
-        event="report_generation_enqueued",
+        event="report_generation_enqueue_failed",
         task_id=task_id,
-        user_id=user_id,
-        raw_text_length=len(raw_text),
-        patent_type=patent_type,
-        patent_kind_code=patent_kind_code,
+        error=str(exc),
+    ).error("리포트 생성 작업 큐 등록 실패")
+
+
+def _log_submitted(payload: dict[str, Any]) -> None:
+    logger.bind(
+        event="report_generation_enqueued",
+        task_id=payload["task_id"],
+        user_id=payload["user_id"],
+        raw_text_length=len(payload["raw_text"]),
+        patent_type=payload["patent_type"],
+        patent_kind_code=payload["patent_kind_code"],
     ).info("리포트 생성 작업 큐 등록 성공")
 
 
-def poll_jdpatent_result(task_id: str) -> dict[str, Any]:
-    url = f"{settings.JDPATENT_API_URL}/api/v1/jobs/{task_id}"
-    elapsed = 0.0
-
-    while elapsed <= settings.JDPATENT_POLL_TIMEOUT_SECONDS:
-        try:
-            with httpx.Client(timeout=settings.JDPATENT_SUBMIT_TIMEOUT_SECONDS) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                data = response.json()
-        except Exception as exc:
-            logger.bind(
-                event="report_generation_failed",
-                task_id=task_id,
-                failure_reason="jdpatent_poll_http_error",
-                error=str(exc),
-            ).error("리포트 생성 실패")
-            raise
-
-        status = data.get("status")
-        if status == "SUCCESS":
-            result = data.get("result", {})
-            if isinstance(result, dict):
-                if str(result.get("status", "")).lower() == "error":
-                    reason = result.get("reason") or "JDPatent processing failed"
-                    logger.bind(
-                        event="report_generation_failed",
-                        task_id=task_id,
-                        failure_reason="jdpatent_logical_error",
-                        error=str(reason),
-                    ).error("리포트 생성 실패")
-                    raise RuntimeError(str(reason))
-                if "error" in result:
-                    raw_error = result.get("error")
-                    logger.bind(
-                        event="report_generation_failed",
-                        task_id=task_id,
-                        failure_reason="jdpatent_result_error",
-                        error=str(raw_error),
-                    ).error("리포트 생성 실패")
-                    raise RuntimeError(str(raw_error))
-            logger.bind(
-                event="report_generation_succeeded",
-                task_id=task_id,
-            ).info("리포트 생성 성공")
-            return result
-        if status == "FAILURE":
-            raw_error = data.get("error") or "JDPatent task failed"
-            logger.bind(
-                event="report_generation_failed",
-                task_id=task_id,
-                failure_reason="jdpatent_task_failed",
-                error=str(raw_error),
-            ).error("리포트 생성 실패")
-            raise RuntimeError(str(raw_error))
-
-        time.sleep(settings.JDPATENT_POLL_INTERVAL_SECONDS)
-        elapsed += settings.JDPATENT_POLL_INTERVAL_SECONDS
+def fetch_jdpatent_job(job: dict[str, Any]) -> dict[str, Any]:
+    """JDPatent 작업 상태를 한 번 조회한다."""
+    task_id = job["task_id"]
+    job["status_polls"] += 1
+    try:
+        response = get_http_client(JDPATENT).get(f"{_jobs_url()}/{task_id}")
+        response.raise_for_status()
+        return response.json()
+    except Exception as exc:
+        _log_poll_failed(task_id, exc)
+        raise
+
+
+async def fetch_jdpatent_job_async(client: httpx.AsyncClient, job: dict[str, Any]) -> dict[str, Any]:
+    """fetch_jdpatent_job의 async 버전 (공유 AsyncClient 사용)."""
+    task_id = job["task_id"]
+    job["status_polls"] += 1
+    try:
+        response = await client.get(
+            f"{_jobs_url()}/{task_id}", timeout=http_timeout(settings.JDPATENT_SUBMIT_TIMEOUT_SECONDS)
+        )
+        response.raise_for_status()
+        return response.json()
+    except Exception as exc:
+        _log_poll_failed(task_id, exc)
+        raise
+
+
+def _log_poll_failed(task_id: str, exc: Exception) -> None:
+    logger.bind(
+        event="report_generation_failed",
+        task_id=task_id,
+        failure_reason="jdpatent_poll_http_error",
+        error=str(exc),
+    ).error("리포트 생성 실패")
+
+
+def resolve_jdpatent_job(job: dict[str, Any], data: dict[str, Any]) -> dict[str, Any] | None:
+    """상태 응답을 해석한다. 성공이면 결과 dict, 진행 중이면 None, 실패면 RuntimeError."""
+    task_id = job["task_id"]
+    status = data.get("status")
+    job["last_status"] = str(status or "PENDING").upper()
+    if status == "SUCCESS":
+        result = data.get("result", {})
+        if isinstance(result, dict):
+            if str(result.get("status", "")).lower() == "error":
+                reason = result.get("reason") or "JDPatent processing failed"
+                logger.bind(
+                    event="report_generation_failed",
+                    task_id=task_id,
+                    failure_reason="jdpatent_logical_error",
+                    error=str(reason),
+                ).error("리포트 생성 실패")
+                raise RuntimeError(str(reason))
+            if "error" in result:
+                raw_error = result.get("error")
+                logger.bind(
+                    event="report_generation_failed",
+                    task_id=task_id,
+                    failure_reason="jdpatent_result_error",
+                    error=str(raw_error),
+                ).error("리포트 생성 실패")
+                raise RuntimeError(str(raw_error))
+        elapsed = _elapsed_seconds(job)
+        record_duration(JDPATENT_POLL_POLICY, elapsed)
+        logger.bind(
+            event="report_generation_succeeded",
+            task_id=task_id,
+            elapsed_seconds=elapsed,
+            expected_seconds=job["expected_seconds"],
+            status_polls=job["status_polls"],
+        ).info("리포트 생성 성공")
+        return result
+    if status == "FAILURE":
+        raw_error = data.get("error") or "JDPatent task failed"
+        logger.bind(
+            event="report_generation_failed",
+            task_id=task_id,
+            failure_reason="jdpatent_task_failed",
+            error=str(raw_error),
+        ).error("리포트 생성 실패")
+        raise RuntimeError(str(raw_error))
+    return None
+
 
+def raise_jdpatent_timeout(task_id: str, elapsed: float) -> NoReturn:
     logger.bind(
         event="report_generation_failed",
         task_id=task_id,
@@ -0,0 +1,100 @@
+"""분석 작업 처리 lane 선택과 lane별 Celery 큐 이름.
+
+작은 문서(실용신안 공보 몇 페이지)가 200페이지짜리 미국 등록특허 뒤에서 기다리지 않도록
+업로드 메타데이터로 lane을 정하고, lane마다 큐와 worker pool을 따로 둔다.
+
+    small    → analysis-small   / pipeline-stages-small
+    standard → celery           / pipeline-stages        (기존 큐 그대로)
+    large    → analysis-large   / pipeline-stages-large
+
+lane은 process_patent kwargs(processing_lane)와 파이프라인 context에 실려 가고,
+celery_app의 router가 진입 task와 후속 단계 task를 해당 lane 큐로 보낸다.
+"""
+
+from typing import Any
+
+from app.config import settings
+
+LANES = ("small", "standard", "large")
+DEFAULT_LANE = "standard"
+PRIORITIES = ("high", "normal", "low")
+
+_ENTRY_QUEUES = {
+    "small": "analysis-small",
+    "standard": "celery",
+    "large": "analysis-large",
+}
+_STAGE_QUEUES = {
+    "small": "pipeline-stages-small",
+    "standard": "pipeline-stages",
+    "large": "pipeline-stages-large",
+}
+
+
+def normalize_lane(lane: str | None) -> str:
+    return lane if lane in LANES else DEFAULT_LANE
+
+
+def choose_analysis_lane(
+    preflight_lane: str | None,
+    *,
+    page_count: int | None,
+    file_size: int,
+    country: str | None,
+    priority: str | None = None,
+) -> str:
+    """사전 검사 lane(페이지 수/파일 크기)에 국가와 호출자 우선순위를 반영해 처리 lane을 정한다.
+
+    - priority=low: 급하지 않은 일괄 처리로 보고 large lane으로 보낸다.
+    - priority=high: large가 아니면 small lane으로 올린다 (큰 문서가 fast lane을 막지 않도록).
+    - 페이지 수를 모르는 작은 KR 공보는 small lane으로 본다.
+      US 등록특허는 크기가 작아도 페이지가 많은 경우가 있어 standard에 남긴다.
+    """
+    lane = normalize_lane(preflight_lane)
+    if not settings.LANE_ROUTING_ENABLED:
+        return lane
+    if priority == "low":
+        return "large"
+    if lane == "large":
+        return lane
+    if priority == "high":
+        return "small"
+    if (
+        page_count is None
+        and country == "KR"
+        and file_size <= settings.LANE_SMALL_MAX_BYTES_WITHOUT_PAGES
+    ):
+        return "small"
+    return lane
+
+
+def entry_queue(lane: str | None) -> str:
+    """process_patent(진입 task)를 보낼 큐."""
+    if not settings.LANE_ROUTING_ENABLED:
+        return _ENTRY_QUEUES[DEFAULT_LANE]
+    return _ENTRY_QUEUES[normalize_lane(lane)]
+
+
+def stage_queue(lane: str | None) -> str:
+    """후속 단계 task(상태 확인/타입 감지/JDPatent 등록)를 보낼 큐."""
+    if not settings.LANE_ROUTING_ENABLED:
+        return _STAGE_QUEUES[DEFAULT_LANE]
+    return _STAGE_QUEUES[normalize_lane(lane)]
+
+
+def lane_queues() -> dict[str, dict[str, str]]:
+    """lane별 (진입 큐, 단계 큐) 이름. /log/queue와 수락 제어가 큐 길이를 셀 때 쓴다."""
+    return {lane: {"queue": _ENTRY_QUEUES[lane], "stage_queue": _STAGE_QUEUES[lane]} for lane in LANES}
+
+
+def entry_queue_names() -> list[str]:
+    return list(dict.fromkeys(_ENTRY_QUEUES[lane] for lane in LANES))
+
+
+def lane_from_task_call(args: Any, kwargs: Any) -> str | None:
+    """Celery router 인자에서 lane을 꺼낸다 (진입 task는 kwargs, 단계 task는 args[0] context)."""
+    if isinstance(kwargs, dict) and kwargs.get("processing_lane"):
+        return kwargs["processing_lane"]
+    if args and isinstance(args[0], dict):
+        return args[0].get("processing_lane")
+    return None
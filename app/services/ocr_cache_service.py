@@ -0,0 +1,175 @@
+"""PDF 내용 해시 기반 OCR 텍스트 캐시 서비스.
+
+키는 (PDF SHA-256, patent_origin, OCR 모델 버전) 조합이며, 텍스트는 gzip으로 압축해
+로컬 디스크에 저장한다. 전체 크기가 OCR_CACHE_MAX_BYTES를 넘으면 가장 오래 사용되지 않은
+항목(mtime 기준)부터 삭제한다.
+
+단계별 Celery task 사이에서는 OCR 텍스트를 메시지 인자로 넘기지 않는다. OCR이 끝난 단계가 텍스트를
+Redis(jd-ocr-text:{task_id})에 한 번 압축 저장하고, 후속 단계는 context의 키로 읽는다.
+디스크 캐시는 끌 수 있고 PDF 해시가 없는 요청(직접 S3 업로드)은 캐시하지 않으며, 다른 호스트의
+worker가 다음 단계를 실행할 수도 있으므로 전달용 저장소는 Redis를 쓴다.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from app.config import settings
+from app.services.redis_service import get_redis
+
+_PIPELINE_TEXT_KEY_PREFIX = "jd-ocr-text"
+# 파이프라인 마감(PIPELINE_SOFT_TIME_LIMIT_SECONDS, 기본 1500초)보다 충분히 길게 보관한다. 정상 경로에서는 JDPatent 등록 뒤 바로 지운다.
+_PIPELINE_TEXT_TTL_SECONDS = 3600
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_dir() -> Path:
+    path = Path(settings.OCR_CACHE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _cache_key(pdf_sha256: str, patent_origin: str | None) -> str:
+    raw = f"{pdf_sha256}:{(patent_origin or '').upper()}:{settings.OCR_MODEL_VERSION}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_path(pdf_sha256: str, patent_origin: str | None) -> Path:
+    return _cache_dir() / f"{_cache_key(pdf_sha256, patent_origin)}.txt.gz"
+
+
+def _record(hit: bool) -> tuple[int, int]:
+    with _stats_lock:
+        _stats["hits" if hit else "misses"] += 1
+        return _stats["hits"], _stats["misses"]
+
+
+def _log_lookup(hit: bool, pdf_sha256: str, patent_origin: str | None, **extra) -> None:
+    hits, misses = _record(hit)
+    logger.bind(
+        event="ocr_cache_hit" if hit else "ocr_cache_miss",
+        pdf_sha256=pdf_sha256,
+        patent_origin=patent_origin,
+        ocr_model_version=settings.OCR_MODEL_VERSION,
+        ocr_cache_hits=hits,
+        ocr_cache_misses=misses,
+        ocr_cache_hit_rate=round(hits / (hits + misses), 4),
+        **extra,
+    ).info("OCR 캐시 적중" if hit else "OCR 캐시 미스")
+
+
+def get_cached_ocr_text(pdf_sha256: str | None, patent_origin: str | None) -> str | None:
+    """캐시된 OCR 텍스트를 반환한다. 없으면 None."""
+    if not settings.OCR_CACHE_ENABLED or not pdf_sha256:
+        return None
+
+    path = _cache_path(pdf_sha256, patent_origin)
+    try:
+        text = gzip.decompress(path.read_bytes()).decode("utf-8")
+    except FileNotFoundError:
+        _log_lookup(False, pdf_sha256, patent_origin)
+        return None
+    except Exception as exc:
+        logger.warning(f"OCR 캐시 항목 손상, 삭제 - path={path}, error={exc}")
+        path.unlink(missing_ok=True)
+        _log_lookup(False, pdf_sha256, patent_origin)
+        return None
+
+    # LRU 순서 갱신
+    now = time.time()
+    try:
+        os.utime(path, (now, now))
+    except OSError:
+        pass
+    _log_lookup(True, pdf_sha256, patent_origin, ocr_text_length=len(text))
+    return text
+
+
+def put_cached_ocr_text(pdf_sha256: str | None, patent_origin: str | None, text: str) -> None:
+    """OCR 텍스트를 압축 저장하고 용량 초과 시 오래된 항목을 정리한다."""
+    if not settings.OCR_CACHE_ENABLED or not pdf_sha256 or not text:
+        return
+
+    path = _cache_path(pdf_sha256, patent_origin)
+    # 동시에 같은 키를 쓰는 worker가 있어도 반쯤 쓰인 파일을 읽지 않도록 rename으로 교체
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(gzip.compress(text.encode("utf-8"), compresslevel=6))
+        os.replace(tmp_path, path)
+    except Exception as exc:
+        tmp_path.unlink(missing_ok=True)
+        logger.warning(f"OCR 캐시 저장 실패 - path={path}, error={exc}")
+        return
+
+    logger.bind(
+        event="ocr_cache_stored",
+        pdf_sha256=pdf_sha256,
+        patent_origin=patent_origin,
+        ocr_model_version=settings.OCR_MODEL_VERSION,
+        ocr_text_length=len(text),
+        compressed_bytes=path.stat().st_size,
+    ).debug("OCR 캐시 저장")
+    _evict_if_needed()
+
+
+def _evict_if_needed() -> int:
+    max_bytes = max(int(settings.OCR_CACHE_MAX_BYTES), 0)
+    entries: list[tuple[float, int, Path]] = []
+    total = 0
+    for path in _cache_dir().glob("*.txt.gz"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+
+    logger.bind(
+        event="ocr_cache_evicted",
+        removed=removed,
+        cache_bytes=total,
+        max_bytes=max_bytes,
+    ).info("OCR 캐시 용량 정리")
+    return removed
+
+
+def store_pipeline_ocr_text(task_id: str, text: str) -> str:
+    """단계 task 사이에 넘길 OCR 텍스트를 Redis에 압축 저장하고 키를 반환한다."""
+    key = f"{_PIPELINE_TEXT_KEY_PREFIX}:{task_id}"
+    get_redis().set(key, gzip.compress(text.encode("utf-8"), compresslevel=1), ex=_PIPELINE_TEXT_TTL_SECONDS)
+    return key
+
+
+def load_pipeline_ocr_text(key: str) -> str:
+    """store_pipeline_ocr_text로 저장한 텍스트. 만료됐거나 없으면 RuntimeError."""
+    raw = get_redis().get(key)
+    if raw is None:
+        raise RuntimeError(f"단계 간 OCR 텍스트가 없습니다: {key}")
+    return gzip.decompress(raw).decode("utf-8")
+
+
+def delete_pipeline_ocr_text(key: str | None) -> None:
+    if not key:
+        return
+    try:
+        get_redis().delete(key)
+    except Exception as exc:
+        logger.warning(f"단계 간 OCR 텍스트 삭제 실패 - key={key}, error={exc}")
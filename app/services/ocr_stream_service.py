@@ -0,0 +1,98 @@
+"""RunPod 스트리밍 OCR 출력(페이지 단위) 조립.
+
+페이지마다 결과를 yield하는 RunPod handler는 /stream/{job_id}로 그때까지 나온 출력을 돌려준다.
+각 출력은 다음 형식을 따른다.
+
+    {"page": 1, "total_pages": 12, "mmd_text": "..."}   # page는 1부터
+
+페이지 텍스트를 모아 두었다가 앞면(1페이지)이 오면 특허 타입 감지를, 모든 페이지가 모이면
+JDPatent 등록을 바로 시작할 수 있게 한다. 조립 결과는 완료 응답의 output.mmd_text와 같이
+페이지를 빈 줄로 이어 붙인 텍스트다.
+
+- asyncio runtime: 프로세스 메모리의 OcrPageBuffer에 모은다.
+- 단계별 Celery task: 조회마다 다른 worker가 실행할 수 있으므로 Redis hash(jd-ocr-stream:{job_id})에 모은다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.redis_service import get_redis
+
+_KEY_PREFIX = "jd-ocr-stream"
+# RunPod 최대 대기(600초)보다 충분히 길게 보관한다.
+_KEY_TTL_SECONDS = 3600
+PAGE_SEPARATOR = "\n\n"
+
+
+@dataclass(frozen=True)
+class OcrPage:
+    page: int
+    text: str
+    total_pages: int | None = None
+
+
+def parse_stream_output(outputs: Any) -> list[OcrPage]:
+    """/stream 응답의 stream 항목(또는 generator handler의 집계 output 목록)에서 페이지를 꺼낸다."""
+    pages = []
+    for item in outputs or []:
+        output = item.get("output", item) if isinstance(item, dict) else None
+        if not isinstance(output, dict):
+            continue
+        page, text = output.get("page"), output.get("mmd_text")
+        if not isinstance(page, int) or page < 1 or not isinstance(text, str):
+            continue
+        total = output.get("total_pages")
+        pages.append(OcrPage(page=page, text=text, total_pages=total if isinstance(total, int) else None))
+    return pages
+
+
+@dataclass
+class OcrPageBuffer:
+    total_pages: int | None = None
+    pages: dict[int, str] = field(default_factory=dict)
+
+    def add(self, pages: list[OcrPage]) -> int:
+        """페이지를 추가하고 새로 받은 페이지 수를 반환한다."""
+        added = 0
+        for page in pages:
+            if page.total_pages:
+                self.total_pages = page.total_pages
+            if page.page not in self.pages:
+                added += 1
+            self.pages[page.page] = page.text
+        return added
+
+    @property
+    def pages_done(self) -> int:
+        return len(self.pages)
+
+    def complete(self) -> bool:
+        return bool(self.total_pages) and all(page in self.pages for page in range(1, self.total_pages + 1))
+
+    def text(self) -> str:
+        return PAGE_SEPARATOR.join(self.pages[page] for page in sorted(self.pages))
+
+
+def _pages_key(job_id: str) -> str:
+    return f"{_KEY_PREFIX}:{job_id}"
+
+
+def save_stream_pages(job_id: str, pages: list[OcrPage]) -> int:
+    """페이지를 Redis에 저장하고 새로 저장된 페이지 수를 반환한다."""
+    if not pages:
+        return 0
+    with get_redis().pipeline(transaction=False) as pipe:
+        pipe.hset(_pages_key(job_id), mapping={str(page.page): page.text for page in pages})
+        pipe.expire(_pages_key(job_id), _KEY_TTL_SECONDS)
+        added, _ = pipe.execute()
+    return int(added or 0)
+
+
+def load_stream_buffer(job_id: str, total_pages: int | None) -> OcrPageBuffer:
+    raw = get_redis().hgetall(_pages_key(job_id))
+    pages = {int(page): text.decode("utf-8") for page, text in raw.items()}
+    return OcrPageBuffer(total_pages=total_pages, pages=pages)
+
+
+def delete_stream_pages(job_id: str) -> None:
+    get_redis().delete(_pages_key(job_id))
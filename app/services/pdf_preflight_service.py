@@ -0,0 +1,278 @@
+"""PDF 사전 검사(preflight) 서비스.
+
+업로드 스트림을 그대로 훑으면서(렌더링 없이) PDF 구조 정보를 수집한다.
+
+- 헤더 버전, 선형화(Linearized) 여부와 /N 페이지 수
+- 페이지 트리(/Type /Pages)의 /Count, 압축 object stream(/ObjStm) 내부 포함
+- trailer / xref stream의 /Encrypt 여부, startxref 위치와 실제 xref 위치 일치 여부
+- 폰트 리소스 존재 여부(텍스트 레이어 추정), 이미지 XObject 수
+
+청크 경계에 걸친 토큰을 놓치지 않도록 직전 청크 끝부분을 겹쳐서 검사한다.
+"""
+
+import re
+import zlib
+from dataclasses import asdict, dataclass, field
+
+from app.config import settings
+
+# 청크 경계에 걸친 dict/토큰을 잡기 위해 겹쳐 보는 길이
+_CARRY_SIZE = 4096
+_TAIL_SIZE = 4096
+# dict 경계/객체 헤더를 찾을 때 키워드 앞뒤로 살펴보는 최대 길이
+_DICT_SCAN_LIMIT = 2048
+# /Kids 배열이 긴 평면 페이지 트리도 잡을 수 있도록 dict 끝은 더 멀리까지 찾는다.
+_DICT_END_LIMIT = 256 * 1024
+# object stream 하나를 해제해 검사할 최대 압축 크기 / 문서당 해제 총량
+_MAX_OBJSTM_BYTES = 2 * 1024 * 1024
+_MAX_INFLATED_TOTAL = 16 * 1024 * 1024
+
+_HEADER_RE = re.compile(rb"%PDF-(\d\.\d)")
+_LINEARIZED_RE = re.compile(rb"/Linearized\s+[\d.]+[^>]*?/N\s+(\d+)", re.S)
+_PAGES_TYPE_RE = re.compile(rb"/Type\s*/Pages\b")
+_COUNT_RE = re.compile(rb"/Count\s+(\d+)")
+_PAGE_RE = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+_ENCRYPT_RE = re.compile(rb"/Encrypt\s*(?:\d+\s+\d+\s+R|<<)")
+_FONT_RE = re.compile(rb"/Font\s*(?:<<|\d+\s+\d+\s+R)|/Type\s*/Font\b")
+_IMAGE_RE = re.compile(rb"/Subtype\s*/Image\b")
+_OBJSTM_RE = re.compile(rb"/Type\s*/ObjStm\b[^>]*>>\s*stream\r?\n", re.S)
+_XREF_TYPE_RE = re.compile(rb"/Type\s*/XRef\b")
+_DICT_DELIMITER_RE = re.compile(rb"<<|>>")
+_OBJ_HEADER_RE = re.compile(rb"(?<!\d)(\d+)\s+\d+\s+obj\b")
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_ENDSTREAM = b"endstream"
+
+
+@dataclass
+class PdfPreflightReport:
+    file_size: int = 0
+    pdf_version: str | None = None
+    page_count: int | None = None
+    page_count_source: str | None = None  # linearized | page_tree | page_objects
+    encrypted: bool = False
+    has_text_layer: bool = False
+    image_count: int = 0
+    linearized: bool = False
+    xref_type: str | None = None  # table | stream
+    startxref: int | None = None
+    startxref_valid: bool | None = None
+    has_eof: bool = False
+    lane: str = "standard"
+    warnings: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class PdfPreflightScanner:
+    """업로드 청크를 순서대로 받아 PDF 구조를 수집하는 스캐너."""
+
+    def __init__(self) -> None:
+        self._offset = 0
+        self._carry = b""
+        self._tail = b""
+        self._version: str | None = None
+        self._linearized_pages: int | None = None
+        self._page_tree_count = 0
+        self._page_objects = 0
+        self._encrypted = False
+        self._font_refs = 0
+        self._image_count = 0
+        self._xref_table_offsets: set[int] = set()
+        self._xref_stream_offsets: set[int] = set()
+        self._objstm_buffer: bytearray | None = None
+        self._objstm_seen = 0
+        self._inflated_total = 0
+        self._warnings: list[str] = []
+
+    @property
+    def page_count_hint(self) -> int | None:
+        """지금까지 확인된 페이지 수 (선형화 /N 또는 페이지 트리 /Count)."""
+        return self._linearized_pages or self._page_tree_count or None
+
+    def feed(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        window = self._carry + chunk
+        window_start = self._offset - len(self._carry)
+
+        if self._offset == 0:
+            header = _HEADER_RE.search(chunk[:1024])
+            if header:
+                self._version = header.group(1).decode("ascii")
+            linearized = _LINEARIZED_RE.search(chunk[:4096])
+            if linearized:
+                self._linearized_pages = int(linearized.group(1))
+
+        # carry 구간은 이전 청크에서 이미 셌으므로, 새 청크에 끝나는 매치만 센다.
+        fresh_from = len(self._carry)
+        self._scan_objects(window, fresh_from)
+        self._scan_xref_offsets(window, window_start, fresh_from)
+        self._scan_object_streams(window, fresh_from)
+
+        self._offset += len(chunk)
+        self._carry = window[-_CARRY_SIZE:]
+        self._tail = (self._tail + chunk)[-_TAIL_SIZE:]
+
+    def finish(self) -> PdfPreflightReport:
+        report = PdfPreflightReport(
+            file_size=self._offset,
+            pdf_version=self._version,
+            encrypted=self._encrypted,
+            has_text_layer=self._font_refs > 0,
+            image_count=self._image_count,
+            linearized=self._linearized_pages is not None,
+            warnings=list(self._warnings),
+        )
+
+        if self._linearized_pages:
+            report.page_count, report.page_count_source = self._linearized_pages, "linearized"
+        elif self._page_tree_count:
+            report.page_count, report.page_count_source = self._page_tree_count, "page_tree"
+        elif self._page_objects:
+            report.page_count, report.page_count_source = self._page_objects, "page_objects"
+        elif self._objstm_seen:
+            report.warnings.append("page_count_unknown_compressed_objects")
+
+        report.has_eof = b"%%EOF" in self._tail
+        startxref_matches = list(_STARTXREF_RE.finditer(self._tail))
+        if startxref_matches:
+            report.startxref = int(startxref_matches[-1].group(1))
+            if report.startxref in self._xref_table_offsets:
+                report.xref_type, report.startxref_valid = "table", True
+            elif report.startxref in self._xref_stream_offsets:
+                report.xref_type, report.startxref_valid = "stream", True
+            else:
+                report.startxref_valid = False
+                report.warnings.append("startxref_offset_mismatch")
+
+        report.lane = choose_processing_lane(report.page_count, report.file_size)
+        return report
+
+    def _scan_objects(self, window: bytes, fresh_from: int) -> None:
+        # 바이너리 본문 전체에 복잡한 정규식을 돌리면 느리므로, 리터럴 키워드를 먼저 찾고
+        # 그 주변의 dict만 잘라서 검사한다.
+        for match in _PAGES_TYPE_RE.finditer(window):
+            dict_start = window.rfind(b"<<", max(match.start() - _DICT_SCAN_LIMIT, 0), match.start())
+            dict_end = _find_dict_end(window, dict_start) if dict_start >= 0 else -1
+            if dict_end <= fresh_from:
+                continue
+            count = _COUNT_RE.search(window, dict_start, dict_end)
+            if count:
+                # 루트 페이지 트리의 /Count가 가장 크다.
+                self._page_tree_count = max(self._page_tree_count, int(count.group(1)))
+        self._page_objects += _count_fresh(_PAGE_RE, window, fresh_from)
+        self._font_refs += _count_fresh(_FONT_RE, window, fresh_from)
+        self._image_count += _count_fresh(_IMAGE_RE, window, fresh_from)
+        if not self._encrypted and _ENCRYPT_RE.search(window):
+            self._encrypted = True
+
+    def _scan_xref_offsets(self, window: bytes, window_start: int, fresh_from: int) -> None:
+        # xref 테이블: 줄 시작의 "xref" 키워드 ("startxref"는 제외)
+        position = window.find(b"xref", max(fresh_from - 4, 0))
+        while position >= 0:
+            at_line_start = position == 0 or window[position - 1] in b"\r\n"
+            if at_line_start and window[position + 4:position + 5].isspace():
+                self._xref_table_offsets.add(window_start + position)
+            position = window.find(b"xref", position + 4)
+
+        # xref stream: /Type /XRef dict를 가진 객체의 "N G obj" 위치
+        for match in _XREF_TYPE_RE.finditer(window):
+            if match.end() <= fresh_from:
+                continue
+            search_from = max(match.start() - _DICT_SCAN_LIMIT, 0)
+            header = None
+            for header in _OBJ_HEADER_RE.finditer(window, search_from, match.start()):
+                pass
+            if header is not None and b"stream" not in window[header.end():match.start()]:
+                self._xref_stream_offsets.add(window_start + header.start(1))
+
+    def _scan_object_streams(self, window: bytes, fresh_from: int) -> None:
+        """압축된 object stream 안의 페이지 트리/폰트 정보를 풀어서 검사한다."""
+        position = fresh_from
+        while True:
+            if self._objstm_buffer is not None:
+                # endstream 키워드가 청크 경계에 걸쳤을 수 있어 조금 앞에서부터 찾는다.
+                end = window.find(_ENDSTREAM, max(position - len(_ENDSTREAM) + 1, 0))
+                if end < 0:
+                    self._objstm_buffer += window[position:]
+                    if len(self._objstm_buffer) > _MAX_OBJSTM_BYTES:
+                        self._objstm_buffer = None
+                    return
+                if end < position:
+                    del self._objstm_buffer[len(self._objstm_buffer) - (position - end):]
+                else:
+                    self._objstm_buffer += window[position:end]
+                self._inflate_object_stream(bytes(self._objstm_buffer))
+                self._objstm_buffer = None
+                position = end + len(_ENDSTREAM)
+                continue
+
+            # stream 시작 dict가 carry 구간에서 시작했을 수 있으므로 carry부터 찾되,
+            # 이전 청크에서 이미 처리한 매치(끝이 position 이전)는 건너뛴다.
+            match = _OBJSTM_RE.search(window, max(position - _CARRY_SIZE, 0))
+            while match is not None and match.end() <= position:
+                match = _OBJSTM_RE.search(window, match.end())
+            if match is None:
+                return
+            self._objstm_seen += 1
+            self._objstm_buffer = bytearray()
+            position = match.end()
+
+    def _inflate_object_stream(self, data: bytes) -> None:
+        if self._inflated_total >= _MAX_INFLATED_TOTAL:
+            return
+        try:
+            inflater = zlib.decompressobj()
+            inflated = inflater.decompress(data, _MAX_INFLATED_TOTAL - self._inflated_total)
+        except zlib.error:
+            return
+        self._inflated_total += len(inflated)
+        self._scan_objects(inflated, 0)
+
+
+def _find_dict_end(data: bytes, start: int) -> int:
+    """data[start]의 "<<"와 짝이 맞는 ">>" 다음 위치. 범위 안에서 못 찾으면 -1."""
+    depth = 0
+    for token in _DICT_DELIMITER_RE.finditer(data, start, start + _DICT_END_LIMIT):
+        depth += 1 if token.group(0) == b"<<" else -1
+        if depth == 0:
+            return token.end()
+    return -1
+
+
+def _count_fresh(pattern: re.Pattern, window: bytes, fresh_from: int) -> int:
+    return sum(1 for match in pattern.finditer(window) if match.end() > fresh_from)
+
+
+def inspect_pdf_parts(head: bytes, tail: bytes, file_size: int) -> PdfPreflightReport:
+    """앞/뒤 일부 바이트만으로 검사한다 (S3 직접 업로드처럼 본문을 읽지 않는 경로용).
+
+    xref 위치 검증은 할 수 없으므로 startxref_valid는 None으로 남는다.
+    """
+    scanner = PdfPreflightScanner()
+    scanner.feed(head)
+    if file_size > len(head):
+        scanner._scan_objects(tail, 0)
+        scanner._tail = tail[-_TAIL_SIZE:]
+        scanner._offset = file_size
+    # 일부 구간에서 센 /Type /Page 개수는 전체 페이지 수가 아니다.
+    scanner._page_objects = 0
+    report = scanner.finish()
+    if report.startxref_valid is False:
+        report.startxref_valid = None
+        report.warnings.remove("startxref_offset_mismatch")
+    return report
+
+
+def choose_processing_lane(page_count: int | None, file_size: int) -> str:
+    """페이지 수/파일 크기로 처리 lane(small/standard/large)을 정한다."""
+    if page_count is not None:
+        if page_count <= settings.PREFLIGHT_SMALL_MAX_PAGES:
+            return "small"
+        if page_count >= settings.PREFLIGHT_LARGE_MIN_PAGES:
+            return "large"
+        return "standard"
+    if file_size >= settings.PREFLIGHT_LARGE_MIN_BYTES:
+        return "large"
+    return "standard"
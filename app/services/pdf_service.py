@@ -1,19 +1,31 @@
 """RunPod Serverless를 통한 PDF OCR 파싱 서비스."""
 
+import asyncio
 import json
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, NoReturn
 
 import httpx
 from loguru import logger
 
 from app.config import settings
+from app.services.http_client_service import RUNPOD, get_http_client, http_timeout
+from app.services.ocr_stream_service import OcrPage, OcrPageBuffer, parse_stream_output
+from app.services.polling_service import (
+    RUNPOD_POLL_POLICY,
+    DurationEstimate,
+    estimate_duration,
+    next_poll_delay,
+    record_duration,
+)
+from app.services.runpod_webhook_service import webhook_url
 
 # RunPod serverless는 비동기 실행 후 polling 하는 패턴
 _RUNPOD_RUN_URL = settings.RUNPOD_RUN_URL or f"{settings.RUNPOD_API_URL.rstrip('/')}/run"
 _RUNPOD_STATUS_URL = settings.RUNPOD_STATUS_URL or f"{settings.RUNPOD_API_URL.rstrip('/')}/status"
+_RUNPOD_STREAM_URL = settings.RUNPOD_STREAM_URL or f"{settings.RUNPOD_API_URL.rstrip('/')}/stream"
 _HEADERS = {
     "Authorization": f"Bearer {settings.RUNPOD_API_KEY}",
     "Content-Type": "application/json",
@@ -21,7 +33,6 @@ _HEADERS = {
 
 # 최대 대기 시간 (초)
 _MAX_WAIT_SECONDS = 600
-_POLL_INTERVAL = 2
 
 
 def _dump_ocr_json(dump_file_path: str | None, payload: dict[str, Any]) -> None:
@@ -34,7 +45,17 @@ def _dump_ocr_json(dump_file_path: str | None, payload: dict[str, Any]) -> None:
 
 
 def _extract_text_from_output(output: Any) -> str:
-    """DeepSeek-OCR2 응답 규격(output.mmd_text)에서만 텍스트 추출."""
+    """DeepSeek-OCR2 응답 규격(output.mmd_text)에서만 텍스트 추출.
+
+    페이지별로 yield하는 스트리밍 handler는 페이지 출력 목록을 output으로 돌려주므로 이어 붙인다.
+    """
+    if isinstance(output, list):
+        buffer = OcrPageBuffer()
+        buffer.add(parse_stream_output(output))
+        if buffer.pages_done:
+            return buffer.text()
+        raise RuntimeError("RunPod streamed output has no page mmd_text")
+
     if not isinstance(output, dict):
         raise RuntimeError(f"Unexpected RunPod output type: {type(output).__name__}")
 
@@ -48,27 +69,82 @@ def _extract_text_from_output(output: Any) -> str:
     )
 
 
-def parse_pdf_via_runpod(
-    pdf_bytes_b64: str | None = None,  # TODO: S3 전환 시 제거
+def submit_runpod_ocr_job(
+    pdf_bytes_b64: str | None = None,
     *,
     pdf_url: str | None = None,
     filename: str | None = None,
-    dump_file_path: str | None = None,
     patent_origin: str | None = None,
-) -> str:
-    """RunPod serverless에 PDF를 전송하고 OCR 텍스트를 반환.
+    page_count: int | None = None,
+) -> dict[str, Any]:
+    """RunPod에 OCR 작업을 등록하고 상태 조회에 필요한 작업 정보를 반환한다.
 
-    Args:
-        pdf_bytes_b64: base64 인코딩 PDF 문자열 (pdf_url와 둘 중 하나)
-        pdf_url: 접근 가능한 PDF URL (pdf_bytes_b64와 둘 중 하나)
-        filename: 선택 파일명 힌트
+    반환값은 JSON 직렬화 가능한 dict라 단계별 Celery task 사이에 그대로 전달할 수 있다.
+    (job_id, payload_input, run_data, input_source, submitted_at, webhook,
+    page_count, expected_seconds, expected_spread, last_status, status_polls,
+    stream, pages_done, pages_total)
+    RUNPOD_WEBHOOK_ENABLED이면 완료 webhook URL을 함께 등록한다.
+    RUNPOD_STREAM_ENABLED이면 stream=True로, 상태 조회 대신 /stream에서 페이지를 모은다.
+    """
+    estimate = estimate_duration(RUNPOD_POLL_POLICY, page_count)
+    payload_input = _build_runpod_input(
+        pdf_bytes_b64, pdf_url=pdf_url, filename=filename, patent_origin=patent_origin
+    )
+    run_body = _build_run_body(payload_input)
+    submitted_at = time.time()
+    try:
+        run_response = get_http_client(RUNPOD).post(
+            _RUNPOD_RUN_URL,
+            headers=_HEADERS,
+            json=run_body,
+            timeout=http_timeout(settings.RUNPOD_SUBMIT_TIMEOUT_SECONDS),
+        )
+        run_response.raise_for_status()
+    except (httpx.TimeoutException, httpx.HTTPStatusError) as exc:
+        _raise_runpod_enqueue_error(exc, payload_input)
+    return _runpod_job_from_response(
+        run_response.json(), run_body, submitted_at, page_count=page_count, estimate=estimate
+    )
 
-    Returns:
-        파싱된 텍스트
 
-    Raises:
-        RuntimeError: RunPod 요청 실패 또는 타임아웃
-    """
+async def submit_runpod_ocr_job_async(
+    client: httpx.AsyncClient,
+    pdf_bytes_b64: str | None = None,
+    *,
+    pdf_url: str | None = None,
+    filename: str | None = None,
+    patent_origin: str | None = None,
+    page_count: int | None = None,
+) -> dict[str, Any]:
+    """submit_runpod_ocr_job의 async 버전 (공유 AsyncClient 사용)."""
+    estimate = await asyncio.to_thread(estimate_duration, RUNPOD_POLL_POLICY, page_count)
+    payload_input = _build_runpod_input(
+        pdf_bytes_b64, pdf_url=pdf_url, filename=filename, patent_origin=patent_origin
+    )
+    run_body = _build_run_body(payload_input)
+    submitted_at = time.time()
+    try:
+        run_response = await client.post(
+            _RUNPOD_RUN_URL,
+            headers=_HEADERS,
+            json=run_body,
+            timeout=http_timeout(settings.RUNPOD_SUBMIT_TIMEOUT_SECONDS),
+        )
+        run_response.raise_for_status()
+    except (httpx.TimeoutException, httpx.HTTPStatusError) as exc:
+        _raise_runpod_enqueue_error(exc, payload_input)
+    return _runpod_job_from_response(
+        run_response.json(), run_body, submitted_at, page_count=page_count, estimate=estimate
+    )
+
+
+def _build_runpod_input(
+    pdf_bytes_b64: str | None,
+    *,
+    pdf_url: str | None,
+    filename: str | None,
+    patent_origin: str | None,
+) -> dict[str, Any]:
     if not pdf_bytes_b64 and not pdf_url:
         raise ValueError("Either pdf_bytes_b64 or pdf_url is required")
 
@@ -81,79 +157,71 @@ def parse_pdf_via_runpod(
         payload_input["pdf_url"] = pdf_url
     if patent_origin:
         payload_input["patent_origin"] = patent_origin
+    return payload_input
+
 
-    input_source = "pdf_url" if pdf_url else "pdf_base64"
-    started_at = time.monotonic()
-
-    with httpx.Client(timeout=30.0) as client:
-        try:
-            run_response = client.post(
-                _RUNPOD_RUN_URL,
-                headers=_HEADERS,
-                json={"input": payload_input},
-            )
-            run_response.raise_for_status()
-        except httpx.TimeoutException as exc:
-            logger.bind(
-                event="runpod_job_enqueue_failed",
-                runpod_error_code="runpod_timeout",
-                input_source=input_source,
-                filename=filename,
-                patent_origin=patent_origin,
-            ).error("RunPod 작업 큐 등록 실패")
-            raise RuntimeError("runpod_timeout") from exc
-        except httpx.HTTPStatusError as exc:
-            response = exc.response
-            status_code = response.status_code if response is not None else None
-            body_text = ""
-            try:
-                body_text = response.text if response is not None else ""
-            except Exception:
-                body_text = ""
-
-            body_lc = body_text.lower()
-            if status_code == 400 and any(
-                key in body_lc for key in ["too large", "payload", "request body", "body size", "input too long"]
-            ):
-                logger.bind(
-                    event="runpod_job_enqueue_failed",
-                    runpod_error_code="runpod_pdf_too_large",
-                    status_code=status_code,
-                    input_source=input_source,
-                    filename=filename,
-                    patent_origin=patent_origin,
-                ).error("RunPod 작업 큐 등록 실패")
-                raise RuntimeError("runpod_pdf_too_large") from exc
-            if status_code == 400:
-                logger.bind(
-                    event="runpod_job_enqueue_failed",
-                    runpod_error_code="runpod_bad_request",
-                    status_code=status_code,
-                    input_source=input_source,
-                    filename=filename,
-                    patent_origin=patent_origin,
-                ).error("RunPod 작업 큐 등록 실패")
-                raise RuntimeError("runpod_bad_request") from exc
-            logger.bind(
-                event="runpod_job_enqueue_failed",
-                runpod_error_code=f"runpod_http_{status_code or 'unknown'}",
-                status_code=status_code,
-                input_source=input_source,
-                filename=filename,
-                patent_origin=patent_origin,
-            ).error("RunPod 작업 큐 등록 실패")
-            raise RuntimeError(f"runpod_http_{status_code or 'unknown'}") from exc
-
-        run_data = run_response.json()
+def _build_run_body(payload_input: dict[str, Any]) -> dict[str, Any]:
+    run_body: dict[str, Any] = {"input": payload_input}
+    url = webhook_url()
+    if url:
+        run_body["webhook"] = url
+    return run_body
 
+
+def _input_source(payload_input: dict[str, Any]) -> str:
+    return "pdf_url" if payload_input.get("pdf_url") else "pdf_base64"
+
+
+def _raise_runpod_enqueue_error(exc: httpx.HTTPError, payload_input: dict[str, Any]) -> NoReturn:
+    log = logger.bind(
+        event="runpod_job_enqueue_failed",
+        input_source=_input_source(payload_input),
+        filename=payload_input.get("filename"),
+        patent_origin=payload_input.get("patent_origin"),
+    )
+    if isinstance(exc, httpx.TimeoutException):
+        log.bind(runpod_error_code="runpod_timeout").error("RunPod 작업 큐 등록 실패")
+        raise RuntimeError("runpod_timeout") from exc
+
+    response = exc.response if isinstance(exc, httpx.HTTPStatusError) else None
+    status_code = response.status_code if response is not None else None
+    body_text = ""
+    try:
+        body_text = response.text if response is not None else ""
+    except Exception:
+        body_text = ""
+
+    body_lc = body_text.lower()
+    if status_code == 400 and any(
+        key in body_lc for key in ["too large", "payload", "request body", "body size", "input too long"]
+    ):
+        error_code = "runpod_pdf_too_large"
+    elif status_code == 400:
+        error_code = "runpod_bad_request"
+    else:
+        error_code = f"runpod_http_{status_code or 'unknown'}"
+    log.bind(runpod_error_code=error_code, status_code=status_code).error("RunPod 작업 큐 등록 실패")
+    raise RuntimeError(error_code) from exc
+
+
+def _runpod_job_from_response(
+    run_data: dict[str, Any],
+    run_body: dict[str, Any],
+    submitted_at: float,
+    *,
+    page_count: int | None,
+    estimate: DurationEstimate,
+) -> dict[str, Any]:
+    payload_input = run_body["input"]
+    input_source = _input_source(payload_input)
     job_id = run_data.get("id")
     if not job_id:
         logger.bind(
             event="runpod_job_enqueue_failed",
             runpod_error_code="runpod_job_id_missing",
             input_source=input_source,
-            filename=filename,
-            patent_origin=patent_origin,
+            filename=payload_input.get("filename"),
+            patent_origin=payload_input.get("patent_origin"),
         ).error("RunPod 작업 큐 등록 실패")
         raise RuntimeError(f"RunPod 작업 제출 실패: {run_data}")
 
@@ -161,93 +229,257 @@ def parse_pdf_via_runpod(
         event="runpod_job_enqueued",
         runpod_job_id=job_id,
         input_source=input_source,
-        filename=filename,
-        patent_origin=patent_origin,
+        filename=payload_input.get("filename"),
+        patent_origin=payload_input.get("patent_origin"),
+        webhook="webhook" in run_body,
+        expected_seconds=estimate.expected_seconds,
     ).info("RunPod 작업 큐 등록 성공")
 
-    elapsed = 0
-    with httpx.Client(timeout=20.0) as client:
-        while elapsed < _MAX_WAIT_SECONDS:
-            try:
-                status_response = client.get(
-                    f"{_RUNPOD_STATUS_URL}/{job_id}",
-                    headers=_HEADERS,
-                )
-                status_response.raise_for_status()
-            except httpx.TimeoutException as exc:
-                logger.bind(
-                    event="runpod_ocr_failed",
-                    runpod_job_id=job_id,
-                    runpod_error_code="runpod_timeout",
-                    elapsed_seconds=round(time.monotonic() - started_at, 3),
-                ).error("RunPod OCR 실패")
-                raise RuntimeError("runpod_timeout") from exc
-            except httpx.HTTPStatusError as exc:
-                response = exc.response
-                status_code = response.status_code if response is not None else None
-                logger.bind(
-                    event="runpod_ocr_failed",
-                    runpod_job_id=job_id,
-                    runpod_error_code=f"runpod_http_{status_code or 'unknown'}",
-                    status_code=status_code,
-                    elapsed_seconds=round(time.monotonic() - started_at, 3),
-                ).error("RunPod OCR 실패")
-                raise RuntimeError(f"runpod_http_{status_code or 'unknown'}") from exc
-            status_data = status_response.json()
-            status = str(status_data.get("status", "")).upper()
-
-            if status == "COMPLETED":
-                output = status_data.get("output", {})
-                text = _extract_text_from_output(output)
-                _dump_ocr_json(
-                    dump_file_path,
-                    {
-                        "saved_at": datetime.now(timezone.utc).isoformat(),
-                        "run_request": {"input": payload_input},
-                        "run_response": run_data,
-                        "status_response": status_data,
-                        "ocr_text_length": len(text),
-                    },
-                )
-                logger.bind(
-                    event="runpod_ocr_succeeded",
-                    runpod_job_id=job_id,
-                    ocr_text_length=len(text),
-                    elapsed_seconds=round(time.monotonic() - started_at, 3),
-                ).info("RunPod OCR 성공")
-                return text
-
-            if status in ("FAILED", "CANCELLED"):
-                error_msg = status_data.get("error") or status_data.get("output") or "unknown error"
-                _dump_ocr_json(
-                    dump_file_path,
-                    {
-                        "saved_at": datetime.now(timezone.utc).isoformat(),
-                        "run_request": {"input": payload_input},
-                        "run_response": run_data,
-                        "status_response": status_data,
-                        "error": str(error_msg),
-                    },
-                )
-                logger.bind(
-                    event="runpod_ocr_failed",
-                    runpod_job_id=job_id,
-                    runpod_status=status,
-                    runpod_error_code="runpod_job_failed",
-                    error=str(error_msg),
-                    elapsed_seconds=round(time.monotonic() - started_at, 3),
-                ).error("RunPod OCR 실패")
-                raise RuntimeError(
-                    f"RunPod 작업 실패 - job_id={job_id}, status={status}, error={error_msg}"
-                )
-
-            time.sleep(_POLL_INTERVAL)
-            elapsed += _POLL_INTERVAL
+    return {
+        "job_id": job_id,
+        "payload_input": payload_input,
+        "run_data": run_data,
+        "input_source": input_source,
+        "submitted_at": submitted_at,
+        "webhook": "webhook" in run_body,
+        "page_count": page_count,
+        "expected_seconds": estimate.expected_seconds,
+        "expected_spread": estimate.spread,
+        "last_status": str(run_data.get("status") or "IN_QUEUE").upper(),
+        "status_polls": 0,
+        "stream": settings.RUNPOD_STREAM_ENABLED,
+        "pages_done": 0,
+        "pages_total": page_count,
+    }
+
+
+def _elapsed_seconds(job: dict[str, Any]) -> float:
+    return round(time.time() - float(job.get("submitted_at") or time.time()), 3)
+
+
+def fetch_runpod_ocr_status(job: dict[str, Any], *, client: httpx.Client | None = None) -> dict[str, Any]:
+    """RunPod 작업 상태를 한 번 조회한다 (기본: 프로세스 공유 client)."""
+    job["status_polls"] = job.get("status_polls", 0) + 1
+    try:
+        status_response = (client or get_http_client(RUNPOD)).get(
+            f"{_RUNPOD_STATUS_URL}/{job['job_id']}", headers=_HEADERS
+        )
+        status_response.raise_for_status()
+    except (httpx.TimeoutException, httpx.HTTPStatusError) as exc:
+        _raise_runpod_status_error(exc, job)
+    return status_response.json()
+
+
+async def fetch_runpod_ocr_status_async(client: httpx.AsyncClient, job: dict[str, Any]) -> dict[str, Any]:
+    """fetch_runpod_ocr_status의 async 버전 (공유 AsyncClient 사용)."""
+    job["status_polls"] = job.get("status_polls", 0) + 1
+    try:
+        status_response = await client.get(
+            f"{_RUNPOD_STATUS_URL}/{job['job_id']}",
+            headers=_HEADERS,
+            timeout=http_timeout(settings.RUNPOD_STATUS_TIMEOUT_SECONDS),
+        )
+        status_response.raise_for_status()
+    except (httpx.TimeoutException, httpx.HTTPStatusError) as exc:
+        _raise_runpod_status_error(exc, job)
+    return status_response.json()
+
+
+def fetch_runpod_ocr_stream(job: dict[str, Any], *, client: httpx.Client | None = None) -> dict[str, Any]:
+    """RunPod /stream을 한 번 조회한다. 응답: {"status": ..., "stream": [{"output": {...}}, ...]}"""
+    job["status_polls"] = job.get("status_polls", 0) + 1
+    try:
+        stream_response = (client or get_http_client(RUNPOD)).get(
+            f"{_RUNPOD_STREAM_URL}/{job['job_id']}", headers=_HEADERS
+        )
+        stream_response.raise_for_status()
+    except (httpx.TimeoutException, httpx.HTTPStatusError) as exc:
+        _raise_runpod_status_error(exc, job)
+    return stream_response.json()
 
+
+async def fetch_runpod_ocr_stream_async(client: httpx.AsyncClient, job: dict[str, Any]) -> dict[str, Any]:
+    """fetch_runpod_ocr_stream의 async 버전 (공유 AsyncClient 사용)."""
+    job["status_polls"] = job.get("status_polls", 0) + 1
+    try:
+        stream_response = await client.get(
+            f"{_RUNPOD_STREAM_URL}/{job['job_id']}",
+            headers=_HEADERS,
+            timeout=http_timeout(settings.RUNPOD_STATUS_TIMEOUT_SECONDS),
+        )
+        stream_response.raise_for_status()
+    except (httpx.TimeoutException, httpx.HTTPStatusError) as exc:
+        _raise_runpod_status_error(exc, job)
+    return stream_response.json()
+
+
+def read_runpod_stream(job: dict[str, Any], stream_data: dict[str, Any]) -> list[OcrPage]:
+    """/stream 응답에서 페이지 출력을 꺼내고 job의 상태/총 페이지 수를 갱신한다."""
+    job["last_status"] = str(stream_data.get("status", "")).upper()
+    pages = parse_stream_output(stream_data.get("stream"))
+    for page in pages:
+        if page.total_pages:
+            job["pages_total"] = page.total_pages
+    return pages
+
+
+def finish_runpod_stream(job: dict[str, Any], text: str, *, dump_file_path: str | None = None) -> str:
+    """스트리밍으로 모든 페이지를 모은 작업을 완료 처리한다 (resolve_runpod_ocr_status의 COMPLETED와 같은 기록)."""
+    _dump_ocr_json(
+        dump_file_path,
+        {
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "run_request": {"input": job["payload_input"]},
+            "run_response": job["run_data"],
+            "streamed_pages": job["pages_done"],
+            "ocr_text_length": len(text),
+        },
+    )
+    elapsed = _elapsed_seconds(job)
+    record_duration(RUNPOD_POLL_POLICY, elapsed, job.get("page_count"))
+    logger.bind(
+        event="runpod_ocr_succeeded",
+        runpod_job_id=job["job_id"],
+        ocr_text_length=len(text),
+        elapsed_seconds=elapsed,
+        page_count=job.get("page_count"),
+        streamed_pages=job["pages_done"],
+        expected_seconds=job.get("expected_seconds"),
+        status_polls=job.get("status_polls", 0),
+    ).info("RunPod OCR 성공")
+    return text
+
+
+def _raise_runpod_status_error(exc: httpx.HTTPError, job: dict[str, Any]) -> NoReturn:
+    if isinstance(exc, httpx.TimeoutException):
+        logger.bind(
+            event="runpod_ocr_failed",
+            runpod_job_id=job["job_id"],
+            runpod_error_code="runpod_timeout",
+            elapsed_seconds=_elapsed_seconds(job),
+        ).error("RunPod OCR 실패")
+        raise RuntimeError("runpod_timeout") from exc
+
+    response = exc.response if isinstance(exc, httpx.HTTPStatusError) else None
+    status_code = response.status_code if response is not None else None
     logger.bind(
         event="runpod_ocr_failed",
-        runpod_job_id=job_id,
+        runpod_job_id=job["job_id"],
+        runpod_error_code=f"runpod_http_{status_code or 'unknown'}",
+        status_code=status_code,
+        elapsed_seconds=_elapsed_seconds(job),
+    ).error("RunPod OCR 실패")
+    raise RuntimeError(f"runpod_http_{status_code or 'unknown'}") from exc
+
+
+def resolve_runpod_ocr_status(
+    job: dict[str, Any],
+    status_data: dict[str, Any],
+    *,
+    dump_file_path: str | None = None,
+) -> str | None:
+    """상태 응답을 해석한다. 완료면 OCR 텍스트, 진행 중이면 None, 실패면 RuntimeError."""
+    job_id = job["job_id"]
+    status = str(status_data.get("status", "")).upper()
+    job["last_status"] = status
+
+    if status == "COMPLETED":
+        output = status_data.get("output", {})
+        text = _extract_text_from_output(output)
+        _dump_ocr_json(
+            dump_file_path,
+            {
+                "saved_at": datetime.now(timezone.utc).isoformat(),
+                "run_request": {"input": job["payload_input"]},
+                "run_response": job["run_data"],
+                "status_response": status_data,
+                "ocr_text_length": len(text),
+            },
+        )
+        elapsed = _elapsed_seconds(job)
+        finished_after = _runpod_finished_after_seconds(status_data)
+        if finished_after is not None:
+            record_duration(RUNPOD_POLL_POLICY, finished_after, job.get("page_count"))
+        logger.bind(
+            event="runpod_ocr_succeeded",
+            runpod_job_id=job_id,
+            ocr_text_length=len(text),
+            elapsed_seconds=elapsed,
+            page_count=job.get("page_count"),
+            expected_seconds=job.get("expected_seconds"),
+            status_polls=job.get("status_polls", 0),
+            # RunPod가 작업을 끝낸 뒤 우리가 완료를 알아채기까지 걸린 시간
+            detect_lag_seconds=round(elapsed - finished_after, 3) if finished_after is not None else None,
+        ).info("RunPod OCR 성공")
+        return text
+
+    if status in ("FAILED", "CANCELLED"):
+        error_msg = status_data.get("error") or status_data.get("output") or "unknown error"
+        _dump_ocr_json(
+            dump_file_path,
+            {
+                "saved_at": datetime.now(timezone.utc).isoformat(),
+                "run_request": {"input": job["payload_input"]},
+                "run_response": job["run_data"],
+                "status_response": status_data,
+                "error": str(error_msg),
+            },
+        )
+        logger.bind(
+            event="runpod_ocr_failed",
+            runpod_job_id=job_id,
+            runpod_status=status,
+            runpod_error_code="runpod_job_failed",
+            error=str(error_msg),
+            elapsed_seconds=_elapsed_seconds(job),
+        ).error("RunPod OCR 실패")
+        raise RuntimeError(
+            f"RunPod 작업 실패 - job_id={job_id}, status={status}, error={error_msg}"
+        )
+
+    return None
+
+
+def _runpod_finished_after_seconds(status_data: dict[str, Any]) -> float | None:
+    """작업 등록부터 RunPod 쪽 완료까지 걸린 시간 (delayTime + executionTime, ms 단위 응답)."""
+    try:
+        return (float(status_data["delayTime"]) + float(status_data["executionTime"])) / 1000
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def runpod_poll_interval(job: dict[str, Any]) -> float:
+    """다음 /status 조회까지의 간격.
+
+    마지막으로 본 상태(IN_QUEUE / IN_PROGRESS)와 예상 처리 시간으로 polling_service가 정한다.
+    완료 webhook을 등록한 작업은 fallback 간격으로만 조회한다.
+    스트리밍 작업은 webhook을 등록했더라도 페이지를 받아 와야 하므로 fallback 간격을 쓰지 않는다.
+    대기열에서는 queued 간격으로, 실행 중에는 진행률을 위해 RUNPOD_STREAM_POLL_SECONDS 이내로 조회한다.
+    """
+    queued = job.get("last_status") == "IN_QUEUE"
+    if job.get("webhook") and not job.get("stream"):
+        return max(float(settings.RUNPOD_WEBHOOK_FALLBACK_POLL_SECONDS), RUNPOD_POLL_POLICY.min_interval)
+    delay = next_poll_delay(
+        RUNPOD_POLL_POLICY,
+        elapsed=_elapsed_seconds(job),
+        estimate=DurationEstimate(job["expected_seconds"], job["expected_spread"]),
+        queued=queued,
+    )
+    if job.get("stream") and not queued:
+        delay = min(delay, max(float(settings.RUNPOD_STREAM_POLL_SECONDS), RUNPOD_POLL_POLICY.min_interval))
+    return delay
+
+
+def runpod_ocr_deadline(job: dict[str, Any]) -> float:
+    """작업 등록 시각 기준 OCR 대기 마감 시각(epoch seconds)."""
+    return float(job["submitted_at"]) + _MAX_WAIT_SECONDS
+
+
+def raise_runpod_ocr_timeout(job: dict[str, Any]) -> NoReturn:
+    logger.bind(
+        event="runpod_ocr_failed",
+        runpod_job_id=job["job_id"],
         runpod_error_code="runpod_timeout",
-        elapsed_seconds=round(time.monotonic() - started_at, 3),
+        elapsed_seconds=_elapsed_seconds(job),
     ).error("RunPod OCR 실패")
     raise RuntimeError("runpod_timeout")
@@ -0,0 +1,163 @@
+"""외부 작업(RunPod, JDPatent) 상태 조회 간격 계산.
+
+고정 간격 대신 작업 상태와 예상 완료 시각에 맞춰 조회 간격을 정한다.
+
+- 대기열(queued) 상태에서는 드물게 조회한다.
+- 실행 중이면 완료 예상 시각 근처에서 가장 자주 조회하고, 멀어질수록(이르거나 늦어질수록) 간격을 늘린다.
+  간격은 완료 시각 분포 밀도의 -1/2승에 비례하게 잡는데, 같은 조회 수로 평균 완료 감지 지연을
+  가장 작게 만드는 배치다. 분포는 최근 처리 시간의 중앙값/로그 표준편차로 만든 lognormal로 본다.
+- 여러 worker가 같은 박자로 조회하지 않도록 jitter를 더한다.
+
+처리 시간은 최근 완료된 작업 기록(가능하면 페이지당 시간)을 Redis에 남겨 추정한다.
+동작 확인: python -m app.test.run_polling_schedule_test
+"""
+
+import math
+import random
+import statistics
+import time
+from dataclasses import dataclass
+
+from loguru import logger
+
+from app.services.redis_service import get_redis
+
+_KEY_PREFIX = "jd-poll"
+# 예상 시간 계산에 쓰는 최근 완료 작업 수
+_SAMPLES = 100
+# 처리 시간 분포 폭(로그 표준편차)을 기록에서 추정할 최소 표본 수와 허용 범위
+_MIN_SPREAD_SAMPLES = 5
+_SPREAD_BOUNDS = (0.15, 1.0)
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    source: str
+    min_interval: float  # 완료 예상 시각 근처 조회 간격
+    max_interval: float  # 예상 시각에서 멀 때 / 많이 늦어질 때 상한
+    queued_interval: float  # 대기열 상태일 때 조회 간격
+    default_expected_seconds: float  # 처리 시간 기록이 없을 때 예상 소요 시간(중앙값)
+    default_spread: float = 0.4  # 처리 시간 기록이 없을 때 로그 표준편차
+    jitter_ratio: float = 0.2
+
+
+@dataclass(frozen=True)
+class DurationEstimate:
+    expected_seconds: float  # 작업 등록부터 완료까지 걸리는 시간의 중앙값
+    spread: float  # 로그 표준편차
+
+
+# min_interval은 기존 고정 2초 polling보다 평균 감지 지연이 짧도록 잡았다.
+RUNPOD_POLL_POLICY = PollPolicy(
+    source="runpod",
+    min_interval=1.25,
+    max_interval=15.0,
+    queued_interval=5.0,
+    default_expected_seconds=120.0,
+)
+JDPATENT_POLL_POLICY = PollPolicy(
+    source="jdpatent",
+    min_interval=1.25,
+    max_interval=20.0,
+    queued_interval=10.0,
+    default_expected_seconds=180.0,
+)
+
+
+def next_poll_delay(
+    policy: PollPolicy,
+    *,
+    elapsed: float,
+    estimate: DurationEstimate,
+    queued: bool = False,
+    rng: random.Random | None = None,
+) -> float:
+    """작업 등록 후 elapsed초가 지난 시점에서 다음 상태 조회까지 기다릴 시간(초)."""
+    if queued:
+        base = policy.queued_interval
+    else:
+        expected = max(estimate.expected_seconds, policy.min_interval)
+        z = math.log(max(elapsed, policy.min_interval) / expected) / estimate.spread
+        # lognormal 밀도 비율의 -1/2승: 예상 시각에서 min_interval, 멀어질수록 늘어난다.
+        base = policy.min_interval * math.exp(min(z * z / 4, 50.0))
+    base = min(max(base, policy.min_interval), policy.max_interval)
+    jitter = (rng or random).uniform(-policy.jitter_ratio, policy.jitter_ratio)
+    return round(base * (1 + jitter), 3)
+
+
+class PollClock:
+    """프로세스 안에서 반복 조회하는 루프의 마감 시각 (time.monotonic 기준)."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._started = time.monotonic()
+
+    def elapsed(self) -> float:
+        return round(time.monotonic() - self._started, 3)
+
+    def remaining(self) -> float:
+        return max(self.timeout - self.elapsed(), 0.0)
+
+    def expired(self) -> bool:
+        return self.elapsed() >= self.timeout
+
+
+def _durations_key(policy: PollPolicy) -> str:
+    return f"{_KEY_PREFIX}:{policy.source}:durations"
+
+
+def _rates_key(policy: PollPolicy) -> str:
+    return f"{_KEY_PREFIX}:{policy.source}:seconds-per-unit"
+
+
+def estimate_duration(policy: PollPolicy, units: int | None = None) -> DurationEstimate:
+    """최근 처리 시간으로 소요 시간 분포를 추정한다 (units: 페이지 수 등 작업 크기, 모르면 None).
+
+    Redis 조회에 실패하거나 기록이 없으면 policy 기본값을 쓴다.
+    """
+    default = DurationEstimate(policy.default_expected_seconds, policy.default_spread)
+    try:
+        client = get_redis()
+        samples, scale = [], 1
+        if units:
+            samples, scale = _floats(client.lrange(_rates_key(policy), 0, _SAMPLES - 1)), units
+        if not samples:
+            samples, scale = _floats(client.lrange(_durations_key(policy), 0, _SAMPLES - 1)), 1
+    except Exception as exc:
+        logger.warning(f"{policy.source} 예상 처리 시간 조회 실패: {exc}")
+        return default
+    samples = [value for value in samples if value > 0]
+    if not samples:
+        return default
+
+    spread = policy.default_spread
+    if len(samples) >= _MIN_SPREAD_SAMPLES:
+        spread = statistics.pstdev(math.log(value) for value in samples)
+    return DurationEstimate(
+        expected_seconds=round(statistics.median(samples) * scale, 3),
+        spread=round(min(max(spread, _SPREAD_BOUNDS[0]), _SPREAD_BOUNDS[1]), 3),
+    )
+
+
+def record_duration(policy: PollPolicy, seconds: float, units: int | None = None) -> None:
+    """완료된 작업의 처리 시간을 기록한다."""
+    try:
+        with get_redis().pipeline(transaction=False) as pipe:
+            pipe.lpush(_durations_key(policy), round(seconds, 3))
+            pipe.ltrim(_durations_key(policy), 0, _SAMPLES - 1)
+            if units:
+                pipe.lpush(_rates_key(policy), round(seconds / units, 3))
+                pipe.ltrim(_rates_key(policy), 0, _SAMPLES - 1)
+            pipe.execute()
+    except Exception as exc:
+        logger.warning(f"{policy.source} 처리 시간 기록 실패: {exc}")
+
+
+def _floats(raw_values: list) -> list[float]:
+    values = []
+    for raw in raw_values or []:
+        try:
+            values.append(float(raw))
+        except (TypeError, ValueError):
+            continue
+    return values
@@ -0,0 +1,167 @@
+"""분석 task 진행 상태 구독 서비스 (SSE /result/{task_id}/events 용).
+
+Celery Redis backend는 결과 메타를 저장할 때(store_result / mark_as_done / mark_as_failure)
+같은 pipeline에서 `celery-task-meta-{task_id}` 채널로 같은 값을 PUBLISH한다. worker의 상태 기록
+(_store_state → PARSING / JDPATENT_SUBMIT / JDPATENT_PROCESSING, 완료/실패)이 곧 알림이므로
+worker가 따로 publish하지 않고 이 채널을 구독한다.
+
+API 프로세스(이벤트 루프)마다 pub/sub 연결 하나(TaskEventHub)를 두고, 같은 task를 보는 SSE client들은
+채널 구독 하나를 나눠 쓴다. 받은 메타는 구독자별 asyncio.Queue로 나눠 준다.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from loguru import logger
+
+from app.services.redis_service import get_async_redis
+from app.services.result_archive_service import get_archived_result_async
+from app.services.result_store_service import decode_task_meta, resolve_result_ref_async
+
+_TASK_META_KEY_PREFIX = "celery-task-meta-"
+# 구독자가 읽지 못하고 쌓인 메타가 이보다 많으면 오래된 것부터 버린다 (최신 상태만 의미가 있다).
+_QUEUE_MAX_SIZE = 32
+
+
+def _channel(task_id: str) -> str:
+    # Celery는 결과 메타 키와 같은 이름의 채널로 publish한다.
+    return f"{_TASK_META_KEY_PREFIX}{task_id}"
+
+
+async def load_task_meta(task_id: str) -> dict[str, Any] | None:
+    """task의 현재 결과 메타를 Redis에서 읽는다. Redis에 없으면 장기 보관소에서 찾는다.
+
+    완료 메타는 외부 저장된 result까지 채워서 돌려준다. 아직 메타가 없으면(PENDING) None.
+    GET /result(long-poll 포함)와 SSE가 요청당 한 번 이 함수로 메타를 읽는다.
+    """
+    meta = decode_task_meta(await get_async_redis().get(_channel(task_id)), load_result=False)
+    if meta is None:
+        archived = await get_archived_result_async(task_id)
+        if archived is None:
+            return None
+        return {"status": "SUCCESS", "result": archived.result, "task_id": task_id}
+    return await resolve_completed_meta(meta)
+
+
+async def resolve_completed_meta(meta: dict[str, Any]) -> dict[str, Any]:
+    """구독으로 받은 완료 메타의 result가 외부 저장돼 있으면 읽어 채운다."""
+    if meta.get("status") == "SUCCESS":
+        return await resolve_result_ref_async(meta)
+    return meta
+
+
+class TaskEventHub:
+    """프로세스(이벤트 루프)당 pub/sub 연결 하나로 여러 task 채널을 구독한다."""
+
+    def __init__(self) -> None:
+        self._pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+        self._active = asyncio.Event()
+        self._reader: asyncio.Task | None = None
+
+    async def subscribe(self, task_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_QUEUE_MAX_SIZE)
+        async with self._lock:
+            queues = self._queues.setdefault(task_id, set())
+            if not queues:
+                await self._pubsub.subscribe(_channel(task_id))
+            queues.add(queue)
+            self._active.set()
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read_loop())
+        return queue
+
+    async def unsubscribe(self, task_id: str, queue: asyncio.Queue) -> None:
+        async with self._lock:
+            queues = self._queues.get(task_id)
+            if queues is None:
+                return
+            queues.discard(queue)
+            if queues:
+                return
+            del self._queues[task_id]
+            if not self._queues:
+                self._active.clear()
+            try:
+                await self._pubsub.unsubscribe(_channel(task_id))
+            except Exception as exc:
+                logger.warning(f"진행 상태 채널 구독 해제 실패 - task_id={task_id}, error={exc}")
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                if not self._queues:
+                    await self._active.wait()
+                    continue
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # 연결이 끊기면 redis-py가 재연결 시 기존 채널을 다시 구독한다.
+                logger.warning(f"진행 상태 pub/sub 수신 실패: {exc}")
+                await asyncio.sleep(1.0)
+                continue
+            if message is not None and message.get("type") == "message":
+                self._dispatch(message)
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        channel = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        task_id = channel[len(_TASK_META_KEY_PREFIX) :]
+        meta = decode_task_meta(message["data"], load_result=False)
+        if meta is None:
+            return
+        for queue in self._queues.get(task_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(meta)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self._pubsub.aclose()
+        self._queues.clear()
+
+
+_hub: TaskEventHub | None = None
+_hub_key: tuple[int, int] | None = None
+
+
+def get_task_event_hub() -> TaskEventHub:
+    """현재 이벤트 루프의 TaskEventHub (get_async_redis와 같이 (pid, loop) 단위)."""
+    global _hub, _hub_key
+    key = (os.getpid(), id(asyncio.get_running_loop()))
+    if _hub is None or _hub_key != key:
+        _hub = TaskEventHub()
+        _hub_key = key
+    return _hub
+
+
+@asynccontextmanager
+async def subscribe_task_events(task_id: str) -> AsyncIterator[asyncio.Queue]:
+    """task의 결과 메타 변경을 받는 queue. 블록을 벗어나면 구독을 해제한다.
+
+    queue에는 decode된 celery-task-meta dict가 들어온다 (외부 저장된 완료 결과의 result는 None).
+    """
+    hub = get_task_event_hub()
+    queue = await hub.subscribe(task_id)
+    try:
+        yield queue
+    finally:
+        await hub.unsubscribe(task_id, queue)
+
+
+async def close_task_event_hub() -> None:
+    """앱 종료 시 pub/sub 연결을 닫는다."""
+    global _hub, _hub_key
+    hub, _hub, _hub_key = _hub, None, None
+    if hub is not None:
+        await hub.close()
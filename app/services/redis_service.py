@@ -0,0 +1,57 @@
+"""Redis 연결 재사용 서비스.
+
+API/Worker가 직접 Redis에 접근할 때 매 호출마다 연결을 만들지 않도록
+프로세스(및 이벤트 루프) 단위로 client를 캐시한다.
+"""
+
+import asyncio
+import os
+import threading
+
+import redis
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+_lock = threading.Lock()
+_sync_client: redis.Redis | None = None
+_sync_client_pid: int | None = None
+_async_client: aioredis.Redis | None = None
+_async_client_key: tuple[int, int] | None = None
+
+
+def get_redis() -> redis.Redis:
+    """현재 프로세스의 동기 Redis client를 반환한다."""
+    global _sync_client, _sync_client_pid
+    pid = os.getpid()
+    if _sync_client is not None and _sync_client_pid == pid:
+        return _sync_client
+    with _lock:
+        if _sync_client is None or _sync_client_pid != pid:
+            _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+            _sync_client_pid = pid
+        return _sync_client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """현재 이벤트 루프에 묶인 async Redis client를 반환한다.
+
+    async 연결은 생성된 이벤트 루프에서만 사용할 수 있으므로 (pid, loop) 단위로 캐시한다.
+    """
+    global _async_client, _async_client_key
+    key = (os.getpid(), id(asyncio.get_running_loop()))
+    if _async_client is not None and _async_client_key == key:
+        return _async_client
+    with _lock:
+        if _async_client is None or _async_client_key != key:
+            _async_client = aioredis.Redis.from_url(settings.REDIS_URL)
+            _async_client_key = key
+        return _async_client
+
+
+async def close_async_redis() -> None:
+    """앱 종료 시 async Redis 연결 풀을 닫는다."""
+    global _async_client, _async_client_key
+    client, _async_client, _async_client_key = _async_client, None, None
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,174 @@
+"""완료 결과 장기 보관(archive) 서비스.
+
+Redis의 Celery 결과는 RESULT_EXPIRES_SECONDS(기본 1시간)가 지나면 사라진다. 그 뒤에 돌아온 client가
+PENDING(=queued)만 보다가 같은 PDF를 다시 올려 OCR/분석 비용을 다시 내지 않도록, 완료 결과를
+로컬 SQLite 파일(RESULT_ARCHIVE_PATH, WAL 모드)에 task_id와 PDF 해시(pdf_sha256 + country)로 남긴다.
+
+- 쓰기: 파이프라인 완료 시 worker가 한 번 기록 (실패해도 파이프라인은 성공으로 끝난다)
+- 읽기: GET /result·배치 조회에서 Redis에 없는 task, 중복 요청 처리에서 Redis 인덱스가 만료된 PDF
+- 조회는 primary key / 인덱스 한 번이라 보관 건수와 관계없이 1ms 이하다.
+- RESULT_ARCHIVE_RETENTION_DAYS가 지난 항목은 쓰기 시 (1시간에 한 번) 정리한다.
+
+API와 Worker가 같은 파일을 봐야 하므로 docker-compose의 ./logs 볼륨처럼 같은 호스트 디스크에 둔다
+(SQLite 잠금이 보장되지 않는 NFS 등 네트워크 파일시스템은 피한다).
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.config import settings
+
+_PRUNE_INTERVAL_SECONDS = 3600
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS results (
+        task_id TEXT PRIMARY KEY,
+        pdf_sha256 TEXT,
+        country TEXT,
+        completed_at REAL NOT NULL,
+        result BLOB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS results_digest ON results (pdf_sha256, country, completed_at)",
+    "CREATE INDEX IF NOT EXISTS results_completed_at ON results (completed_at)",
+)
+
+_local = threading.local()
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+
+@dataclass(frozen=True)
+class ArchivedResult:
+    task_id: str
+    result: Any
+    completed_at: float
+
+
+def _connect() -> sqlite3.Connection:
+    path = Path(settings.RESULT_ARCHIVE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    return conn
+
+
+def _connection() -> sqlite3.Connection:
+    """스레드별 SQLite 연결. fork 이후에는 부모의 연결을 쓰지 않고 새로 연다."""
+    pid = os.getpid()
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "pid", None) != pid:
+        conn = _connect()
+        _local.conn = conn
+        _local.pid = pid
+    return conn
+
+
+def _encode(result: Any) -> bytes:
+    return gzip.compress(json.dumps(result, ensure_ascii=False).encode("utf-8"), compresslevel=6)
+
+
+def _decode(row: tuple[str, float, bytes]) -> ArchivedResult:
+    task_id, completed_at, data = row
+    return ArchivedResult(task_id=task_id, result=json.loads(gzip.decompress(data)), completed_at=completed_at)
+
+
+def archive_result(task_id: str, result: Any, *, pdf_sha256: str | None, country: str | None) -> None:
+    """완료 결과를 보관한다. 실패는 로그만 남긴다."""
+    if not settings.RESULT_ARCHIVE_ENABLED:
+        return
+    try:
+        data = _encode(result)
+        _connection().execute(
+            "INSERT OR REPLACE INTO results (task_id, pdf_sha256, country, completed_at, result) VALUES (?, ?, ?, ?, ?)",
+            (task_id, pdf_sha256, (country or "").upper() or None, time.time(), data),
+        )
+    except Exception as exc:
+        logger.bind(event="result_archive_failed", task_id=task_id).warning(f"완료 결과 보관 실패: {exc}")
+        return
+    logger.bind(event="result_archived", task_id=task_id, pdf_sha256=pdf_sha256, archived_bytes=len(data)).debug(
+        "완료 결과 보관"
+    )
+    _prune_if_due()
+
+
+def _prune_if_due() -> None:
+    global _last_prune
+    now = time.time()
+    with _prune_lock:
+        if now - _last_prune < _PRUNE_INTERVAL_SECONDS:
+            return
+        _last_prune = now
+    cutoff = now - settings.RESULT_ARCHIVE_RETENTION_DAYS * 86400
+    try:
+        removed = _connection().execute("DELETE FROM results WHERE completed_at < ?", (cutoff,)).rowcount
+    except Exception as exc:
+        logger.warning(f"보관 결과 정리 실패: {exc}")
+        return
+    if removed:
+        logger.bind(event="result_archive_pruned", removed=removed).info("보관 기간이 지난 결과 정리")
+
+
+def get_archived_result(task_id: str) -> ArchivedResult | None:
+    """task_id로 보관된 결과를 찾는다."""
+    if not settings.RESULT_ARCHIVE_ENABLED:
+        return None
+    row = _connection().execute(
+        "SELECT task_id, completed_at, result FROM results WHERE task_id = ?", (task_id,)
+    ).fetchone()
+    return _decode(row) if row else None
+
+
+def find_archived_result(pdf_sha256: str, country: str | None) -> ArchivedResult | None:
+    """같은 PDF(SHA-256)와 country의 가장 최근 보관 결과를 찾는다."""
+    if not settings.RESULT_ARCHIVE_ENABLED:
+        return None
+    row = _connection().execute(
+        "SELECT task_id, completed_at, result FROM results WHERE pdf_sha256 = ? AND country IS ? "
+        "ORDER BY completed_at DESC LIMIT 1",
+        (pdf_sha256, (country or "").upper() or None),
+    ).fetchone()
+    return _decode(row) if row else None
+
+
+def archived_task_ids(task_ids: list[str]) -> set[str]:
+    """보관된 결과가 있는 task_id만 골라낸다 (결과 본문은 읽지 않는다)."""
+    if not settings.RESULT_ARCHIVE_ENABLED or not task_ids:
+        return set()
+    found: set[str] = set()
+    conn = _connection()
+    # SQLite 변수 개수 제한(기본 999) 안에서 나눠 조회한다.
+    for start in range(0, len(task_ids), 500):
+        chunk = task_ids[start : start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(f"SELECT task_id FROM results WHERE task_id IN ({placeholders})", chunk)
+        found.update(row[0] for row in rows)
+    return found
+
+
+async def get_archived_result_async(task_id: str) -> ArchivedResult | None:
+    """get_archived_result의 non-blocking 버전."""
+    return await asyncio.to_thread(get_archived_result, task_id)
+
+
+async def find_archived_result_async(pdf_sha256: str, country: str | None) -> ArchivedResult | None:
+    """find_archived_result의 non-blocking 버전."""
+    return await asyncio.to_thread(find_archived_result, pdf_sha256, country)
+
+
+async def archived_task_ids_async(task_ids: list[str]) -> set[str]:
+    """archived_task_ids의 non-blocking 버전."""
+    return await asyncio.to_thread(archived_task_ids, task_ids)
@@ -0,0 +1,118 @@
+"""완료 결과 응답 캐시 서비스 (GET /result ETag / 304).
+
+완료된 task의 결과는 다시 바뀌지 않는다. 그런데 완료 뒤에도 client가 폴링하면 요청마다 Redis에서 메타를 읽고,
+decode하고, JSON으로 다시 직렬화한다. 그래서 완료 응답은 직렬화한 바이트와 내용 해시 기반 strong ETag를
+프로세스 메모리 LRU(RESULT_CACHE_MAX_BYTES)에 둔다.
+
+- 캐시에 있는 완료 결과는 Redis를 읽지 않고 그대로 보낸다.
+- If-None-Match가 ETag와 같으면 본문 없이 304를 보낸다. ETag는 내용에서 만들기 때문에
+  다른 API 프로세스가 발급한 ETag도 맞는다.
+- 정적 JSON 파일(app/static/output_v3.json 등)도 같은 형태로 캐시하고, 파일 mtime / 크기가 바뀌면 다시 읽는다.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.config import settings
+
+# 완료 결과는 바뀌지 않으므로 브라우저 / 프록시가 재검증 없이 재사용해도 된다.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+
+
+def serialize_response(payload: Any) -> CachedResponse:
+    """응답 dict를 FastAPI JSONResponse와 같은 형식으로 직렬화하고 strong ETag를 붙인다."""
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return CachedResponse(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 헤더(여러 값 / * / W/ 접두어 허용)가 etag와 맞는지."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class _ResponseLru:
+    """전체 본문 크기로 제한하는 LRU."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        max_bytes = settings.RESULT_CACHE_MAX_BYTES
+        if len(entry.body) > max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.body)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            while self._bytes > max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+
+
+_completed_results = _ResponseLru()
+_static_lock = threading.Lock()
+_static_files: dict[Path, tuple[tuple[int, int], CachedResponse]] = {}
+
+
+def get_cached_result(task_id: str) -> CachedResponse | None:
+    """캐시된 완료 결과 응답. 없으면 None."""
+    if not settings.RESULT_CACHE_ENABLED:
+        return None
+    return _completed_results.get(task_id)
+
+
+def cache_completed_result(task_id: str, response: dict) -> CachedResponse:
+    """완료 결과 응답을 직렬화해 캐시에 넣고 돌려준다."""
+    entry = serialize_response(response)
+    if settings.RESULT_CACHE_ENABLED:
+        _completed_results.put(task_id, entry)
+    return entry
+
+
+def load_static_json(path: Path) -> CachedResponse:
+    """정적 JSON 파일을 직렬화된 응답으로 읽는다. mtime / 크기가 그대로면 파일을 다시 읽지 않는다.
+
+    파일이 없으면 FileNotFoundError, JSON이 깨져 있으면 json.JSONDecodeError.
+    """
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _static_lock:
+        cached = _static_files.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    entry = serialize_response(json.loads(path.read_text(encoding="utf-8")))
+    with _static_lock:
+        _static_files[path] = (version, entry)
+    logger.bind(event="static_json_cached", path=str(path), body_bytes=len(entry.body)).debug("정적 JSON 캐시 갱신")
+    return entry
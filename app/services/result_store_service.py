@@ -0,0 +1,181 @@
+"""Celery 결과 메타(celery-task-meta-*) 압축 / 외부 저장 서비스.
+
+완료 결과(JDPatent 분석 결과 dict: NAICS 후보, 평가, 추천 기업)는 건당 수십 KB JSON이라
+result_expires 동안 Redis 메모리의 대부분을 차지한다.
+
+- RESULT_COMPRESS_MIN_BYTES 이상인 메타는 gzip으로 압축해 저장한다 (gzip magic으로 구분).
+- 압축 후에도 RESULT_OFFLOAD_MIN_BYTES 이상인 SUCCESS 결과는 blob 저장소(local / s3)에 두고,
+  Redis에는 상태와 blob 위치(result_ref)만 남긴다.
+
+진행 상태처럼 작은 메타는 기존 JSON 그대로 저장하므로 Flower 같은 도구에서도 그대로 읽힌다.
+Celery backend(app/worker/result_backend.py)와 Redis를 직접 읽는 곳(batch, dedup)이 같은 decode를 쓴다.
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from app.config import settings
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_S3_KEY_PREFIX = "results"
+_CLEANUP_INTERVAL_SECONDS = 300
+
+_cleanup_lock = threading.Lock()
+_last_cleanup = 0.0
+
+
+def _blob_key(task_id: str) -> str:
+    return f"{task_id}.json.gz"
+
+
+# ---------------------------------------------------------------------------
+# blob 저장소 (local: RESULT_OFFLOAD_DIR / s3: results/ prefix)
+# ---------------------------------------------------------------------------
+def _local_dir() -> Path:
+    path = Path(settings.RESULT_OFFLOAD_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _write_blob(backend: str, key: str, data: bytes) -> None:
+    if backend == "s3":
+        from app.services.s3_service import put_object_bytes
+
+        put_object_bytes(f"{_S3_KEY_PREFIX}/{key}", data, content_type="application/gzip")
+        return
+    path = _local_dir() / key
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+    _cleanup_expired_local_blobs()
+
+
+def _read_blob(backend: str, key: str) -> bytes | None:
+    if backend == "s3":
+        from app.services.s3_service import get_object_bytes
+
+        return get_object_bytes(f"{_S3_KEY_PREFIX}/{key}")
+    try:
+        return (_local_dir() / key).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _cleanup_expired_local_blobs() -> int:
+    """Redis 결과 메타가 만료된 뒤에도 남은 local blob을 정리한다 (RESULT_EXPIRES_SECONDS 기준).
+
+    S3는 results/ prefix에 bucket lifecycle 만료 규칙을 둔다.
+    """
+    global _last_cleanup
+    now = time.time()
+    with _cleanup_lock:
+        if now - _last_cleanup < _CLEANUP_INTERVAL_SECONDS:
+            return 0
+        _last_cleanup = now
+
+    removed = 0
+    for path in _local_dir().glob("*.json.gz"):
+        try:
+            if now - path.stat().st_mtime > settings.RESULT_EXPIRES_SECONDS:
+                path.unlink(missing_ok=True)
+                removed += 1
+        except FileNotFoundError:
+            continue
+        except Exception as exc:
+            logger.warning(f"결과 blob 정리 실패 - path={path}, error={exc}")
+    return removed
+
+
+# ---------------------------------------------------------------------------
+# encode / decode
+# ---------------------------------------------------------------------------
+def encode_task_meta(payload: str) -> str | bytes:
+    """Celery가 직렬화한 결과 메타(JSON)를 Redis에 저장할 형태로 바꾼다."""
+    if not settings.RESULT_COMPRESSION_ENABLED or len(payload) < settings.RESULT_COMPRESS_MIN_BYTES:
+        return payload
+    compressed = gzip.compress(payload.encode("utf-8"), compresslevel=settings.RESULT_COMPRESS_LEVEL)
+    if settings.RESULT_OFFLOAD_ENABLED and len(compressed) >= settings.RESULT_OFFLOAD_MIN_BYTES:
+        pointer = _offload(payload, compressed)
+        if pointer is not None:
+            return pointer
+    return compressed
+
+
+def _offload(payload: str, compressed: bytes) -> str | None:
+    """SUCCESS 메타를 blob 저장소에 쓰고 result 대신 위치(result_ref)를 담은 메타를 반환한다."""
+    meta = json.loads(payload)
+    if not isinstance(meta, dict) or meta.get("status") != "SUCCESS" or not meta.get("task_id"):
+        return None
+
+    backend = settings.RESULT_OFFLOAD_BACKEND.strip().lower()
+    key = _blob_key(meta["task_id"])
+    try:
+        _write_blob(backend, key, compressed)
+    except Exception as exc:
+        # blob 저장에 실패하면 압축본을 Redis에 그대로 둔다.
+        logger.warning(f"결과 blob 저장 실패, Redis에 압축 저장 - key={key}, error={exc}")
+        return None
+
+    meta["result"] = None
+    meta["result_ref"] = {"backend": backend, "key": key, "bytes": len(compressed)}
+    logger.bind(
+        event="task_result_offloaded",
+        task_id=meta["task_id"],
+        result_backend=backend,
+        payload_bytes=len(payload),
+        compressed_bytes=len(compressed),
+    ).debug("완료 결과를 blob 저장소로 이동")
+    return json.dumps(meta)
+
+
+def inflate_task_meta(raw: bytes | str) -> bytes | str:
+    """gzip으로 압축된 메타면 풀어서 JSON 바이트로 돌려준다."""
+    if isinstance(raw, (bytes, bytearray)) and raw[:2] == _GZIP_MAGIC:
+        return gzip.decompress(raw)
+    return raw
+
+
+def resolve_result_ref(meta: dict[str, Any]) -> dict[str, Any]:
+    """result_ref가 있으면 blob 저장소에서 결과를 읽어 meta["result"]를 채운다."""
+    ref = meta.pop("result_ref", None)
+    if not ref:
+        return meta
+    data = _read_blob(ref["backend"], ref["key"])
+    if data is None:
+        logger.bind(event="task_result_blob_missing", task_id=meta.get("task_id"), **ref).error(
+            "결과 blob을 찾을 수 없습니다"
+        )
+        return meta
+    meta["result"] = json.loads(gzip.decompress(data)).get("result")
+    return meta
+
+
+async def resolve_result_ref_async(meta: dict[str, Any]) -> dict[str, Any]:
+    """resolve_result_ref의 non-blocking 버전."""
+    if not meta.get("result_ref"):
+        return meta
+    return await asyncio.to_thread(resolve_result_ref, meta)
+
+
+def decode_task_meta(raw: bytes | str | None, *, load_result: bool = True) -> dict[str, Any] | None:
+    """Redis에서 직접 읽은 celery-task-meta 값을 dict로 decode한다.
+
+    load_result=False면 blob으로 옮겨진 결과는 읽지 않는다 (상태만 필요한 조회용, result는 None).
+    """
+    if raw is None:
+        return None
+    try:
+        meta = json.loads(inflate_task_meta(raw))
+    except (OSError, EOFError, zlib.error, json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(meta, dict):
+        return None
+    return resolve_result_ref(meta) if load_result else meta
@@ -0,0 +1,57 @@
+"""RunPod 완료 webhook 설정.
+
+/run 요청에 webhook URL을 넣으면 RunPod가 작업 종료 시 /status 응답과 같은 본문을
+POST /internal/runpod/webhook 으로 보낸다. 본문 저장과 대기 처리는 callback_service가 맡는다.
+
+webhook이 유실돼도 파이프라인은 RUNPOD_WEBHOOK_FALLBACK_POLL_SECONDS 간격으로 /status를 조회한다.
+"""
+
+from typing import Any
+
+from app.config import settings
+from app.services.callback_service import (
+    claim_waiter as _claim_waiter,
+    get_callback,
+    record_callback,
+    register_waiter as _register_waiter,
+    verify_token,
+    wait_for_callback_async,
+)
+
+_SOURCE = "runpod"
+
+
+def webhook_enabled() -> bool:
+    return settings.RUNPOD_WEBHOOK_ENABLED and bool(settings.RUNPOD_WEBHOOK_SECRET)
+
+
+def webhook_url() -> str | None:
+    """RunPod /run 요청에 넣을 webhook URL (비활성이면 None)."""
+    if not webhook_enabled():
+        return None
+    base_url = settings.PUBLIC_BASE_URL.rstrip("/")
+    return f"{base_url}/internal/runpod/webhook?token={settings.RUNPOD_WEBHOOK_SECRET}"
+
+
+def verify_webhook_token(token: str | None) -> bool:
+    return webhook_enabled() and verify_token(token, settings.RUNPOD_WEBHOOK_SECRET)
+
+
+async def record_webhook_status(job_id: str, payload: dict[str, Any]) -> dict[str, Any] | None:
+    return await record_callback(_SOURCE, job_id, payload)
+
+
+def get_webhook_status(job_id: str) -> dict[str, Any] | None:
+    return get_callback(_SOURCE, job_id)
+
+
+def register_waiter(job_id: str, ctx: dict[str, Any]) -> None:
+    _register_waiter(_SOURCE, job_id, ctx)
+
+
+def claim_waiter(job_id: str) -> bool:
+    return _claim_waiter(_SOURCE, job_id)
+
+
+async def wait_for_webhook_status_async(job_id: str, timeout: float) -> dict[str, Any] | None:
+    return await wait_for_callback_async(_SOURCE, job_id, timeout)
@@ -1,22 +1,110 @@
 """AWS S3 PDF 업로드/presigned URL/삭제 서비스."""
 
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from loguru import logger
 
 from app.config import settings
 
+# S3 multipart upload의 최소 part 크기(마지막 part 제외)
+_MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
 
-def _s3_client():
-    return boto3.client(
+_T = TypeVar("_T")
+
+# API 프로세스에서 boto3 동기 호출을 이벤트 루프 밖에서 실행하기 위한 전용 executor.
+# 크기를 제한해 느린 S3 요청이 몰려도 스레드가 무한히 늘어나지 않도록 한다.
+_s3_io_executor: ThreadPoolExecutor | None = None
+_s3_io_lock = threading.Lock()
+_s3_io_stats: dict[str, float] = {
+    "submitted": 0,
+    "completed": 0,
+    "failed": 0,
+    "waiting": 0,
+    "in_flight": 0,
+    "peak_in_flight": 0,
+    "total_wait_seconds": 0.0,
+    "total_run_seconds": 0.0,
+    "max_run_seconds": 0.0,
+}
+
+
+class S3NotConfiguredError(RuntimeError):
+    """AWS_S3_BUCKET이 비어 있어 S3를 사용할 수 없다."""
+
+
+def _bucket() -> str:
+    # 빈 bucket 이름은 boto3가 요청마다 ParamValidationError로 거절하므로 먼저 설정 오류로 알린다.
+    if not settings.AWS_S3_BUCKET:
+        raise S3NotConfiguredError("AWS_S3_BUCKET이 설정되지 않았습니다")
+    return settings.AWS_S3_BUCKET
+
+
+# 프로세스당 하나의 S3 client를 재사용해 TCP/TLS 연결 풀을 유지한다.
+# boto3 client는 스레드 안전하지만 fork 이후에는 부모의 소켓을 공유하면 안 되므로
+# 생성한 pid를 함께 기록하고, pid가 바뀌면 새로 만든다.
+_s3_client_lock = threading.Lock()
+_cached_s3_client: Any = None
+_cached_s3_client_pid: int | None = None
+
+
+def _build_s3_client():
+    # 기본 세션은 스레드 간 공유가 안전하지 않으므로 전용 세션에서 생성한다.
+    session = boto3.session.Session()
+    return session.client(
         "s3",
         region_name=settings.AWS_REGION,
         aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
         endpoint_url=f"https://s3.{settings.AWS_REGION}.amazonaws.com",
+        config=Config(
+            max_pool_connections=max(int(settings.AWS_S3_MAX_POOL_CONNECTIONS), 1),
+            tcp_keepalive=True,
+            retries={"max_attempts": 3, "mode": "standard"},
+        ),
     )
 
 
+def _s3_client():
+    global _cached_s3_client, _cached_s3_client_pid
+    pid = os.getpid()
+    client = _cached_s3_client
+    if client is not None and _cached_s3_client_pid == pid:
+        return client
+
+    with _s3_client_lock:
+        if _cached_s3_client is None or _cached_s3_client_pid != pid:
+            _cached_s3_client = _build_s3_client()
+            _cached_s3_client_pid = pid
+            logger.debug(f"S3 client 생성 - pid={pid}")
+        return _cached_s3_client
+
+
+def warm_s3_client() -> None:
+    """첫 요청이 client 생성 비용을 치르지 않도록 현재 프로세스의 client를 미리 만든다."""
+    _s3_client()
+
+
+def reset_s3_client() -> None:
+    """캐시된 S3 client와 executor를 버린다. fork 직후 자식 프로세스에서 호출한다."""
+    global _cached_s3_client, _cached_s3_client_pid, _s3_client_lock
+    global _s3_io_executor, _s3_io_lock
+    # 부모에서 다른 스레드가 잡고 있던 lock이 자식에 잠긴 채 복사될 수 있어 새로 만든다.
+    _s3_client_lock = threading.Lock()
+    _s3_io_lock = threading.Lock()
+    _cached_s3_client = None
+    _cached_s3_client_pid = None
+    _s3_io_executor = None
+
+
 def upload_pdf(pdf_bytes: bytes, s3_key: str) -> str:
     """S3에 PDF를 업로드하고 presigned URL을 반환한다.
 
@@ -29,31 +117,185 @@ def upload_pdf(pdf_bytes: bytes, s3_key: str) -> str:
     """
     client = _s3_client()
     client.put_object(
-        Bucket=settings.AWS_S3_BUCKET,
+        Bucket=_bucket(),
         Key=s3_key,
         Body=pdf_bytes,
         ContentType="application/pdf",
     )
     logger.debug(f"S3 업로드 완료 - bucket={settings.AWS_S3_BUCKET}, key={s3_key}")
 
-    presigned_url = client.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": settings.AWS_S3_BUCKET, "Key": s3_key},
-        ExpiresIn=settings.AWS_S3_PRESIGNED_URL_EXPIRES,
-    )
-    return presigned_url
+    return _presigned_get_url(client, s3_key)
 
 
-def generate_presigned_get_url(s3_key: str) -> str:
-    """기존 S3 오브젝트 키로 GET용 presigned URL을 생성한다."""
-    client = _s3_client()
+class S3StreamingUpload:
+    """청크 단위로 받은 PDF를 S3 multipart upload로 전송한다.
+
+    part 크기만큼만 버퍼링하므로 메모리 사용량은 파일 크기와 무관하게 part 크기로 제한된다.
+    전체 크기가 part 하나보다 작으면 multipart 대신 put_object 한 번으로 업로드한다.
+    """
+
+    def __init__(self, s3_key: str, part_size: int | None = None):
+        self.s3_key = s3_key
+        self.part_size = max(
+            int(part_size or settings.AWS_S3_MULTIPART_PART_SIZE),
+            _MIN_MULTIPART_PART_SIZE,
+        )
+        self.bytes_written = 0
+        self._client = _s3_client()
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[dict] = []
+
+    def write(self, chunk: bytes) -> None:
+        """청크를 버퍼에 추가하고, part 크기가 채워지면 즉시 S3로 전송한다."""
+        if not chunk:
+            return
+        self._buffer += chunk
+        self.bytes_written += len(chunk)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._upload_part(part)
+
+    def complete(self) -> str:
+        """남은 버퍼를 전송해 업로드를 마무리하고 presigned URL을 반환한다."""
+        if self._upload_id is None:
+            self._client.put_object(
+                Bucket=_bucket(),
+                Key=self.s3_key,
+                Body=bytes(self._buffer),
+                ContentType="application/pdf",
+            )
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self._client.complete_multipart_upload(
+                Bucket=_bucket(),
+                Key=self.s3_key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer.clear()
+        logger.debug(
+            f"S3 스트리밍 업로드 완료 - bucket={settings.AWS_S3_BUCKET}, key={self.s3_key}, "
+            f"size={self.bytes_written}, parts={len(self._parts) or 1}"
+        )
+        return _presigned_get_url(self._client, self.s3_key)
+
+    def abort(self) -> None:
+        """진행 중인 multipart upload를 취소해 미완성 part가 남지 않도록 한다."""
+        self._buffer.clear()
+        if self._upload_id is None:
+            return
+        try:
+            self._client.abort_multipart_upload(
+                Bucket=_bucket(),
+                Key=self.s3_key,
+                UploadId=self._upload_id,
+            )
+            logger.debug(f"S3 multipart upload 취소 - key={self.s3_key}")
+        except ClientError as e:
+            logger.warning(f"S3 multipart upload 취소 실패 - key={self.s3_key}, error={e}")
+        finally:
+            self._upload_id = None
+
+    def _upload_part(self, data: bytes) -> None:
+        if self._upload_id is None:
+            response = self._client.create_multipart_upload(
+                Bucket=_bucket(),
+                Key=self.s3_key,
+                ContentType="application/pdf",
+            )
+            self._upload_id = response["UploadId"]
+        part_number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=_bucket(),
+            Key=self.s3_key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+
+def _presigned_get_url(client, s3_key: str, expires_in: int | None = None) -> str:
     return client.generate_presigned_url(
         "get_object",
-        Params={"Bucket": settings.AWS_S3_BUCKET, "Key": s3_key},
-        ExpiresIn=settings.AWS_S3_PRESIGNED_URL_EXPIRES,
+        Params={"Bucket": _bucket(), "Key": s3_key},
+        ExpiresIn=expires_in or settings.AWS_S3_PRESIGNED_URL_EXPIRES,
+    )
+
+
+def generate_presigned_get_url(s3_key: str, expires_in: int | None = None) -> str:
+    """기존 S3 오브젝트 키로 GET용 presigned URL을 생성한다.
+
+    expires_in(초)이 없으면 AWS_S3_PRESIGNED_URL_EXPIRES 동안 유효하다.
+    """
+    return _presigned_get_url(_s3_client(), s3_key, expires_in)
+
+
+def generate_presigned_upload(s3_key: str, max_size: int) -> dict[str, Any]:
+    """클라이언트가 API를 거치지 않고 S3로 직접 PDF를 올릴 수 있는 presigned POST를 생성한다.
+
+    content-length-range 조건으로 최대 크기를 S3에서 강제한다.
+
+    Returns:
+        {"url": 업로드 URL, "fields": multipart form에 함께 보낼 필드}
+    """
+    return _s3_client().generate_presigned_post(
+        Bucket=_bucket(),
+        Key=s3_key,
+        Fields={"Content-Type": "application/pdf"},
+        Conditions=[
+            {"Content-Type": "application/pdf"},
+            ["content-length-range", 1, max_size],
+        ],
+        ExpiresIn=settings.AWS_S3_PRESIGNED_UPLOAD_EXPIRES,
+    )
+
+
+def get_pdf_size(s3_key: str) -> int | None:
+    """S3 오브젝트 크기를 반환한다. 오브젝트가 없으면 None."""
+    try:
+        response = _s3_client().head_object(Bucket=_bucket(), Key=s3_key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+    return int(response["ContentLength"])
+
+
+def read_pdf_range(s3_key: str, start: int, end: int) -> bytes:
+    """S3 오브젝트의 [start, end] 바이트 구간만 ranged GET으로 읽는다."""
+    response = _s3_client().get_object(
+        Bucket=_bucket(),
+        Key=s3_key,
+        Range=f"bytes={start}-{end}",
+    )
+    return response["Body"].read()
+
+
+def put_object_bytes(s3_key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+    """PDF가 아닌 작은 오브젝트(예: 외부 저장한 task 결과)를 같은 bucket에 저장한다."""
+    _s3_client().put_object(
+        Bucket=_bucket(),
+        Key=s3_key,
+        Body=data,
+        ContentType=content_type,
     )
 
 
+def get_object_bytes(s3_key: str) -> bytes | None:
+    """오브젝트 전체를 읽는다. 오브젝트가 없으면 None."""
+    try:
+        response = _s3_client().get_object(Bucket=_bucket(), Key=s3_key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+    return response["Body"].read()
+
+
 def delete_pdf(s3_key: str) -> None:
     """S3에서 PDF를 삭제한다.
 
@@ -62,7 +304,127 @@ def delete_pdf(s3_key: str) -> None:
     """
     client = _s3_client()
     try:
-        client.delete_object(Bucket=settings.AWS_S3_BUCKET, Key=s3_key)
+        client.delete_object(Bucket=_bucket(), Key=s3_key)
         logger.debug(f"S3 삭제 완료 - key={s3_key}")
     except ClientError as e:
         logger.warning(f"S3 삭제 실패 - key={s3_key}, error={e}")
+
+
+def _get_s3_io_executor() -> ThreadPoolExecutor:
+    global _s3_io_executor
+    if _s3_io_executor is None:
+        with _s3_io_lock:
+            if _s3_io_executor is None:
+                _s3_io_executor = ThreadPoolExecutor(
+                    max_workers=max(int(settings.AWS_S3_IO_MAX_WORKERS), 1),
+                    thread_name_prefix="s3-io",
+                )
+    return _s3_io_executor
+
+
+def _run_s3_io_measured(fn: Callable[..., _T], submitted_at: float) -> _T:
+    started_at = time.monotonic()
+    with _s3_io_lock:
+        _s3_io_stats["waiting"] -= 1
+        _s3_io_stats["in_flight"] += 1
+        _s3_io_stats["peak_in_flight"] = max(_s3_io_stats["peak_in_flight"], _s3_io_stats["in_flight"])
+        _s3_io_stats["total_wait_seconds"] += started_at - submitted_at
+    failed = False
+    try:
+        return fn()
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        run_seconds = time.monotonic() - started_at
+        with _s3_io_lock:
+            _s3_io_stats["in_flight"] -= 1
+            _s3_io_stats["failed" if failed else "completed"] += 1
+            _s3_io_stats["total_run_seconds"] += run_seconds
+            _s3_io_stats["max_run_seconds"] = max(_s3_io_stats["max_run_seconds"], run_seconds)
+
+
+async def run_s3_io(fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    """동기 boto3 호출을 S3 전용 executor에서 실행하고 결과를 기다린다.
+
+    이벤트 루프를 막지 않으므로 느린 S3 요청 중에도 같은 worker의 다른 요청이 처리된다.
+    """
+    with _s3_io_lock:
+        _s3_io_stats["submitted"] += 1
+        _s3_io_stats["waiting"] += 1
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_s3_io_executor(),
+        partial(_run_s3_io_measured, partial(fn, *args, **kwargs), time.monotonic()),
+    )
+
+
+def shutdown_s3_io_executor() -> None:
+    """프로세스 종료 시 S3 executor를 정리한다."""
+    global _s3_io_executor
+    with _s3_io_lock:
+        executor, _s3_io_executor = _s3_io_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_s3_io_metrics() -> dict[str, Any]:
+    """S3 executor 동시성 지표를 반환한다."""
+    with _s3_io_lock:
+        stats = dict(_s3_io_stats)
+    finished = int(stats["completed"] + stats["failed"])
+    started = finished + int(stats["in_flight"])
+    return {
+        "max_workers": max(int(settings.AWS_S3_IO_MAX_WORKERS), 1),
+        "submitted": int(stats["submitted"]),
+        "completed": int(stats["completed"]),
+        "failed": int(stats["failed"]),
+        "waiting": int(stats["waiting"]),
+        "in_flight": int(stats["in_flight"]),
+        "peak_in_flight": int(stats["peak_in_flight"]),
+        "avg_wait_ms": round(stats["total_wait_seconds"] / started * 1000, 3) if started else 0.0,
+        "avg_run_ms": round(stats["total_run_seconds"] / finished * 1000, 3) if finished else 0.0,
+        "max_run_ms": round(stats["max_run_seconds"] * 1000, 3),
+    }
+
+
+class AsyncS3StreamingUpload:
+    """S3StreamingUpload의 async 래퍼. 모든 boto3 호출은 S3 executor에서 실행된다."""
+
+    def __init__(self, upload: S3StreamingUpload):
+        self._upload = upload
+
+    @classmethod
+    async def create(cls, s3_key: str, part_size: int | None = None) -> "AsyncS3StreamingUpload":
+        return cls(await run_s3_io(S3StreamingUpload, s3_key, part_size))
+
+    @property
+    def s3_key(self) -> str:
+        return self._upload.s3_key
+
+    @property
+    def bytes_written(self) -> int:
+        return self._upload.bytes_written
+
+    async def write(self, chunk: bytes) -> None:
+        await run_s3_io(self._upload.write, chunk)
+
+    async def complete(self) -> str:
+        return await run_s3_io(self._upload.complete)
+
+    async def abort(self) -> None:
+        await run_s3_io(self._upload.abort)
+
+
+async def generate_presigned_get_url_async(s3_key: str) -> str:
+    """generate_presigned_get_url의 non-blocking 버전."""
+    return await run_s3_io(generate_presigned_get_url, s3_key)
+
+
+async def delete_pdf_async(s3_key: str) -> None:
+    """delete_pdf의 non-blocking 버전."""
+    await run_s3_io(delete_pdf, s3_key)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_s3_client)
@@ -0,0 +1,272 @@
+"""업로드 PDF 저장소 백엔드 서비스.
+
+API는 업로드된 PDF를 저장소에 스트리밍으로 기록하고, Worker는 같은 저장소에서
+RunPod이 접근할 다운로드 URL을 발급받은 뒤 OCR이 끝나면 원본을 삭제한다.
+
+- s3: S3 multipart upload + presigned GET URL (기본값)
+- local: TEMP_PDF_DIR/pipeline/에 저장하고 /api/v1/temp-pdf/{file_id} HMAC 서명 URL로 제공.
+  API와 Worker가 같은 디스크(볼륨)를 공유하는 단일 노드 배포용. 임시 PDF TTL 정리 대상이 아니다.
+- memory: 프로세스 메모리에 보관. Worker 프로세스가 볼 수 없고 RunPod도 접근할 수 없으므로
+  eager 실행(CELERY_TASK_ALWAYS_EAGER)/벤치마크(BENCH_MODE) 전용. 그 외에는 시작 시 거부한다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, TypeVar
+
+from loguru import logger
+
+from app.config import settings
+from app.services.s3_service import (
+    S3StreamingUpload,
+    delete_pdf,
+    generate_presigned_get_url,
+    run_s3_io,
+)
+from app.services.temp_pdf_service import delete_pipeline_pdf, pipeline_pdf_path, sign_pipeline_pdf
+
+_T = TypeVar("_T")
+
+# SigV4 presigned URL의 최대 유효 기간 (7일)
+_S3_PRESIGNED_MAX_EXPIRES = 7 * 24 * 3600
+
+
+class PdfWriter(ABC):
+    """청크 단위 PDF 기록기. complete()는 다운로드 URL을 반환한다."""
+
+    bytes_written: int = 0
+
+    @abstractmethod
+    def write(self, chunk: bytes) -> None: ...
+
+    @abstractmethod
+    def complete(self) -> str: ...
+
+    @abstractmethod
+    def abort(self) -> None: ...
+
+
+class PdfStorageBackend(ABC):
+    name: str
+
+    @abstractmethod
+    def new_key(self) -> str:
+        """새 PDF를 저장할 키를 만든다."""
+
+    @abstractmethod
+    def open_writer(self, key: str) -> PdfWriter: ...
+
+    @abstractmethod
+    def get_download_url(self, key: str, *, expires_at: int | None = None) -> str:
+        """RunPod이 PDF를 내려받을 URL을 (재)발급한다. PDF가 없으면 FileNotFoundError.
+
+        expires_at: URL이 이 시각(epoch 초)까지 유효해야 할 때 (파이프라인 마감 시각). None이면 백엔드 기본 만료.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    async def run_io(self, fn: Callable[..., _T], *args: Any) -> _T:
+        """블로킹 I/O를 이벤트 루프 밖에서 실행한다."""
+        return await asyncio.to_thread(fn, *args)
+
+
+class AsyncPdfWriter:
+    """PdfWriter의 async 래퍼. 모든 호출은 백엔드의 run_io를 거친다."""
+
+    def __init__(self, backend: PdfStorageBackend, writer: PdfWriter):
+        self._backend = backend
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, backend: PdfStorageBackend, key: str) -> AsyncPdfWriter:
+        return cls(backend, await backend.run_io(backend.open_writer, key))
+
+    async def write(self, chunk: bytes) -> None:
+        await self._backend.run_io(self._writer.write, chunk)
+
+    async def complete(self) -> str:
+        return await self._backend.run_io(self._writer.complete)
+
+    async def abort(self) -> None:
+        await self._backend.run_io(self._writer.abort)
+
+
+# ---------------------------------------------------------------------------
+# S3
+# ---------------------------------------------------------------------------
+class S3PdfStorage(PdfStorageBackend):
+    name = "s3"
+
+    def new_key(self) -> str:
+        return f"uploads/{uuid.uuid4().hex}.pdf"
+
+    def open_writer(self, key: str) -> PdfWriter:
+        return S3StreamingUpload(key)
+
+    def get_download_url(self, key: str, *, expires_at: int | None = None) -> str:
+        if expires_at is None:
+            return generate_presigned_get_url(key)
+        expires_in = min(max(int(expires_at - time.time()), 1), _S3_PRESIGNED_MAX_EXPIRES)
+        return generate_presigned_get_url(key, expires_in)
+
+    def delete(self, key: str) -> None:
+        delete_pdf(key)
+
+    async def run_io(self, fn: Callable[..., _T], *args: Any) -> _T:
+        return await run_s3_io(fn, *args)
+
+
+PdfWriter.register(S3StreamingUpload)
+
+
+# ---------------------------------------------------------------------------
+# 로컬 디스크 + HMAC 서명 URL
+# ---------------------------------------------------------------------------
+class _LocalPdfWriter(PdfWriter):
+    def __init__(self, file_id: str):
+        self.file_id = file_id
+        self.bytes_written = 0
+        self._path = pipeline_pdf_path(file_id)
+        # 쓰는 중인 파일은 .part로 두어 cleanup/다운로드 대상에서 제외한다.
+        self._part_path = self._path.with_name(f"{self._path.name}.part")
+        self._fp = self._part_path.open("wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._fp.write(chunk)
+        self.bytes_written += len(chunk)
+
+    def complete(self) -> str:
+        self._fp.close()
+        os.replace(self._part_path, self._path)
+        return sign_pipeline_pdf(self.file_id).signed_url
+
+    def abort(self) -> None:
+        self._fp.close()
+        self._part_path.unlink(missing_ok=True)
+
+
+class LocalSignedUrlPdfStorage(PdfStorageBackend):
+    name = "local"
+
+    def new_key(self) -> str:
+        return uuid.uuid4().hex
+
+    def open_writer(self, key: str) -> PdfWriter:
+        return _LocalPdfWriter(key)
+
+    def get_download_url(self, key: str, *, expires_at: int | None = None) -> str:
+        return sign_pipeline_pdf(key, expires_at=expires_at).signed_url
+
+    def delete(self, key: str) -> None:
+        delete_pipeline_pdf(key)
+
+
+# ---------------------------------------------------------------------------
+# 프로세스 메모리
+# ---------------------------------------------------------------------------
+class _InMemoryPdfWriter(PdfWriter):
+    def __init__(self, storage: InMemoryPdfStorage, key: str):
+        self.bytes_written = 0
+        self._storage = storage
+        self._key = key
+        self._buffer = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        self._buffer += chunk
+        self.bytes_written += len(chunk)
+
+    def complete(self) -> str:
+        with self._storage._lock:
+            self._storage._objects[self._key] = bytes(self._buffer)
+        self._buffer.clear()
+        return self._storage.get_download_url(self._key)
+
+    def abort(self) -> None:
+        self._buffer.clear()
+
+
+class InMemoryPdfStorage(PdfStorageBackend):
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._objects: dict[str, bytes] = {}
+
+    def new_key(self) -> str:
+        return uuid.uuid4().hex
+
+    def open_writer(self, key: str) -> PdfWriter:
+        return _InMemoryPdfWriter(self, key)
+
+    def get_download_url(self, key: str, *, expires_at: int | None = None) -> str:
+        with self._lock:
+            if key not in self._objects:
+                raise FileNotFoundError(key)
+        return f"memory://{key}"
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._objects.pop(key, None)
+
+    def read(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._objects.get(key)
+
+    async def run_io(self, fn: Callable[..., _T], *args: Any) -> _T:
+        # 메모리 복사만 하므로 스레드 전환 비용이 더 크다.
+        return fn(*args)
+
+
+_BACKEND_TYPES: dict[str, type[PdfStorageBackend]] = {
+    S3PdfStorage.name: S3PdfStorage,
+    LocalSignedUrlPdfStorage.name: LocalSignedUrlPdfStorage,
+    InMemoryPdfStorage.name: InMemoryPdfStorage,
+}
+_backends: dict[str, PdfStorageBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_storage_backend(name: str | None = None) -> PdfStorageBackend:
+    """이름(기본: settings.PDF_STORAGE_BACKEND)에 해당하는 저장소 백엔드를 반환한다."""
+    backend_name = (name or settings.PDF_STORAGE_BACKEND).strip().lower()
+    backend = _backends.get(backend_name)
+    if backend is not None:
+        return backend
+    with _backends_lock:
+        if backend_name not in _backends:
+            backend_type = _BACKEND_TYPES.get(backend_name)
+            if backend_type is None:
+                raise ValueError(
+                    f"지원하지 않는 PDF_STORAGE_BACKEND입니다: {backend_name} "
+                    f"(허용: {', '.join(sorted(_BACKEND_TYPES))})"
+                )
+            _backends[backend_name] = backend_type()
+        return _backends[backend_name]
+
+
+def check_storage_backend_settings() -> None:
+    """API/Worker 시작 시 PDF_STORAGE_BACKEND 설정을 검사한다.
+
+    memory 백엔드는 API 프로세스 메모리에만 있어 Worker가 업로드를 읽을 수 없으므로
+    CELERY_TASK_ALWAYS_EAGER 또는 BENCH_MODE일 때만 허용한다. 설정이 잘못됐으면 RuntimeError.
+    s3 백엔드인데 AWS_S3_BUCKET이 비어 있으면 경고만 남긴다 (업로드 요청은 503으로 거절된다).
+    """
+    try:
+        backend = get_storage_backend()
+    except ValueError as exc:
+        raise RuntimeError(str(exc)) from exc
+    if backend.name == InMemoryPdfStorage.name and not (
+        settings.CELERY_TASK_ALWAYS_EAGER or settings.BENCH_MODE
+    ):
+        raise RuntimeError(
+            "PDF_STORAGE_BACKEND=memory는 CELERY_TASK_ALWAYS_EAGER 또는 BENCH_MODE에서만 사용할 수 있습니다"
+        )
+    if backend.name == S3PdfStorage.name and not settings.AWS_S3_BUCKET:
+        logger.bind(event="s3_not_configured").warning("PDF_STORAGE_BACKEND=s3인데 AWS_S3_BUCKET이 비어 있습니다")
@@ -1,4 +1,10 @@
-"""임시 PDF 저장/서명 URL/만료 정리 서비스."""
+"""임시 PDF 저장/서명 URL/만료 정리 서비스.
+
+TEMP_PDF_DIR 바로 아래 파일은 TEMP_PDF_TTL_SECONDS가 지나면 정리한다.
+PDF_STORAGE_BACKEND=local로 파이프라인이 소유한 PDF는 pipeline/ 하위 디렉터리에 두어 TTL 정리에서 제외한다.
+이 파일은 파이프라인이 끝날 때(release_storage) 지우며, 서명 URL은 파이프라인 마감 시각까지 유효하다.
+worker 비정상 종료 등으로 남은 파일만 TEMP_PDF_PIPELINE_MAX_AGE_SECONDS가 지나면 정리한다.
+"""
 
 from __future__ import annotations
 
@@ -24,12 +30,21 @@ class TempPdfInfo:
     signed_url: str
 
 
+_PIPELINE_SUBDIR = "pipeline"
+
+
 def _temp_dir() -> Path:
     path = Path(settings.TEMP_PDF_DIR)
     path.mkdir(parents=True, exist_ok=True)
     return path
 
 
+def _pipeline_dir() -> Path:
+    path = _temp_dir() / _PIPELINE_SUBDIR
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def _signing_key() -> bytes:
     key = settings.TEMP_PDF_SIGNING_KEY or settings.RUNPOD_API_KEY
     if not key:
@@ -52,26 +67,66 @@ def _build_signed_url(file_id: str, expires_at: int, signature: str) -> str:
     )
 
 
-def cleanup_expired_temp_pdfs() -> int:
-    """TTL이 지난 임시 PDF 파일을 정리한다."""
-    ttl_seconds = max(int(settings.TEMP_PDF_TTL_SECONDS), 1)
-    now = int(time.time())
+def _remove_older_than(directory: Path, max_age_seconds: int, now: int) -> int:
     removed = 0
-
-    for path in _temp_dir().glob("*.pdf"):
+    for path in directory.glob("*.pdf"):
         try:
             age = now - int(path.stat().st_mtime)
-            if age > ttl_seconds:
+            if age > max_age_seconds:
                 path.unlink(missing_ok=True)
                 removed += 1
         except FileNotFoundError:
             continue
         except Exception as exc:
             logger.warning(f"임시 PDF 정리 실패 - path={path}, error={exc}")
+    return removed
 
+
+def cleanup_expired_temp_pdfs() -> int:
+    """TTL이 지난 임시 PDF와, 파이프라인이 지우지 못하고 남긴 오래된 PDF를 정리한다."""
+    now = int(time.time())
+    removed = _remove_older_than(_temp_dir(), max(int(settings.TEMP_PDF_TTL_SECONDS), 1), now)
+    removed += _remove_older_than(
+        _pipeline_dir(), max(int(settings.TEMP_PDF_PIPELINE_MAX_AGE_SECONDS), 1), now
+    )
     return removed
 
 
+def temp_pdf_path(file_id: str) -> Path:
+    """file_id에 해당하는 임시 PDF 경로를 반환한다."""
+    return _temp_dir() / f"{file_id}.pdf"
+
+
+def pipeline_pdf_path(file_id: str) -> Path:
+    """파이프라인이 소유한 PDF 경로 (TTL 정리 대상 아님)."""
+    return _pipeline_dir() / f"{file_id}.pdf"
+
+
+def sign_pipeline_pdf(file_id: str, *, expires_at: int | None = None) -> TempPdfInfo:
+    """파이프라인 소유 PDF에 서명된 URL을 발급한다.
+
+    expires_at(기본: 지금 + TEMP_PDF_TTL_SECONDS)까지 URL이 유효하다. 파일 mtime도 갱신해
+    비정상 종료로 남은 파일 정리 기준을 마지막 발급 시점으로 옮긴다. 파일이 없으면 FileNotFoundError.
+    """
+    path = pipeline_pdf_path(file_id)
+    now = int(time.time())
+    os.utime(path, (now, now))
+
+    if expires_at is None:
+        expires_at = now + max(int(settings.TEMP_PDF_TTL_SECONDS), 1)
+    signature = _build_signature(file_id, expires_at)
+    return TempPdfInfo(
+        file_id=file_id,
+        path=path,
+        expires_at=expires_at,
+        signed_url=_build_signed_url(file_id, expires_at, signature),
+    )
+
+
+def delete_pipeline_pdf(file_id: str) -> None:
+    pipeline_pdf_path(file_id).unlink(missing_ok=True)
+
+
 def save_temp_pdf(pdf_bytes: bytes) -> TempPdfInfo:
     """임시 PDF를 저장하고 서명된 다운로드 URL을 반환한다."""
     cleanup_expired_temp_pdfs()
@@ -102,16 +157,15 @@ def resolve_temp_pdf_path(file_id: str, *, expires_at: int, signature: str) -> P
 
     now = int(time.time())
     if expires_at < now:
-        # 만료된 URL 접근 시 즉시 파일 정리 시도
-        expired_path = _temp_dir() / f"{file_id}.pdf"
-        expired_path.unlink(missing_ok=True)
+        # 만료된 URL 접근 시 즉시 파일 정리 시도 (파이프라인 소유 PDF는 파이프라인이 지운다)
+        temp_pdf_path(file_id).unlink(missing_ok=True)
         raise PermissionError("expired")
 
     expected_signature = _build_signature(file_id, expires_at)
     if not hmac.compare_digest(signature, expected_signature):
         raise PermissionError("invalid_signature")
 
-    path = _temp_dir() / f"{file_id}.pdf"
-    if not path.exists():
-        raise FileNotFoundError(file_id)
-    return path
+    for path in (pipeline_pdf_path(file_id), temp_pdf_path(file_id)):
+        if path.exists():
+            return path
+    raise FileNotFoundError(file_id)
@@ -0,0 +1,64 @@
+"""app/test 벤치마크 / 동작 확인 스크립트 공통 도구.
+
+각 벤치마크는 build_parser()로 인자를 정의하고 run_benchmark(args)로 측정한 뒤
+run_bench(build_parser(), run_benchmark)로 실행한다.
+동작 확인 스크립트는 실패 메시지 목록을 돌려주는 check 함수들을 run_checks로 실행한다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+
+def percentile(values: Iterable[float], ratio: float) -> float:
+    """ratio(0~1) 위치의 값 (nearest-rank)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(int(round(len(ordered) * ratio)) - 1, 0))]
+
+
+def elapsed_ms(started: float) -> float:
+    """time.perf_counter() 기준 started부터 지난 시간(ms)."""
+    return (time.perf_counter() - started) * 1000
+
+
+def quiet_logs(level: str = "INFO") -> None:
+    """앱 로그를 stderr의 level 이상으로만 남겨 벤치마크 출력과 섞이지 않게 한다."""
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level=level)
+
+
+def load_result_file(path: str) -> Any:
+    """측정에 쓸 완료 결과 JSON (기본 mock_output.json)."""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def add_result_file_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--result-file", default="mock_output.json", help="측정에 쓸 완료 결과 JSON")
+
+
+def run_bench(
+    parser: argparse.ArgumentParser, benchmark: Callable[[argparse.Namespace], int | None]
+) -> int:
+    """인자를 읽어 benchmark를 실행하고 종료 코드를 반환한다 (None이면 0)."""
+    code = benchmark(parser.parse_args())
+    return 0 if code is None else code
+
+
+def run_checks(checks: Iterable[Callable[[], list[str]]]) -> int:
+    """check 함수(실패 메시지 목록 반환)를 차례로 실행해 결과를 출력하고 종료 코드를 반환한다."""
+    passed = True
+    for check in checks:
+        failures = check()
+        print(f"{'ok' if not failures else 'FAIL':<5} {check.__name__}")
+        for failure in failures:
+            print(f"  {failure}")
+        passed = passed and not failures
+    print("PASS" if passed else "FAIL")
+    return 0 if passed else 1
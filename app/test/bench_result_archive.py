@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""완료 결과 장기 보관소(SQLite) 조회 지연 벤치마크.
+
+임시 파일에 결과를 --rows건 채운 뒤 task_id 조회, PDF 해시 조회, 없는 task 조회의
+p50/p99 지연을 출력한다. 보관 건수를 바꿔 가며 실행하면 조회 시간이 건수와 무관한지 확인할 수 있다.
+
+예시:
+    python -m app.test.bench_result_archive
+    python -m app.test.bench_result_archive --rows 1000000 --lookups 20000
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from app.test.bench_common import (
+    add_result_file_arg,
+    elapsed_ms,
+    load_result_file,
+    percentile,
+    quiet_logs,
+    run_bench,
+)
+
+
+def _timed(fn, keys: list) -> list[float]:
+    latencies = []
+    for key in keys:
+        started = time.perf_counter()
+        fn(*key)
+        latencies.append(elapsed_ms(started))
+    return latencies
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    from app.config import settings
+    from app.services import result_archive_service as archive
+
+    quiet_logs()
+    settings.RESULT_ARCHIVE_PATH = str(Path(tempfile.mkdtemp(prefix="bench-archive-")) / "archive.sqlite3")
+    result = load_result_file(args.result_file)
+
+    rng = random.Random(args.seed)
+    data = archive._encode(result)
+    rows = []
+    for index in range(args.rows):
+        digest = hashlib.sha256(str(index).encode()).hexdigest()
+        rows.append((str(uuid.UUID(int=rng.getrandbits(128))), digest, "KR", time.time() - index, data))
+
+    started = time.perf_counter()
+    conn = archive._connection()
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO results (task_id, pdf_sha256, country, completed_at, result) VALUES (?, ?, ?, ?, ?)", rows
+    )
+    conn.execute("COMMIT")
+    size_mb = Path(settings.RESULT_ARCHIVE_PATH).stat().st_size / 1024 / 1024
+    print(f"rows={args.rows} load={time.perf_counter() - started:.1f}s file={size_mb:.1f}MB lookups={args.lookups}")
+
+    sample = [rows[rng.randrange(len(rows))] for _ in range(args.lookups)]
+    cases = {
+        "task_id": _timed(archive.get_archived_result, [(row[0],) for row in sample]),
+        "digest": _timed(archive.find_archived_result, [(row[1], row[2]) for row in sample]),
+        "miss": _timed(archive.get_archived_result, [(str(uuid.uuid4()),) for _ in sample]),
+    }
+    for name, latencies in cases.items():
+        print(f"{name:<8} p50={percentile(latencies, 0.5):.3f}ms p99={percentile(latencies, 0.99):.3f}ms")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="완료 결과 장기 보관소 조회 지연")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    add_result_file_arg(parser)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(run_bench(build_parser(), run_benchmark))
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""GET /api/v1/result/{task_id} 처리량 벤치마크 (AsyncResult 동기 조회 vs async 메타 단일 조회).
+
+Redis에 진행 중 / 완료 / 실패 task 메타를 --tasks건 넣고, API 앱을 프로세스 안에서(httpx ASGI transport)
+--concurrency개 동시 요청으로 --requests번 호출해 초당 요청 수와 p50/p99 지연을 출력한다.
+
+- asyncresult: 기존 구현. AsyncResult.state / info가 이벤트 루프에서 동기 Redis GET + decode를 한다.
+- async: 현재 구현. async Redis 연결 풀로 메타를 요청당 한 번 읽는다 (load_task_meta).
+  completed 결과는 응답 캐시에서 바로 보낸다 (--no-result-cache로 끌 수 있다).
+
+실제 Redis가 필요하다 (REDIS_URL). 벤치용 키는 끝나면 지운다.
+
+예시:
+    python -m app.test.bench_result_endpoint
+    python -m app.test.bench_result_endpoint --concurrency 64 --requests 5000 --modes async
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+from app.test.bench_common import (
+    add_result_file_arg,
+    elapsed_ms,
+    load_result_file,
+    percentile,
+    quiet_logs,
+    run_bench,
+)
+
+
+def _build_app(mode: str):
+    from celery.result import AsyncResult
+    from fastapi import FastAPI
+
+    from app.api import routes
+    from app.worker.celery_app import celery_app
+
+    app = FastAPI()
+    if mode == "async":
+        app.include_router(routes.router, prefix="/api/v1")
+        return app
+
+    @app.get("/api/v1/result/{task_id}")
+    async def legacy_get_result(task_id: str):
+        uuid.UUID(task_id)
+        task = AsyncResult(task_id, app=celery_app)
+        if task.state == "PENDING":
+            archived = await routes.get_archived_result_async(task_id)
+            if archived is not None:
+                return routes._build_result_response(task_id, "SUCCESS", archived.result)
+        return routes._build_result_response(task_id, task.state, task.info)
+
+    return app
+
+
+def _seed_metas(task_ids: list[str], result: dict) -> None:
+    from app.worker.celery_app import celery_app
+
+    backend = celery_app.backend
+    for index, task_id in enumerate(task_ids):
+        kind = index % 4
+        if kind == 0:
+            backend.store_result(task_id, {"msg": "JDPatent 결과 대기 중"}, "JDPATENT_PROCESSING")
+        elif kind == 1:
+            backend.store_result(task_id, {"msg": "PDF 파싱 중", "progress": {"pages_done": 3}}, "PARSING")
+        elif kind == 2:
+            backend.store_result(task_id, result, "SUCCESS")
+        else:
+            backend.store_result(task_id, RuntimeError("not_a_patent_document"), "FAILURE")
+
+
+async def _run_mode(mode: str, task_ids: list[str], args: argparse.Namespace) -> None:
+    import httpx
+
+    from app.services.progress_stream_service import close_task_event_hub
+    from app.services.redis_service import close_async_redis
+
+    app = _build_app(mode)
+    latencies: list[float] = []
+    errors = 0
+    next_index = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def _worker(count: int) -> None:
+            nonlocal errors, next_index
+            for _ in range(count):
+                task_id = task_ids[next_index % len(task_ids)]
+                next_index += 1
+                started = time.perf_counter()
+                response = await client.get(f"/api/v1/result/{task_id}")
+                latencies.append(elapsed_ms(started))
+                if response.status_code != 200:
+                    errors += 1
+
+        await _worker(min(args.warmup, args.requests))
+        latencies.clear()
+        per_worker = max(args.requests // args.concurrency, 1)
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker(per_worker) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await close_task_event_hub()
+    await close_async_redis()
+    print(
+        f"{mode:<12} rps={len(latencies) / elapsed:8.1f}  p50={percentile(latencies, 0.5):7.2f}ms  "
+        f"p99={percentile(latencies, 0.99):7.2f}ms  n={len(latencies)} errors={errors}"
+    )
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    from app.config import settings
+    from app.services.redis_service import get_redis
+
+    quiet_logs("WARNING")
+    if args.redis_url:
+        settings.REDIS_URL = args.redis_url
+    settings.RESULT_ARCHIVE_ENABLED = False
+    settings.RESULT_CACHE_ENABLED = not args.no_result_cache
+
+    result = load_result_file(args.result_file)
+    task_ids = [str(uuid.uuid4()) for _ in range(args.tasks)]
+    _seed_metas(task_ids, result)
+    print(
+        f"tasks={args.tasks} requests={args.requests} concurrency={args.concurrency} "
+        f"result_file={args.result_file}"
+    )
+    try:
+        for mode in args.modes:
+            asyncio.run(_run_mode(mode, task_ids, args))
+    finally:
+        get_redis().delete(*[f"celery-task-meta-{task_id}" for task_id in task_ids])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="GET /result 처리량 (AsyncResult vs async 메타 조회)")
+    parser.add_argument("--modes", nargs="+", choices=["asyncresult", "async"], default=["asyncresult", "async"])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=50)
+    add_result_file_arg(parser)
+    parser.add_argument("--redis-url", default=None, help="기본값은 settings.REDIS_URL")
+    parser.add_argument("--no-result-cache", action="store_true", help="completed 응답 캐시를 끄고 측정")
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(run_bench(build_parser(), run_benchmark))
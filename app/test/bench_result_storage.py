@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""완료 결과 메타의 Redis 저장 크기와 encode/decode 시간 비교 (JSON 그대로 / gzip / blob 외부 저장).
+
+result_store_service.encode_task_meta로 celery-task-meta 값을 만들고, Redis에 남는 바이트 수와
+결과를 다시 읽는 데 걸리는 시간을 출력한다. blob은 임시 디렉터리(local 백엔드)에 쓴다. Redis는 쓰지 않는다.
+
+예시:
+    python -m app.test.bench_result_storage
+    python -m app.test.bench_result_storage --result-file mock_output.json --repeat 200 --scale 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+
+from app.test.bench_common import add_result_file_arg, elapsed_ms, load_result_file, quiet_logs, run_bench
+
+
+def _meta_payload(result: dict, task_id: str) -> str:
+    # Celery json 직렬화와 같은 형태 (ensure_ascii 기본값)
+    return json.dumps(
+        {
+            "status": "SUCCESS",
+            "result": result,
+            "traceback": None,
+            "children": [],
+            "date_done": "2026-01-01T00:00:00+00:00",
+            "task_id": task_id,
+        }
+    )
+
+
+def _measure(label: str, payload: str, repeat: int) -> None:
+    from app.services.result_store_service import decode_task_meta, encode_task_meta
+
+    encode_ms, decode_ms = [], []
+    stored: str | bytes = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        stored = encode_task_meta(payload)
+        encode_ms.append(elapsed_ms(started))
+        started = time.perf_counter()
+        decode_task_meta(stored)
+        decode_ms.append(elapsed_ms(started))
+    size = len(stored.encode("utf-8") if isinstance(stored, str) else stored)
+    print(
+        f"{label:<9} redis={size:7d}B  ratio={len(payload) / size:6.1f}x  "
+        f"encode p50={statistics.median(encode_ms):6.3f}ms  decode p50={statistics.median(decode_ms):6.3f}ms"
+    )
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    from app.config import settings
+
+    quiet_logs()
+
+    result = load_result_file(args.result_file)
+    if args.scale > 1 and isinstance(result, dict):
+        # 추천 기업 / NAICS 후보가 많은 큰 결과를 흉내 낸다.
+        result = {**result, "_scaled": [result] * (args.scale - 1)}
+    payload = _meta_payload(result, "bench-task")
+    print(f"result_file={args.result_file} scale={args.scale} payload={len(payload)}B repeat={args.repeat}")
+
+    settings.RESULT_OFFLOAD_DIR = tempfile.mkdtemp(prefix="bench-results-")
+    settings.RESULT_OFFLOAD_BACKEND = "local"
+
+    settings.RESULT_COMPRESSION_ENABLED = False
+    _measure("json", payload, args.repeat)
+
+    settings.RESULT_COMPRESSION_ENABLED = True
+    settings.RESULT_OFFLOAD_ENABLED = False
+    _measure("gzip", payload, args.repeat)
+
+    settings.RESULT_OFFLOAD_ENABLED = True
+    settings.RESULT_OFFLOAD_MIN_BYTES = 0
+    _measure("offload", payload, args.repeat)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="완료 결과 메타 저장 방식별 Redis 크기 비교")
+    add_result_file_arg(parser)
+    parser.add_argument("--scale", type=int, default=1, help="결과를 N배로 키워 측정")
+    parser.add_argument("--repeat", type=int, default=100)
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(run_bench(build_parser(), run_benchmark))
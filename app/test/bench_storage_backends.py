@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""PDF 저장소 백엔드별 /api/v1/analyze enqueue 지연 시간 벤치마크.
+
+API 앱을 프로세스 안에서 띄우고(TestClient) PDF_STORAGE_BACKEND만 바꿔 가며
+업로드 수신 → 저장소 기록 → URL 발급 → task 큐 등록까지의 응답 시간을 측정한다.
+
+예시:
+    python -m app.test.bench_storage_backends --backends memory local s3 --sizes-kb 64 2048 20480
+    python -m app.test.bench_storage_backends --enqueue broker   # 실제 Redis broker로 큐 등록
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from unittest import mock
+
+from app.test.bench_common import elapsed_ms, percentile, run_bench
+
+
+@dataclass
+class BenchResult:
+    backend: str
+    size_kb: int
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    note: str = ""
+
+    def summary(self) -> str:
+        if not self.latencies_ms:
+            return f"{self.backend:<7} {self.size_kb:>8}KB  skipped ({self.note or 'no samples'})"
+        latencies = self.latencies_ms
+        return (
+            f"{self.backend:<7} {self.size_kb:>8}KB  n={len(latencies):<4} "
+            f"mean={statistics.fmean(latencies):8.2f}ms  p50={statistics.median(latencies):8.2f}ms  "
+            f"p95={percentile(latencies, 0.95):8.2f}ms  errors={self.errors}"
+        )
+
+
+def _make_pdf(size_kb: int) -> bytes:
+    header = b"%PDF-1.7\n"
+    # 사전 검사(preflight)에서 잘린 파일로 거절되지 않도록 trailer를 붙인다.
+    trailer = b"\nstartxref\n0\n%%EOF\n"
+    # 매 요청 내용이 달라야 중복 제거/캐시의 영향을 받지 않는다.
+    body = os.urandom(max(size_kb * 1024 - len(header) - len(trailer), 0))
+    return header + body + trailer
+
+
+def _run_backend(client, backend: str, size_kb: int, iterations: int, warmup: int) -> BenchResult:
+    from app.config import settings
+
+    result = BenchResult(backend=backend, size_kb=size_kb)
+    settings.PDF_STORAGE_BACKEND = backend
+
+    for i in range(warmup + iterations):
+        pdf_bytes = _make_pdf(size_kb)
+        started = time.perf_counter()
+        response = client.post(
+            "/api/v1/analyze",
+            files={"file": ("bench.pdf", pdf_bytes, "application/pdf")},
+            data={"country": "KR"},
+        )
+        latency_ms = elapsed_ms(started)
+        if response.status_code != 202:
+            result.errors += 1
+            result.note = f"http={response.status_code} {response.text[:120]}"
+            if i == 0:
+                # 첫 요청부터 실패하면 자격 증명/설정 문제이므로 해당 백엔드는 건너뛴다.
+                return result
+            continue
+        if i >= warmup:
+            result.latencies_ms.append(latency_ms)
+
+    return result
+
+
+def run_benchmark(args: argparse.Namespace) -> int:
+    from fastapi.testclient import TestClient
+
+    from app.config import settings
+    from app.main import app
+    from app.worker.tasks import process_patent
+
+    settings.DEDUP_ENABLED = False
+    settings.BENCH_MODE = True
+    original_backend = settings.PDF_STORAGE_BACKEND
+    print(
+        f"backends={args.backends} sizes_kb={args.sizes_kb} "
+        f"iterations={args.iterations} warmup={args.warmup} enqueue={args.enqueue}"
+    )
+
+    class _FakeAsyncResult:
+        def __init__(self, task_id: str | None):
+            self.id = task_id
+
+    def _fake_apply_async(*_args, task_id=None, **_kwargs):
+        return _FakeAsyncResult(task_id)
+
+    patcher = (
+        mock.patch.object(process_patent, "apply_async", side_effect=_fake_apply_async)
+        if args.enqueue == "mock"
+        else None
+    )
+
+    results: list[BenchResult] = []
+    try:
+        if patcher is not None:
+            patcher.start()
+        with TestClient(app, raise_server_exceptions=False) as client:
+            for backend in args.backends:
+                for size_kb in args.sizes_kb:
+                    result = _run_backend(client, backend, size_kb, args.iterations, args.warmup)
+                    print(result.summary())
+                    results.append(result)
+    finally:
+        if patcher is not None:
+            patcher.stop()
+        settings.PDF_STORAGE_BACKEND = original_backend
+
+    return 0 if all(r.latencies_ms for r in results) else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="PDF_STORAGE_BACKEND(s3/local/memory)별 /api/v1/analyze enqueue 지연 시간 비교"
+    )
+    parser.add_argument("--backends", nargs="+", default=["memory", "local", "s3"])
+    parser.add_argument("--sizes-kb", nargs="+", type=int, default=[64, 2048, 20480])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument(
+        "--enqueue",
+        choices=["mock", "broker"],
+        default="mock",
+        help="mock: 큐 등록 호출을 대체해 저장소 구간만 측정, broker: 설정된 Redis broker에 실제 등록",
+    )
+    return parser
+
+
+if __name__ == "__main__":
+    sys.exit(run_bench(build_parser(), run_benchmark))
@@ -13,6 +13,9 @@ from typing import Any
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+# POST /api/v1/results 한 번에 보낼 task 수 (서버 RESULTS_BULK_MAX_TASKS 기본값)
+_BULK_RESULT_CHUNK = 500
+
 
 @dataclass
 class TestCase:
@@ -71,7 +74,7 @@ def _request_json(
     method: str,
     url: str,
     *,
-    timeout: int,
+    timeout: float,
     headers: dict[str, str] | None = None,
     data: bytes | None = None,
 ) -> tuple[int, dict[str, Any]]:
@@ -176,11 +179,35 @@ def _evaluate_result(run: CaseRun) -> None:
     run.note = f"expected={'success' if expected else 'failure'}, actual_status={run.final_status}"
 
 
+def _fetch_bulk_results(
+    results_url: str, task_ids: list[str], *, timeout: float
+) -> dict[str, tuple[int, dict[str, Any]]]:
+    """POST /results로 여러 task 상태를 조회해 task_id별 (http status, GET /result와 같은 payload)로 돌려준다."""
+    out: dict[str, tuple[int, dict[str, Any]]] = {}
+    for start in range(0, len(task_ids), _BULK_RESULT_CHUNK):
+        chunk = task_ids[start : start + _BULK_RESULT_CHUNK]
+        status_code, payload = _request_json(
+            "POST",
+            results_url,
+            timeout=timeout,
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+            data=json.dumps({"task_ids": chunk, "include_result": True}).encode("utf-8"),
+        )
+        results = payload.get("results") if status_code == 200 else None
+        if not isinstance(results, dict):
+            print(f"[POLL-FAIL] POST /results http={status_code} payload={json.dumps(payload, ensure_ascii=False)}")
+            continue
+        for task_id, item in results.items():
+            out[task_id] = (status_code, {"task_id": task_id, **item})
+    return out
+
+
 def run_tests(
     *,
     base_url: str,
     test_root: Path,
     poll_interval: float,
+    wait_seconds: float,
     max_wait_seconds: int,
     request_timeout_seconds: int,
 ) -> int:
@@ -194,6 +221,7 @@ def run_tests(
 
     analyze_url = f"{base_url.rstrip('/')}/api/v1/analyze"
     result_base = f"{base_url.rstrip('/')}/api/v1/result"
+    results_url = f"{base_url.rstrip('/')}/api/v1/results"
 
     for run in runs:
         body, content_type = _build_multipart_body(run.case.pdf_path, run.case.country)
@@ -226,15 +254,28 @@ def run_tests(
     deadline = time.time() + max_wait_seconds
 
     while pending and time.time() < deadline:
+        bulk: dict[str, tuple[int, dict[str, Any]]] = {}
+        if wait_seconds <= 0:
+            # 고정 간격 폴링은 대기 중인 task 전체를 POST /results 한 번으로 조회한다.
+            bulk = _fetch_bulk_results(
+                results_url, [r.task_id for r in pending if r.task_id], timeout=request_timeout_seconds
+            )
+
         next_pending: list[CaseRun] = []
         for run in pending:
-            result_url = f"{result_base}/{run.task_id}"
-            status_code, payload = _request_json(
-                "GET",
-                result_url,
-                timeout=request_timeout_seconds,
-                headers={"Accept": "application/json"},
-            )
+            if wait_seconds <= 0:
+                status_code, payload = bulk.get(run.task_id or "", (0, {}))
+            else:
+                result_url = f"{result_base}/{run.task_id}"
+                if run.status_history:
+                    # long-poll: 마지막으로 본 상태에서 바뀔 때까지 서버가 응답을 보류한다.
+                    result_url += f"?wait={wait_seconds:g}&since={run.status_history[-1]}"
+                status_code, payload = _request_json(
+                    "GET",
+                    result_url,
+                    timeout=request_timeout_seconds + wait_seconds,
+                    headers={"Accept": "application/json"},
+                )
 
             status = _status_of(payload)
             if not run.status_history or run.status_history[-1] != status:
@@ -249,7 +290,7 @@ def run_tests(
                 next_pending.append(run)
 
         pending = next_pending
-        if pending:
+        if pending and wait_seconds <= 0:
             time.sleep(poll_interval)
 
     for run in pending:
@@ -306,7 +347,13 @@ def parse_args() -> argparse.Namespace:
         "--poll-interval",
         type=float,
         default=2.0,
-        help="result 폴링 간격(초), default=2.0",
+        help="result 폴링 간격(초, --wait-seconds 0일 때), default=2.0",
+    )
+    parser.add_argument(
+        "--wait-seconds",
+        type=float,
+        default=25.0,
+        help="result long-poll 대기(초). 0이면 --poll-interval 간격으로 POST /results 일괄 조회, default=25",
     )
     parser.add_argument(
         "--max-wait-seconds",
@@ -329,6 +376,7 @@ def main() -> int:
         base_url=args.base_url,
         test_root=Path(args.test_root).resolve(),
         poll_interval=args.poll_interval,
+        wait_seconds=args.wait_seconds,
         max_wait_seconds=args.max_wait_seconds,
         request_timeout_seconds=args.request_timeout_seconds,
     )
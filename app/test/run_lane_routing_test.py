@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""처리 lane 선택과 lane별 큐 라우팅 동작 확인.
+
+- 사전 검사 lane: PREFLIGHT_SMALL_MAX_PAGES 이하 small, PREFLIGHT_LARGE_MIN_PAGES 이상 large,
+  페이지 수를 모르면 PREFLIGHT_LARGE_MIN_BYTES 기준.
+- 분석 lane: priority(low → large, high → large가 아니면 small), 페이지 수를 모르는 작은 KR 공보 → small.
+- celery_app router: 진입 task(kwargs)와 단계 task(context)가 같은 lane의 큐로 가고,
+  작은 문서의 큐는 큰 문서의 큐와 겹치지 않는다. LANE_ROUTING_ENABLED=false이면 기존 큐로만 간다.
+
+Celery broker / Redis는 쓰지 않는다.
+
+예시:
+    python -m app.test.run_lane_routing_test
+"""
+from __future__ import annotations
+
+import sys
+
+from app.test.bench_common import run_checks
+
+_MB = 1024 * 1024
+_STAGE_TASK = "app.worker.tasks.check_ocr_status"
+_ENTRY_TASK = "app.worker.tasks.process_patent"
+
+
+def _expect(failures: list[str], label: str, actual, expected) -> None:
+    if actual != expected:
+        failures.append(f"{label}: expected {expected!r}, got {actual!r}")
+
+
+def check_preflight_lane() -> list[str]:
+    from app.config import settings
+    from app.services.pdf_preflight_service import choose_processing_lane
+
+    small, large = settings.PREFLIGHT_SMALL_MAX_PAGES, settings.PREFLIGHT_LARGE_MIN_PAGES
+    failures: list[str] = []
+    _expect(failures, "small 경계", choose_processing_lane(small, _MB), "small")
+    _expect(failures, "standard 하한", choose_processing_lane(small + 1, _MB), "standard")
+    _expect(failures, "standard 상한", choose_processing_lane(large - 1, _MB), "standard")
+    _expect(failures, "large 경계", choose_processing_lane(large, _MB), "large")
+    _expect(failures, "페이지 수 모름, 작은 파일", choose_processing_lane(None, _MB), "standard")
+    _expect(failures, "페이지 수 모름, 큰 파일", choose_processing_lane(None, settings.PREFLIGHT_LARGE_MIN_BYTES), "large")
+    return failures
+
+
+def check_analysis_lane() -> list[str]:
+    from app.config import settings
+    from app.services.lane_service import choose_analysis_lane
+
+    small_file = settings.LANE_SMALL_MAX_BYTES_WITHOUT_PAGES
+    failures: list[str] = []
+    cases = [
+        ("priority=low", ("small", 3, _MB, "KR", "low"), "large"),
+        ("priority=high", ("standard", 40, _MB, "KR", "high"), "small"),
+        ("priority=high여도 large 유지", ("large", 200, 40 * _MB, "KR", "high"), "large"),
+        ("페이지 수 모르는 작은 KR 공보", ("standard", None, small_file, "KR", None), "small"),
+        ("페이지 수 모르는 작은 US 문서", ("standard", None, small_file, "US", None), "standard"),
+        ("페이지 수 모르는 큰 KR 문서", ("standard", None, small_file + 1, "KR", None), "standard"),
+        ("알 수 없는 lane", ("unknown", 40, _MB, "KR", None), "standard"),
+    ]
+    for label, (preflight, pages, size, country, priority), expected in cases:
+        lane = choose_analysis_lane(preflight, page_count=pages, file_size=size, country=country, priority=priority)
+        _expect(failures, label, lane, expected)
+
+    original = settings.LANE_ROUTING_ENABLED
+    settings.LANE_ROUTING_ENABLED = False
+    try:
+        lane = choose_analysis_lane("small", page_count=3, file_size=_MB, country="KR", priority="low")
+        _expect(failures, "LANE_ROUTING_ENABLED=false", lane, "small")
+    finally:
+        settings.LANE_ROUTING_ENABLED = original
+    return failures
+
+
+def check_task_routing() -> list[str]:
+    from app.config import settings
+    from app.services.lane_service import LANES, lane_queues
+    from app.worker.celery_app import route_pipeline_task
+
+    def route(name: str, lane: str | None) -> str | None:
+        if name == _ENTRY_TASK:
+            routed = route_pipeline_task(name, (None,), {"processing_lane": lane}, {})
+        else:
+            routed = route_pipeline_task(name, ({"task_id": "t", "processing_lane": lane},), {}, {})
+        return routed["queue"] if routed else None
+
+    failures: list[str] = []
+    queues = lane_queues()
+    for lane in LANES:
+        _expect(failures, f"{lane} 진입 task", route(_ENTRY_TASK, lane), queues[lane]["queue"])
+        _expect(failures, f"{lane} 단계 task", route(_STAGE_TASK, lane), queues[lane]["stage_queue"])
+    _expect(failures, "lane 없는 진입 task", route(_ENTRY_TASK, None), queues["standard"]["queue"])
+    _expect(failures, "파이프라인 밖 task", route_pipeline_task("app.other", (), {}, {}), None)
+
+    small = {queues["small"]["queue"], queues["small"]["stage_queue"]}
+    large = {queues["large"]["queue"], queues["large"]["stage_queue"]}
+    if small & large:
+        failures.append(f"small과 large lane이 큐를 나눠 쓴다: {small & large}")
+
+    original = settings.LANE_ROUTING_ENABLED
+    settings.LANE_ROUTING_ENABLED = False
+    try:
+        _expect(failures, "비활성 시 large 진입 task", route(_ENTRY_TASK, "large"), queues["standard"]["queue"])
+        _expect(failures, "비활성 시 small 단계 task", route(_STAGE_TASK, "small"), queues["standard"]["stage_queue"])
+    finally:
+        settings.LANE_ROUTING_ENABLED = original
+    return failures
+
+
+_CHECKS = (check_preflight_lane, check_analysis_lane, check_task_routing)
+
+
+if __name__ == "__main__":
+    sys.exit(run_checks(_CHECKS))
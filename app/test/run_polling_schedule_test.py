@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""상태 조회 간격(polling_service / runpod_poll_interval / jdpatent_poll_interval) 동작 확인.
+
+- 대기열 상태는 queued_interval로, 실행 중에는 완료 예상 시각에서 가장 짧고 멀어질수록 길게 조회한다.
+- 간격은 항상 [min_interval, max_interval] 안이고, jitter는 jitter_ratio 범위 안에서 조회 박자를 흩는다.
+- 예상 시각에 끝난 작업은 min_interval 안팎의 지연으로 감지하면서, 기존 고정 2초 조회보다 조회 수가 적다.
+- 완료 webhook / callback을 등록한 작업은 fallback 간격으로만, 스트리밍 작업은 RUNPOD_STREAM_POLL_SECONDS 이내로 조회한다.
+
+네트워크와 Redis는 쓰지 않는다.
+
+예시:
+    python -m app.test.run_polling_schedule_test
+"""
+from __future__ import annotations
+
+import dataclasses
+import math
+import random
+import sys
+import time
+
+from app.test.bench_common import run_checks
+
+# 비교 기준: 적응형 간격 도입 전 고정 조회 간격
+_FIXED_INTERVAL = 2.0
+
+
+def _no_jitter(policy):
+    return dataclasses.replace(policy, jitter_ratio=0.0)
+
+
+def _delay(policy, elapsed: float, *, expected: float = 120.0, spread: float = 0.35, queued: bool = False) -> float:
+    from app.services.polling_service import DurationEstimate, next_poll_delay
+
+    return next_poll_delay(
+        policy, elapsed=elapsed, estimate=DurationEstimate(expected, spread), queued=queued, rng=random.Random(7)
+    )
+
+
+def check_running_schedule() -> list[str]:
+    from app.services.polling_service import JDPATENT_POLL_POLICY, RUNPOD_POLL_POLICY
+
+    failures = []
+    for base_policy in (RUNPOD_POLL_POLICY, JDPATENT_POLL_POLICY):
+        policy = _no_jitter(base_policy)
+        name = policy.source
+        expected = policy.default_expected_seconds
+        if _delay(policy, 0.0, queued=True, expected=expected) != policy.queued_interval:
+            failures.append(f"{name}: 대기열 상태는 queued_interval로 조회해야 한다")
+        if _delay(policy, expected, expected=expected) != policy.min_interval:
+            failures.append(f"{name}: 완료 예상 시각에는 min_interval로 조회해야 한다")
+
+        before = [_delay(policy, expected * ratio, expected=expected) for ratio in (0.1, 0.3, 0.6, 0.9)]
+        after = [_delay(policy, expected * ratio, expected=expected) for ratio in (1.1, 1.5, 2.5, 5.0)]
+        if before != sorted(before, reverse=True) or after != sorted(after):
+            failures.append(f"{name}: 완료 예상 시각에서 멀수록 간격이 길어야 한다 (before={before}, after={after})")
+
+        for spread in (0.15, 0.4, 1.0):
+            for elapsed in (0.0, 1.0, expected / 4, expected, expected * 3, expected * 20):
+                delay = _delay(policy, elapsed, expected=expected, spread=spread)
+                if not policy.min_interval <= delay <= policy.max_interval:
+                    failures.append(f"{name}: elapsed={elapsed} spread={spread} 간격 {delay}이 범위를 벗어났다")
+    return failures
+
+
+def check_jitter() -> list[str]:
+    from app.services.polling_service import DurationEstimate, RUNPOD_POLL_POLICY, next_poll_delay
+
+    policy = RUNPOD_POLL_POLICY
+    rng = random.Random(7)
+    delays = [
+        next_poll_delay(policy, elapsed=0.0, estimate=DurationEstimate(120.0, 0.35), queued=True, rng=rng)
+        for _ in range(200)
+    ]
+    low, high = policy.queued_interval * (1 - policy.jitter_ratio), policy.queued_interval * (1 + policy.jitter_ratio)
+    failures = []
+    if not all(low <= delay <= high for delay in delays):
+        failures.append(f"jitter가 ±{policy.jitter_ratio:.0%} 범위를 벗어났다 ({min(delays)}~{max(delays)})")
+    if len(set(delays)) < 50:
+        failures.append("worker들이 같은 박자로 조회하지 않도록 간격이 흩어져야 한다")
+    return failures
+
+
+def check_detection_near_expected() -> list[str]:
+    """예상 시각에 끝나는 작업을 감지하는 시점과 그때까지의 조회 수."""
+    from app.services.polling_service import RUNPOD_POLL_POLICY
+
+    policy = _no_jitter(RUNPOD_POLL_POLICY)
+    expected = policy.default_expected_seconds
+    now, polls = 0.0, 0
+    while now < expected:
+        now += _delay(policy, now, expected=expected)
+        polls += 1
+    lag = now - expected
+    fixed_polls = math.ceil(expected / _FIXED_INTERVAL)
+
+    failures = []
+    if lag > policy.min_interval * 1.5:
+        failures.append(f"예상 시각에 끝난 작업을 {lag:.2f}초 뒤에 감지했다 (min_interval {policy.min_interval}초)")
+    if polls >= fixed_polls:
+        failures.append(f"조회 수 {polls}회가 고정 {_FIXED_INTERVAL}초 조회({fixed_polls}회)보다 적어야 한다")
+    return failures
+
+
+def check_job_intervals() -> list[str]:
+    from app.config import settings
+    from app.services.jdpatent_service import jdpatent_poll_interval
+    from app.services.pdf_service import runpod_poll_interval
+    from app.services.polling_service import JDPATENT_POLL_POLICY, RUNPOD_POLL_POLICY
+
+    now = time.time()
+    runpod_job = {"submitted_at": now - 30, "expected_seconds": 120.0, "expected_spread": 0.35}
+    jdpatent_job = {"submitted_at": now - 30, "expected_seconds": 180.0, "expected_spread": 0.4}
+    failures = []
+
+    webhook = runpod_poll_interval({**runpod_job, "webhook": True, "stream": False, "last_status": "IN_PROGRESS"})
+    if webhook != max(settings.RUNPOD_WEBHOOK_FALLBACK_POLL_SECONDS, RUNPOD_POLL_POLICY.min_interval):
+        failures.append(f"runpod: webhook 작업은 fallback 간격으로 조회해야 한다 (got {webhook})")
+
+    streaming = [
+        runpod_poll_interval({**runpod_job, "webhook": True, "stream": True, "last_status": "IN_PROGRESS"})
+        for _ in range(50)
+    ]
+    if max(streaming) > max(settings.RUNPOD_STREAM_POLL_SECONDS, RUNPOD_POLL_POLICY.min_interval):
+        failures.append(f"runpod: 실행 중 스트리밍 작업은 RUNPOD_STREAM_POLL_SECONDS 이내로 조회해야 한다 ({max(streaming)})")
+
+    queued = runpod_poll_interval({**runpod_job, "webhook": False, "stream": True, "last_status": "IN_QUEUE"})
+    if queued < RUNPOD_POLL_POLICY.queued_interval * (1 - RUNPOD_POLL_POLICY.jitter_ratio):
+        failures.append(f"runpod: 대기열 상태는 스트리밍이어도 queued 간격으로 조회해야 한다 (got {queued})")
+
+    callback = jdpatent_poll_interval({**jdpatent_job, "callback": True, "last_status": "PROCESSING"})
+    if callback != max(settings.JDPATENT_CALLBACK_FALLBACK_POLL_SECONDS, JDPATENT_POLL_POLICY.min_interval):
+        failures.append(f"jdpatent: callback 작업은 fallback 간격으로 조회해야 한다 (got {callback})")
+
+    pending = jdpatent_poll_interval({**jdpatent_job, "callback": False, "last_status": "PENDING"})
+    if pending < JDPATENT_POLL_POLICY.queued_interval * (1 - JDPATENT_POLL_POLICY.jitter_ratio):
+        failures.append(f"jdpatent: PENDING 상태는 queued 간격으로 조회해야 한다 (got {pending})")
+    return failures
+
+
+_CHECKS = (check_running_schedule, check_jitter, check_detection_near_expected, check_job_intervals)
+
+
+if __name__ == "__main__":
+    sys.exit(run_checks(_CHECKS))
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""RunPod 완료 webhook 흐름 테스트.
+
+로컬 가짜 RunPod 서버(/run, /status)와 API(uvicorn)를 한 프로세스에서 띄운다.
+가짜 서버는 /run을 받고 --ocr-seconds 뒤에 webhook URL로 완료 본문을 POST한다.
+- 단계별 모드: webhook 수신 라우트가 맡겨 둔 context로 check_ocr_status(claimed=True)를 바로 예약하고,
+  먼저 예약된 fallback 조회는 /status를 부르지 않고 끝나는지 확인한다. 단계 task는 브로커로 보내지 않고
+  예약 내용만 기록한다.
+- asyncio 모드: run_pipeline_async의 OCR 단계(_run_ocr)를 --jobs개 동시에 실행해 wait_for_callback_async로
+  깨어나는지(/status 조회 0회, 완료 후 지연)와, pub/sub 연결이 하나뿐인지 확인한다.
+webhook을 보내지 않는 경우에는 두 모드 모두 fallback /status 조회로 끝나는지 확인한다.
+
+Redis가 필요하다 (REDIS_URL, 기본 redis://localhost:6379/0).
+
+예시:
+    python -m app.test.run_runpod_webhook_test
+    python -m app.test.run_runpod_webhook_test --ocr-seconds 3 --fallback-seconds 2 --jobs 32
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, urlopen
+
+_OCR_TEXT = "【특허청구범위】\n청구항 1. 테스트용 OCR 텍스트"
+
+
+@dataclass
+class FakeRunpodState:
+    ocr_seconds: float
+    send_webhook: bool = True
+    jobs: dict[str, float] = field(default_factory=dict)  # job_id -> 완료 시각
+    status_calls: int = 0
+    webhook_calls: int = 0
+    run_bodies: list[dict] = field(default_factory=list)
+
+    def status_body(self, job_id: str) -> dict:
+        done = time.time() >= self.jobs[job_id]
+        body: dict = {"id": job_id, "status": "COMPLETED" if done else "IN_PROGRESS"}
+        if done:
+            body["output"] = {"mmd_text": _OCR_TEXT}
+        return body
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _make_handler(state: FakeRunpodState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *_args) -> None:
+            pass
+
+        def _send_json(self, body: dict) -> None:
+            raw = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_POST(self) -> None:  # /run
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            state.run_bodies.append(body)
+            job_id = uuid.uuid4().hex
+            state.jobs[job_id] = time.time() + state.ocr_seconds
+            webhook = body.get("webhook")
+            if webhook and state.send_webhook:
+                threading.Thread(target=_call_webhook, args=(state, webhook, job_id), daemon=True).start()
+            self._send_json({"id": job_id, "status": "IN_QUEUE"})
+
+        def do_GET(self) -> None:  # /status/{job_id}
+            state.status_calls += 1
+            self._send_json(state.status_body(self.path.rstrip("/").rsplit("/", 1)[-1]))
+
+    return Handler
+
+
+def _call_webhook(state: FakeRunpodState, url: str, job_id: str) -> None:
+    time.sleep(max(state.jobs[job_id] - time.time(), 0))
+    state.webhook_calls += 1
+    request = Request(
+        url,
+        data=json.dumps(state.status_body(job_id)).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urlopen(request, timeout=10) as response:
+        response.read()
+
+
+def _start_api(port: int) -> None:
+    import uvicorn
+
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 15
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("API 서버 시작 시간 초과")
+        time.sleep(0.05)
+
+
+def _new_ctx() -> dict:
+    from app.worker.pipeline import new_pipeline_context
+
+    ctx = new_pipeline_context(
+        uuid.uuid4().hex,
+        request_id="webhook-test",
+        original_filename="webhook-test.pdf",
+        pdf_url="http://127.0.0.1/unused.pdf",
+        country=None,
+        s3_key=None,
+        pdf_sha256=None,
+        storage_backend=None,
+        page_count=None,
+        processing_lane=None,
+    )
+    ctx["dump_file_path"] = None
+    return ctx
+
+
+def _record_dispatches(task) -> list[tuple[float, tuple, float | None]]:
+    """단계 task를 브로커로 보내는 대신 (예약 시각, args, countdown)을 기록한다."""
+    calls: list[tuple[float, tuple, float | None]] = []
+
+    def apply_async(args=(), countdown=None, **_kwargs):
+        calls.append((time.perf_counter(), tuple(args), countdown))
+
+    task.apply_async = apply_async
+    return calls
+
+
+def _reset(state: FakeRunpodState, *, send_webhook: bool) -> None:
+    state.send_webhook = send_webhook
+    state.status_calls = 0
+    state.webhook_calls = 0
+
+
+def _run_staged_case(state: FakeRunpodState, *, send_webhook: bool, fallback_seconds: float) -> bool:
+    """단계별 모드: webhook 수신 라우트가 맡겨 둔 context로 check_ocr_status(claimed=True)를 예약하는지 확인한다."""
+    from app.services.pdf_service import runpod_poll_interval, submit_runpod_ocr_job
+    from app.services.runpod_webhook_service import claim_waiter
+    from app.worker import tasks
+
+    _reset(state, send_webhook=send_webhook)
+    dispatches = _record_dispatches(tasks.check_ocr_status)
+    ctx = _new_ctx()
+    started = time.perf_counter()
+    ctx["runpod_job"] = submit_runpod_ocr_job(pdf_url=ctx["pdf_url"], filename=ctx["original_filename"])
+    # waiter를 맡기고 fallback 조회(claimed=False)를 예약한다.
+    tasks._await_runpod(ctx)
+
+    deadline = started + state.ocr_seconds + fallback_seconds + 1.0
+    while time.perf_counter() < deadline and not any(args[1:] == (True,) for _, args, _ in dispatches):
+        time.sleep(0.05)
+    claimed = [(at, args) for at, args, _ in dispatches if args[1:] == (True,)]
+    fallback = [countdown for _, args, countdown in dispatches if args[1:] == ()]
+
+    label = "staged/webhook" if send_webhook else "staged/fallback"
+    extra = claimed[0][0] - started - state.ocr_seconds if claimed else None
+    print(
+        f"{label:<16} dispatched_after_done={'-' if extra is None else f'{extra:.2f}s':>6}  "
+        f"fallback_countdown={fallback}  "
+        f"status_calls={state.status_calls}  webhook_calls={state.webhook_calls}"
+    )
+    if fallback != [runpod_poll_interval(ctx["runpod_job"])]:
+        print("  FAIL: 등록 직후 fallback 간격으로 check_ocr_status를 예약해야 한다")
+        return False
+    if not send_webhook:
+        if claimed:
+            print("  FAIL: webhook이 없으면 check_ocr_status(claimed=True)를 예약하면 안 된다")
+            return False
+        if not claim_waiter(ctx["runpod_job"]["job_id"]):
+            print("  FAIL: webhook이 없으면 fallback 조회가 맡겨 둔 context를 회수해야 한다")
+            return False
+        return True
+
+    if extra is None or claimed[0][1][0]["task_id"] != ctx["task_id"] or extra > 1.0:
+        print("  FAIL: webhook 완료 후 1초 안에 맡겨 둔 context로 check_ocr_status(claimed=True)를 예약해야 한다")
+        return False
+    # 먼저 예약된 fallback 조회는 context를 회수하지 못하고 /status 조회 없이 끝나야 한다.
+    tasks._check_ocr_status(ctx, False)
+    if state.status_calls != 0:
+        print("  FAIL: webhook이 예약한 뒤의 fallback 조회가 /status를 호출했다")
+        return False
+    return True
+
+
+def _pubsub_connections() -> int:
+    from app.services.redis_service import get_redis
+
+    return len(get_redis().client_list(_type="pubsub"))
+
+
+def _run_async_case(state: FakeRunpodState, *, send_webhook: bool, fallback_seconds: float, jobs: int) -> bool:
+    """asyncio 모드: run_pipeline_async의 OCR 단계가 wait_for_callback_async로 깨어나는지 확인한다.
+
+    동시에 기다리는 작업이 여럿이어도 pub/sub 연결은 루프당 하나(CallbackHub)여야 한다.
+    """
+    from app.worker.async_runtime import AsyncPipelineRuntime, _run_ocr
+
+    _reset(state, send_webhook=send_webhook)
+    runtime = AsyncPipelineRuntime(jobs)
+    baseline = _pubsub_connections()
+    started = time.perf_counter()
+    try:
+        futures = [runtime.submit(_run_ocr, _new_ctx(), None) for _ in range(jobs)]
+        time.sleep(state.ocr_seconds / 2)
+        pubsub_connections = _pubsub_connections() - baseline
+        texts = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+    finally:
+        runtime.stop()
+    extra = elapsed - state.ocr_seconds
+
+    label = "async/webhook" if send_webhook else "async/fallback"
+    print(
+        f"{label:<16} jobs={jobs}  elapsed={elapsed:6.2f}s  after_done={extra:6.2f}s  "
+        f"status_calls={state.status_calls}  webhook_calls={state.webhook_calls}  "
+        f"pubsub_connections={pubsub_connections}"
+    )
+    if any(text != _OCR_TEXT for text in texts):
+        print(f"  FAIL: unexpected text {texts!r}")
+        return False
+    if pubsub_connections != 1:
+        print("  FAIL: 기다리는 작업 수와 관계없이 pub/sub 연결은 하나여야 한다")
+        return False
+    if send_webhook and (state.status_calls != 0 or extra > 1.0):
+        print("  FAIL: webhook 완료 후 /status 조회 없이 1초 안에 깨어나야 한다")
+        return False
+    if not send_webhook and state.status_calls == 0:
+        print("  FAIL: webhook이 없으면 fallback /status 조회로 끝나야 한다")
+        return False
+    if not send_webhook and extra > fallback_seconds + 1.0:
+        print("  FAIL: fallback 간격 안에 완료를 감지해야 한다")
+        return False
+    return True
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="RunPod 완료 webhook / fallback 조회 테스트")
+    parser.add_argument("--ocr-seconds", type=float, default=2.0, help="가짜 OCR 작업 소요 시간")
+    parser.add_argument("--fallback-seconds", type=float, default=3.0, help="webhook 유실 시 /status 조회 간격")
+    parser.add_argument("--jobs", type=int, default=8, help="asyncio 모드에서 동시에 기다리는 OCR 작업 수")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    runpod_port, api_port = _free_port(), _free_port()
+
+    # pdf_service는 import 시점에 RunPod URL을 정하므로 앱 모듈을 불러오기 전에 설정한다.
+    os.environ.update(
+        {
+            "RUNPOD_API_URL": f"http://127.0.0.1:{runpod_port}",
+            "RUNPOD_API_KEY": "webhook-test",
+            "RUNPOD_WEBHOOK_ENABLED": "true",
+            "RUNPOD_WEBHOOK_SECRET": uuid.uuid4().hex,
+            "RUNPOD_WEBHOOK_FALLBACK_POLL_SECONDS": str(args.fallback_seconds),
+            "RUNPOD_STREAM_ENABLED": "false",
+            "PUBLIC_BASE_URL": f"http://127.0.0.1:{api_port}",
+        }
+    )
+
+    state = FakeRunpodState(ocr_seconds=args.ocr_seconds)
+    runpod_server = ThreadingHTTPServer(("127.0.0.1", runpod_port), _make_handler(state))
+    threading.Thread(target=runpod_server.serve_forever, daemon=True).start()
+    _start_api(api_port)
+
+    try:
+        results = []
+        for send_webhook in (True, False):
+            results.append(_run_staged_case(state, send_webhook=send_webhook, fallback_seconds=args.fallback_seconds))
+            results.append(
+                _run_async_case(state, send_webhook=send_webhook, fallback_seconds=args.fallback_seconds, jobs=args.jobs)
+            )
+        passed = all(results)
+        if not all("webhook" in body for body in state.run_bodies):
+            print("FAIL: /run 요청에 webhook URL이 없다")
+            passed = False
+    finally:
+        runpod_server.shutdown()
+
+    print("PASS" if passed else "FAIL")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
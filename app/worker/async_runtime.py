@@ -0,0 +1,355 @@
+"""asyncio 기반 worker 실행 모드 (WORKER_RUNTIME=asyncio).
+
+RunPod/JDPatent 단계는 네트워크 대기뿐이므로, 파이프라인을 프로세스 하나의 이벤트 루프에서
+coroutine으로 실행해 수백 건을 동시에 진행한다. 이벤트 루프는 전용 스레드에서 돌고,
+Celery task(threads pool)는 coroutine을 넘기고 바로 끝난다. 결과(SUCCESS / FAILURE)는 단계별 모드와
+같이 coroutine이 root task_id에 기록한다(pipeline.complete_pipeline / fail_pipeline).
+동시 파이프라인이 ASYNC_WORKER_MAX_INFLIGHT만큼 차 있으면 task 스레드가 자리가 날 때까지 기다리므로
+threads pool 크기는 메시지 수신용으로 작게 둔다.
+
+    celery -A app.worker.celery_app worker --pool=threads --concurrency=4 -Q celery
+
+- HTTP 호출은 루프에 하나 있는 httpx.AsyncClient(연결 풀 공유, http_client_service 설정)로 한다.
+- 대기는 time.sleep 대신 asyncio.sleep을 쓴다.
+- Redis / 파일 / CPU 작업(타입 감지, OCR dump, 처리 시간 기록 등)은 asyncio.to_thread로 루프 밖에서 실행한다.
+- 메시지는 coroutine을 넘길 때 ack되므로 worker가 비정상 종료하면 진행 중 파이프라인은 재전달되지 않는다.
+  정상 종료(warm shutdown) 시에는 진행 중 파이프라인이 끝날 때까지 기다린다.
+- 진행 상태(PARSING / JDPATENT_SUBMIT / JDPATENT_PROCESSING)는 task.update_state와 같은
+  형식으로 root task_id에 기록한다.
+- threads pool은 Celery soft time limit을 지원하지 않으므로, 파이프라인 전체에
+  asyncio.timeout(PIPELINE_SOFT_TIME_LIMIT_SECONDS)을 걸고 넘으면 SoftTimeLimitExceeded를 던진다.
+- process_patent의 time_limit(180초)은 단계별 모드의 진입 단계 기준이다. prefork pool에서는 이 제한이
+  적용돼 파이프라인이 도중에 종료되므로, 이 모드는 threads pool이 아니면 worker를 시작하지 않는다.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+import httpx
+from celery.concurrency import get_implementation
+from celery.concurrency.thread import TaskPool as ThreadTaskPool
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_init, worker_shutdown
+from loguru import logger
+
+from app.config import settings
+from app.services.callback_service import close_callback_hub
+from app.services.http_client_service import build_async_http_client, flush_http_metrics
+from app.services.jdpatent_service import (
+    fetch_jdpatent_job_async,
+    jdpatent_poll_interval,
+    raise_jdpatent_timeout,
+    resolve_jdpatent_job,
+    submit_jdpatent_job_async,
+    wait_for_jdpatent_callback_async,
+)
+from app.services.ocr_cache_service import get_cached_ocr_text, put_cached_ocr_text
+from app.services.ocr_stream_service import OcrPageBuffer
+from app.services.patent_type_service import detect_patent_type
+from app.services.pdf_service import (
+    fetch_runpod_ocr_status_async,
+    fetch_runpod_ocr_stream_async,
+    finish_runpod_stream,
+    raise_runpod_ocr_timeout,
+    read_runpod_stream,
+    resolve_runpod_ocr_status,
+    runpod_ocr_deadline,
+    runpod_poll_interval,
+    submit_runpod_ocr_job_async,
+)
+from app.services.polling_service import PollClock
+from app.services.runpod_webhook_service import wait_for_webhook_status_async
+from app.worker.celery_app import celery_app
+from app.worker.pipeline import (
+    PIPELINE_SOFT_TIME_LIMIT_SECONDS,
+    complete_pipeline,
+    detect_front_page_type,
+    early_patent_type,
+    fail_pipeline,
+    log_pipeline_failed,
+    parsing_meta,
+    reissue_download_url,
+    release_storage,
+)
+
+PipelineFn = Callable[..., Awaitable[Any]]
+
+
+class AsyncPipelineRuntime:
+    """전용 스레드의 이벤트 루프에서 파이프라인 coroutine을 실행한다."""
+
+    def __init__(self, max_inflight: int, *, transport: httpx.AsyncBaseTransport | None = None):
+        self.max_inflight = max(int(max_inflight), 1)
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        # 호출 스레드에서 잡는 동시 실행 자리 (가득 차면 submit이 기다린다)
+        self._slots = threading.BoundedSemaphore(self.max_inflight)
+        self._futures: set[concurrent.futures.Future] = set()
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.completed = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run_loop, name="async-pipeline-runtime", daemon=True
+                )
+                self._thread.start()
+        self._ready.wait()
+
+    def _run_loop(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._client = build_async_http_client(max_connections=self.max_inflight, transport=self._transport)
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(close_callback_hub())
+            loop.run_until_complete(self._client.aclose())
+            loop.close()
+            flush_http_metrics()
+
+    def submit(self, pipeline: PipelineFn, *args: Any) -> concurrent.futures.Future:
+        """pipeline(client, *args) coroutine을 루프에 넘기고 바로 반환한다.
+
+        이미 max_inflight개가 진행 중이면 하나가 끝날 때까지 호출 스레드에서 기다린다.
+        """
+        self.start()
+        self._slots.acquire()
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._guarded(pipeline, *args), self._loop)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def run(self, pipeline: PipelineFn, *args: Any) -> Any:
+        """submit 후 호출 스레드에서 결과를 기다린다 (테스트 / 벤치마크용)."""
+        return self.submit(pipeline, *args).result()
+
+    def _on_done(self, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+        self._slots.release()
+
+    async def _guarded(self, pipeline: PipelineFn, *args: Any) -> Any:
+        self.inflight += 1
+        self.peak_inflight = max(self.peak_inflight, self.inflight)
+        try:
+            return await pipeline(self._client, *args)
+        finally:
+            self.inflight -= 1
+            self.completed += 1
+
+    def stop(self, timeout: float = 10.0, *, drain_timeout: float = 0.0) -> None:
+        """drain_timeout까지 진행 중 파이프라인이 끝나기를 기다린 뒤 루프를 멈춘다."""
+        with self._lock:
+            pending = set(self._futures)
+        if pending and drain_timeout > 0:
+            logger.bind(event="async_runtime_draining", inflight=len(pending)).info(
+                "진행 중 파이프라인 종료 대기"
+            )
+            concurrent.futures.wait(pending, timeout=drain_timeout)
+        with self._lock:
+            thread, loop = self._thread, self._loop
+            self._thread = None
+        if thread is None or loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        self._ready.clear()
+
+
+_runtime: AsyncPipelineRuntime | None = None
+_runtime_lock = threading.Lock()
+
+
+def get_async_runtime() -> AsyncPipelineRuntime:
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = AsyncPipelineRuntime(settings.ASYNC_WORKER_MAX_INFLIGHT)
+    return _runtime
+
+
+@worker_init.connect
+def _require_threads_pool(sender=None, **_kwargs) -> None:
+    """asyncio 모드는 threads pool에서만 시작한다.
+
+    signal handler의 일반 예외는 Celery가 로그만 남기고 넘어가므로 SystemExit로 worker 시작을 막는다.
+    """
+    if settings.WORKER_RUNTIME != "asyncio" or sender is None:
+        return
+    pool_cls = get_implementation(sender.pool_cls)
+    if isinstance(pool_cls, type) and issubclass(pool_cls, ThreadTaskPool):
+        return
+    logger.bind(event="async_runtime_pool_rejected", pool=getattr(pool_cls, "__module__", str(pool_cls))).error(
+        "WORKER_RUNTIME=asyncio는 --pool=threads로만 실행할 수 있습니다"
+    )
+    raise SystemExit("WORKER_RUNTIME=asyncio requires --pool=threads")
+
+
+@worker_shutdown.connect
+def _stop_async_runtime(**_kwargs) -> None:
+    # 메시지는 이미 ack됐으므로 진행 중 파이프라인은 마감 시간까지 끝나기를 기다린다.
+    if _runtime is not None:
+        _runtime.stop(drain_timeout=PIPELINE_SOFT_TIME_LIMIT_SECONDS)
+
+
+# ---------------------------------------------------------------------------
+# 파이프라인 coroutine
+# ---------------------------------------------------------------------------
+async def run_pipeline_async(
+    client: httpx.AsyncClient, ctx: dict[str, Any], pdf_bytes_b64: str | None
+) -> None:
+    """process_patent 파이프라인 전체를 coroutine으로 실행하고 결과를 root task_id에 기록한다."""
+    with logger.contextualize(request_id=ctx["request_id"], task_id=ctx["task_id"]):
+        try:
+            try:
+                async with asyncio.timeout(PIPELINE_SOFT_TIME_LIMIT_SECONDS):
+                    result = await _run_pipeline(client, ctx, pdf_bytes_b64)
+            except TimeoutError as exc:
+                raise SoftTimeLimitExceeded(
+                    f"pipeline deadline exceeded ({PIPELINE_SOFT_TIME_LIMIT_SECONDS}s)"
+                ) from exc
+        except SoftTimeLimitExceeded as exc:
+            log_pipeline_failed(exc, soft_time_limit=True)
+            await asyncio.to_thread(fail_pipeline, ctx, exc)
+            return
+        except Exception as exc:
+            log_pipeline_failed(exc, soft_time_limit=False)
+            await asyncio.to_thread(fail_pipeline, ctx, exc)
+            return
+        await asyncio.to_thread(complete_pipeline, ctx, result)
+
+
+async def _run_pipeline(client: httpx.AsyncClient, ctx: dict[str, Any], pdf_bytes_b64: str | None) -> Any:
+    await _store_state(ctx, "PARSING", parsing_meta(ctx))
+
+    # 같은 PDF를 이미 OCR한 적이 있으면 RunPod(GPU) 단계를 건너뛴다.
+    text = await asyncio.to_thread(get_cached_ocr_text, ctx["pdf_sha256"], ctx["country"])
+    if text is not None:
+        ctx["ocr_cache_hit"] = True
+    else:
+        try:
+            text = await _run_ocr(client, ctx, pdf_bytes_b64)
+        finally:
+            # OCR 성공/실패 무관하게 원본 PDF 즉시 삭제
+            await asyncio.to_thread(release_storage, ctx)
+        await asyncio.to_thread(put_cached_ocr_text, ctx["pdf_sha256"], ctx["country"], text)
+    await asyncio.to_thread(release_storage, ctx)
+
+    # 스트리밍 중 앞면으로 감지한 타입이 있으면 전체 텍스트로 다시 감지하지 않는다.
+    patent_type_info = early_patent_type(ctx) or await asyncio.to_thread(detect_patent_type, text)
+    ctx["patent_type_info"] = patent_type_info
+    ctx["ocr_text_length"] = len(text)
+
+    await _store_state(ctx, "JDPATENT_SUBMIT", {"msg": "JDPatent 작업 등록 중"})
+    jdpatent_job = await submit_jdpatent_job_async(
+        client,
+        task_id=ctx["task_id"],
+        raw_text=text,
+        user_id=ctx["original_filename"] or ctx["task_id"],
+        patent_type=patent_type_info["patent_type"],
+        patent_kind_code=patent_type_info["patent_kind_code"],
+    )
+
+    await _store_state(ctx, "JDPATENT_PROCESSING", {"msg": "JDPatent 결과 대기 중"})
+    ctx["jdpatent_job"] = jdpatent_job
+    return await _wait_jdpatent_result(client, jdpatent_job)
+
+
+async def _run_ocr(client: httpx.AsyncClient, ctx: dict[str, Any], pdf_bytes_b64: str | None) -> str:
+    pdf_url = await asyncio.to_thread(reissue_download_url, ctx)
+    job = await submit_runpod_ocr_job_async(
+        client,
+        pdf_bytes_b64,
+        pdf_url=pdf_url,
+        filename=ctx["original_filename"],
+        patent_origin=ctx["country"],
+        page_count=ctx["page_count"],
+    )
+    ctx["runpod_job"] = job
+    buffer = OcrPageBuffer(total_pages=job["pages_total"]) if job["stream"] else None
+    clock = PollClock(max(runpod_ocr_deadline(job) - time.time(), 0.0))
+    while not clock.expired():
+        delay = min(runpod_poll_interval(job), clock.remaining())
+        status_data = None
+        if job["webhook"]:
+            # 완료 webhook 알림(pub/sub)을 기다리고, 오지 않으면 /status를 한 번 조회한다.
+            status_data = await wait_for_webhook_status_async(job["job_id"], delay)
+        else:
+            await asyncio.sleep(delay)
+        if status_data is None and buffer is not None:
+            status_data, text = await _read_ocr_stream(client, ctx, buffer)
+            if text is not None:
+                return text
+        if status_data is None:
+            status_data = await fetch_runpod_ocr_status_async(client, job)
+        text = await asyncio.to_thread(
+            resolve_runpod_ocr_status, job, status_data, dump_file_path=ctx["dump_file_path"]
+        )
+        if text is not None:
+            return text
+    raise_runpod_ocr_timeout(job)
+
+
+async def _read_ocr_stream(
+    client: httpx.AsyncClient, ctx: dict[str, Any], buffer: OcrPageBuffer
+) -> tuple[dict[str, Any] | None, str | None]:
+    """tasks._read_ocr_stream과 같지만 페이지를 프로세스 메모리(buffer)에 모은다."""
+    job = ctx["runpod_job"]
+    stream_data = await fetch_runpod_ocr_stream_async(client, job)
+    pages = read_runpod_stream(job, stream_data)
+    if buffer.add(pages):
+        job["pages_done"] = buffer.pages_done
+        await asyncio.to_thread(detect_front_page_type, ctx, pages)
+        await _store_state(ctx, "PARSING", parsing_meta(ctx))
+
+    buffer.total_pages = job["pages_total"]
+    if buffer.complete():
+        text = await asyncio.to_thread(
+            finish_runpod_stream, job, buffer.text(), dump_file_path=ctx["dump_file_path"]
+        )
+        return None, text
+    if job["last_status"] == "COMPLETED":
+        # 페이지 수를 확인할 수 없으면 /status의 최종 output을 쓴다.
+        return None, None
+    return stream_data, None
+
+
+async def _wait_jdpatent_result(client: httpx.AsyncClient, job: dict[str, Any]) -> Any:
+    clock = PollClock(settings.JDPATENT_POLL_TIMEOUT_SECONDS)
+    while not clock.expired():
+        delay = min(jdpatent_poll_interval(job), clock.remaining())
+        data = None
+        if job["callback"]:
+            # 완료 callback 알림(pub/sub)을 기다리고, 오지 않으면 상태를 한 번 조회한다.
+            data = await wait_for_jdpatent_callback_async(job["task_id"], delay)
+        else:
+            await asyncio.sleep(delay)
+        if data is None:
+            data = await fetch_jdpatent_job_async(client, job)
+        result = await asyncio.to_thread(resolve_jdpatent_job, job, data)
+        if result is not None:
+            return result
+    raise_jdpatent_timeout(job["task_id"], clock.elapsed())
+
+
+async def _store_state(ctx: dict[str, Any], state: str, meta: dict[str, Any]) -> None:
+    """root task_id에 진행 상태를 기록한다 (task.update_state와 같은 메타 형식)."""
+    await asyncio.to_thread(celery_app.backend.store_result, ctx["task_id"], meta, state)
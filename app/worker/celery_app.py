@@ -1,16 +1,39 @@
 from celery import Celery
 
 from app.config import settings
+from app.services.lane_service import DEFAULT_LANE, entry_queue, lane_from_task_call, stage_queue
 
 from app.logging_config import setup_logging
 
 # Worker 로깅 초기화
 setup_logging()
 
+# 분석 파이프라인의 후속 단계 task(상태 확인/타입 감지/JDPatent 등록) 전용 큐 (standard lane).
+# 새 분석 요청(기본 "celery" 큐)과 분리해 수락 제어의 대기열 길이에 섞이지 않게 한다.
+PIPELINE_STAGE_QUEUE = stage_queue(DEFAULT_LANE)
+_ENTRY_TASK = "app.worker.tasks.process_patent"
+_PIPELINE_STAGE_TASKS = (
+    "app.worker.tasks.check_ocr_status",
+    "app.worker.tasks.detect_patent_type_stage",
+    "app.worker.tasks.submit_jdpatent_stage",
+    "app.worker.tasks.check_jdpatent_status",
+)
+
+
+def route_pipeline_task(name, args, kwargs, options, task=None, **_kw):
+    """처리 lane(small / standard / large)에 따라 진입 task와 단계 task의 큐를 정한다."""
+    if name == _ENTRY_TASK:
+        return {"queue": entry_queue(lane_from_task_call(args, kwargs))}
+    if name in _PIPELINE_STAGE_TASKS:
+        return {"queue": stage_queue(lane_from_task_call(args, kwargs))}
+    return None
+
+
 celery_app = Celery(
     "jd_worker",
     broker=settings.REDIS_URL,
-    backend=settings.REDIS_URL,
+    # 큰 완료 결과는 압축하거나 blob 저장소로 옮긴다 (app/worker/result_backend.py)
+    backend=f"app.worker.result_backend:CompactRedisBackend+{settings.REDIS_URL}",
     include=["app.worker.tasks"],  # 명시적으로 tasks 모듈 포함
 )
 
@@ -19,6 +42,8 @@ celery_app.conf.update(
     task_serializer="json",
     result_serializer="json",
     accept_content=["json"],
+    # 라우팅: lane별 worker pool이 자기 lane의 두 큐를 소비한다 (예: -Q analysis-small,pipeline-stages-small)
+    task_routes=(route_pipeline_task,),
     # Worker 동시성
     worker_concurrency=3,
     worker_prefetch_multiplier=1,  # 순서 보장에 유리
@@ -26,10 +51,12 @@ celery_app.conf.update(
     task_acks_late=True,  # 처리 완료 후 ACK
     task_reject_on_worker_lost=True,
     # 타임아웃
-    task_time_limit=1800,  # 30분
-    task_soft_time_limit=1500,  # 25분 소프트 타임아웃
+    task_time_limit=settings.PIPELINE_TIME_LIMIT_SECONDS,  # 기본 30분
+    task_soft_time_limit=settings.PIPELINE_SOFT_TIME_LIMIT_SECONDS,  # 기본 25분 소프트 타임아웃
+    # 로컬 검증용 eager 실행
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
     # 결과 저장
-    result_expires=3600,  # 1시간 보관
+    result_expires=settings.RESULT_EXPIRES_SECONDS,  # 기본 1시간 보관
     # Celery 성공 로그에서 result 출력 길이 제한
     resultrepr_maxsize=200,
 )
@@ -0,0 +1,201 @@
+"""분석 파이프라인 공통 처리.
+
+단계별 Celery task 모드(tasks.py)와 asyncio 실행 모드(async_runtime.py)가 같은
+파이프라인 context(dict)와 정리/로그 규칙을 공유한다. context는 JSON 직렬화 가능해야
+단계 task 사이에 메시지로 전달할 수 있다.
+"""
+
+import time
+import traceback
+from typing import Any
+
+from loguru import logger
+
+from app.config import settings
+from app.services.admission_service import mark_task_finished
+from app.services.ocr_cache_service import delete_pipeline_ocr_text
+from app.services.ocr_stream_service import OcrPage
+from app.services.patent_type_service import detect_patent_type
+from app.services.result_archive_service import archive_result
+from app.services.storage_service import get_storage_backend
+from app.worker.celery_app import celery_app
+
+# 단계 분리 전 process_patent의 soft_time_limit과 같은 파이프라인 전체 마감 시간
+PIPELINE_SOFT_TIME_LIMIT_SECONDS = settings.PIPELINE_SOFT_TIME_LIMIT_SECONDS
+
+
+def new_pipeline_context(
+    task_id: str,
+    *,
+    request_id: str,
+    original_filename: str | None,
+    pdf_url: str | None,
+    country: str | None,
+    s3_key: str | None,
+    pdf_sha256: str | None,
+    storage_backend: str | None,
+    page_count: int | None,
+    processing_lane: str | None,
+) -> dict[str, Any]:
+    started_at = time.time()
+    return {
+        "task_id": task_id,
+        "request_id": request_id,
+        "original_filename": original_filename,
+        "pdf_url": pdf_url,
+        "country": country,
+        "s3_key": s3_key,
+        "pdf_sha256": pdf_sha256,
+        "storage_backend": storage_backend,
+        "page_count": page_count,
+        "processing_lane": processing_lane,
+        "dump_file_path": f"{settings.RUNPOD_OCR_DUMP_DIR.rstrip('/')}/{task_id}.json",
+        "started_at": started_at,
+        "deadline": started_at + PIPELINE_SOFT_TIME_LIMIT_SECONDS,
+        "ocr_cache_hit": False,
+        "storage_released": False,
+    }
+
+
+def parsing_meta(ctx: dict[str, Any]) -> dict[str, Any]:
+    meta = {"msg": "PDF 파싱 중", "page_count": ctx["page_count"], "processing_lane": ctx["processing_lane"]}
+    job = ctx.get("runpod_job")
+    if job and job.get("stream"):
+        # 스트리밍 OCR은 페이지 단위 진행률과, 앞면으로 미리 감지한 특허 타입을 함께 보여 준다.
+        meta["progress"] = {"pages_done": job["pages_done"], "pages_total": job["pages_total"]}
+        if ctx.get("patent_type_info"):
+            meta["patent_type"] = ctx["patent_type_info"]["patent_type"]
+            meta["patent_kind_code"] = ctx["patent_type_info"]["patent_kind_code"]
+    return meta
+
+
+def detect_front_page_type(ctx: dict[str, Any], pages: list[OcrPage]) -> None:
+    """스트리밍으로 앞면(1페이지)이 도착하면 전체 OCR을 기다리지 않고 특허 타입을 감지한다."""
+    if ctx.get("patent_type_info"):
+        return
+    front = next((page.text for page in pages if page.page == 1), None)
+    if front is not None:
+        ctx["patent_type_info"] = detect_patent_type(front)
+
+
+def early_patent_type(ctx: dict[str, Any]) -> dict[str, Any] | None:
+    """앞면으로 감지한 특허 타입. Kind Code를 못 찾았으면 전체 텍스트로 다시 감지하도록 None."""
+    info = ctx.get("patent_type_info")
+    return info if info and info.get("patent_kind_code") else None
+
+
+def reissue_download_url(ctx: dict[str, Any]) -> str | None:
+    """큐 대기 중 업로드 시점의 URL이 만료됐을 수 있으므로 다운로드 URL을 재발급한다.
+
+    RunPod 접근 403을 방지하기 위한 것으로, URL은 파이프라인 마감 시각까지 유효하게 발급한다.
+    원본 PDF가 저장소에 없으면 RunPod이 받을 파일이 없으므로 FileNotFoundError로 파이프라인을 실패시킨다.
+    그 외 재발급 실패는 업로드 시점 URL을 그대로 쓴다.
+    """
+    s3_key = ctx["s3_key"]
+    if not s3_key:
+        return ctx["pdf_url"]
+    storage = get_storage_backend(ctx["storage_backend"])
+    try:
+        pdf_url = storage.get_download_url(s3_key, expires_at=int(ctx["deadline"]))
+    except FileNotFoundError as exc:
+        logger.bind(
+            event="pipeline_pdf_missing",
+            task_id=ctx["task_id"],
+            s3_key=s3_key,
+            storage_backend=storage.name,
+        ).error("원본 PDF가 저장소에 없습니다")
+        raise FileNotFoundError(f"원본 PDF가 저장소에 없습니다: {s3_key}") from exc
+    except Exception as exc:
+        logger.bind(
+            event="s3_presigned_url_regenerate_failed",
+            task_id=ctx["task_id"],
+            s3_key=s3_key,
+            storage_backend=storage.name,
+        ).warning(f"PDF 다운로드 URL 재발급 실패, 기존 URL 사용: {exc}")
+        return ctx["pdf_url"]
+
+    logger.bind(
+        event="s3_presigned_url_regenerated",
+        task_id=ctx["task_id"],
+        s3_key=s3_key,
+        storage_backend=storage.name,
+    ).debug("PDF 다운로드 URL 재발급 완료")
+    return pdf_url
+
+
+def release_storage(ctx: dict[str, Any]) -> None:
+    """OCR이 끝났거나 더 이상 필요 없는 원본 PDF를 저장소에서 삭제한다 (한 번만)."""
+    if ctx["storage_released"] or not ctx["s3_key"]:
+        return
+    ctx["storage_released"] = True
+    try:
+        get_storage_backend(ctx["storage_backend"]).delete(ctx["s3_key"])
+    except Exception as exc:
+        logger.warning(f"원본 PDF 삭제 실패 - key={ctx['s3_key']}, error={exc}")
+
+
+def apply_patent_type(result: Any, patent_type_info: dict[str, Any]) -> Any:
+    """JDPatent 결과에 룰 기반으로 감지한 특허 타입/Kind Code를 덮어쓴다."""
+    if isinstance(result, dict):
+        basic_info = result.get("basic_info")
+        if isinstance(basic_info, dict):
+            basic_info["patent_type"] = patent_type_info["patent_type"]
+            basic_info["patent_kind_code"] = patent_type_info["patent_kind_code"]
+        else:
+            result["patent_type"] = patent_type_info["patent_type"]
+            result["patent_kind_code"] = patent_type_info["patent_kind_code"]
+    return result
+
+
+def complete_pipeline(ctx: dict[str, Any], result: Any) -> None:
+    """JDPatent 결과를 root task_id의 SUCCESS로 기록하고 장기 보관한다 (블로킹 I/O)."""
+    result = apply_patent_type(result, ctx["patent_type_info"])
+    celery_app.backend.mark_as_done(ctx["task_id"], result)
+    archive_result(ctx["task_id"], result, pdf_sha256=ctx["pdf_sha256"], country=ctx["country"])
+    mark_task_finished(ctx["task_id"])
+    log_pipeline_succeeded(ctx)
+
+
+def fail_pipeline(ctx: dict[str, Any], exc: BaseException) -> None:
+    """남은 원본 PDF / 단계 간 OCR 텍스트를 정리하고 root task_id를 FAILURE로 기록한다 (블로킹 I/O)."""
+    release_storage(ctx)
+    delete_pipeline_ocr_text(ctx.get("ocr_text_key"))
+    celery_app.backend.mark_as_failure(
+        ctx["task_id"],
+        exc,
+        traceback="".join(traceback.format_exception(exc)),
+        call_errbacks=False,
+    )
+    mark_task_finished(ctx["task_id"])
+
+
+def log_pipeline_succeeded(ctx: dict[str, Any]) -> None:
+    patent_type_info = ctx["patent_type_info"]
+    logger.bind(
+        event="analysis_pipeline_succeeded",
+        task_id=ctx["task_id"],
+        ocr_dump_file_path=ctx["dump_file_path"],
+        pdf_sha256=ctx["pdf_sha256"],
+        ocr_cache_hit=ctx["ocr_cache_hit"],
+        page_count=ctx["page_count"],
+        processing_lane=ctx["processing_lane"],
+        patent_type=patent_type_info["patent_type"],
+        patent_kind_code=patent_type_info["patent_kind_code"],
+        ocr_text_length=ctx["ocr_text_length"],
+        elapsed_seconds=round(time.time() - ctx["started_at"], 3),
+    ).info("분석 파이프라인 성공")
+
+
+def log_pipeline_failed(exc: BaseException, *, soft_time_limit: bool, stage: str | None = None) -> None:
+    if soft_time_limit:
+        logger.bind(
+            event="analysis_pipeline_failed",
+            failure_reason="soft_time_limit_exceeded",
+            stage=stage,
+        ).error("분석 파이프라인 실패")
+        return
+    logger.bind(
+        event="analysis_pipeline_failed",
+        failure_reason="unhandled_exception",
+        stage=stage,
+    ).exception(f"분석 파이프라인 예외 발생: {exc}")
@@ -0,0 +1,24 @@
+"""결과 메타를 압축 / 외부 저장하는 Celery Redis result backend.
+
+celery_app의 backend URL(`app.worker.result_backend:CompactRedisBackend+redis://...`)로 지정한다.
+저장 형식은 app/services/result_store_service.py 참고. AsyncResult, store_result, mark_as_done 등
+Celery API는 그대로 쓰며, 압축/외부 저장 여부와 관계없이 같은 meta dict를 돌려준다.
+"""
+
+from celery.backends.redis import RedisBackend
+
+from app.services.result_store_service import encode_task_meta, inflate_task_meta, resolve_result_ref
+
+
+class CompactRedisBackend(RedisBackend):
+    def encode(self, data):
+        payload = super().encode(data)
+        return encode_task_meta(payload) if isinstance(payload, str) else payload
+
+    def decode(self, payload):
+        if payload is None:
+            return payload
+        meta = super().decode(inflate_task_meta(payload))
+        if isinstance(meta, dict):
+            resolve_result_ref(meta)
+        return meta
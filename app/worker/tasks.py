@@ -1,21 +1,138 @@
-"""Celery Task 정의 - PDF 파싱 후 JDPatent 내부 서비스 연동."""
+"""Celery Task 정의 - PDF 파싱 후 JDPatent 내부 서비스 연동.
 
-from celery.exceptions import SoftTimeLimitExceeded
+파이프라인은 단계별 task로 나뉘어 있다. 외부 서비스(RunPod, JDPatent)를 기다리는 동안
+worker slot을 잡고 있지 않도록, 상태 확인 task는 아직 끝나지 않았으면 countdown으로
+자기 자신을 다시 예약하고 바로 반환한다.
+
+    process_patent (OCR 캐시 확인 + RunPod 등록)
+      → check_ocr_status (반복) → detect_patent_type_stage
+      → submit_jdpatent_stage → check_jdpatent_status (반복)
+
+API가 조회하는 상태/결과는 모두 process_patent의 task_id(root)에 기록한다.
+process_patent는 첫 단계만 실행하고 Ignore로 끝나므로 Celery가 root 결과를 덮어쓰지 않는다.
+
+WORKER_RUNTIME=asyncio이면 process_patent가 파이프라인 전체를 이 프로세스의 asyncio
+runtime(async_runtime.py)에 coroutine으로 넘기고 바로 끝난다. 결과는 coroutine이 root에 기록한다.
+"""
+
+import time
+from typing import Any
+
+from celery.exceptions import Ignore, SoftTimeLimitExceeded
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
 from loguru import logger
 
 from app.config import settings
-from app.services.jdpatent_service import poll_jdpatent_result, submit_jdpatent_job
+from app.services.admission_service import mark_task_started
+from app.services.http_client_service import close_http_clients, reset_http_clients, warm_http_clients
+from app.services.jdpatent_service import (
+    claim_jdpatent_waiter,
+    fetch_jdpatent_job,
+    get_jdpatent_callback,
+    jdpatent_poll_interval,
+    raise_jdpatent_timeout,
+    register_jdpatent_waiter,
+    resolve_jdpatent_job,
+    submit_jdpatent_job,
+)
+from app.services.ocr_cache_service import (
+    delete_pipeline_ocr_text,
+    get_cached_ocr_text,
+    load_pipeline_ocr_text,
+    put_cached_ocr_text,
+    store_pipeline_ocr_text,
+)
+from app.services.ocr_stream_service import delete_stream_pages, load_stream_buffer, save_stream_pages
 from app.services.patent_type_service import detect_patent_type
-from app.services.pdf_service import parse_pdf_via_runpod
-from app.services.s3_service import delete_pdf, generate_presigned_get_url
+from app.services.pdf_service import (
+    fetch_runpod_ocr_status,
+    fetch_runpod_ocr_stream,
+    finish_runpod_stream,
+    raise_runpod_ocr_timeout,
+    read_runpod_stream,
+    resolve_runpod_ocr_status,
+    runpod_ocr_deadline,
+    runpod_poll_interval,
+    submit_runpod_ocr_job,
+)
+from app.services.runpod_webhook_service import claim_waiter, get_webhook_status, register_waiter
+from app.services.s3_service import reset_s3_client, warm_s3_client
+from app.services.storage_service import check_storage_backend_settings
+from app.worker.async_runtime import get_async_runtime, run_pipeline_async
 from app.worker.celery_app import celery_app
+from app.worker.pipeline import (
+    PIPELINE_SOFT_TIME_LIMIT_SECONDS,
+    complete_pipeline,
+    detect_front_page_type,
+    early_patent_type,
+    fail_pipeline,
+    log_pipeline_failed,
+    new_pipeline_context,
+    parsing_meta,
+    reissue_download_url,
+    release_storage,
+)
+
+# 단계 task 하나는 HTTP 호출 한두 번이므로 짧은 제한을 둔다.
+_STAGE_TASK_OPTIONS = {
+    "bind": True,
+    "ignore_result": True,
+    "time_limit": 180,
+    "soft_time_limit": 150,
+}
+
+
+@worker_init.connect
+def _check_worker_settings(**_kwargs) -> None:
+    """PDF 저장소 설정이 잘못됐으면 worker를 시작하지 않는다.
+
+    signal handler의 일반 예외는 Celery가 로그만 남기므로 SystemExit로 막는다.
+    """
+    try:
+        check_storage_backend_settings()
+    except RuntimeError as exc:
+        logger.bind(event="worker_settings_rejected").error(str(exc))
+        raise SystemExit(str(exc)) from exc
+
+
+@worker_process_init.connect
+def _init_worker_process(**_kwargs) -> None:
+    """prefork 자식 프로세스에서 S3 / RunPod / JDPatent client를 새로 만들어 둔다.
+
+    부모 프로세스의 연결 풀을 물려받지 않도록 초기화한 뒤, 첫 task가
+    client 생성 비용을 치르지 않게 미리 생성한다.
+    """
+    reset_s3_client()
+    reset_http_clients()
+    try:
+        warm_s3_client()
+    except Exception as exc:
+        logger.warning(f"S3 client 사전 생성 실패: {exc}")
+    try:
+        warm_http_clients()
+    except Exception as exc:
+        logger.warning(f"HTTP client 사전 생성 실패: {exc}")
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_process(**_kwargs) -> None:
+    close_http_clients()
 
 
+@worker_shutdown.connect
+def _shutdown_worker(**_kwargs) -> None:
+    # solo / threads pool은 worker_process_shutdown이 오지 않으므로 여기서 닫는다.
+    close_http_clients()
+
+
+# time_limit은 단계별 모드의 진입 단계(OCR 캐시 확인 + RunPod 등록) 기준이다.
+# WORKER_RUNTIME=asyncio는 threads pool에서만 시작하며(async_runtime._require_threads_pool),
+# process_patent는 coroutine을 넘기고 바로 끝나고 runtime의 asyncio.timeout이 전체 마감을 맡는다.
 @celery_app.task(
     bind=True,
     name="app.worker.tasks.process_patent",
-    time_limit=1800,
-    soft_time_limit=1500,
+    time_limit=180,
+    soft_time_limit=150,
 )
 def process_patent(
     self,
@@ -25,118 +142,287 @@ def process_patent(
     pdf_url: str | None = None,
     country: str | None = None,
     s3_key: str | None = None,
+    pdf_sha256: str | None = None,
+    storage_backend: str | None = None,
+    page_count: int | None = None,
+    processing_lane: str | None = None,
 ):
-    """특허 PDF 분석 전체 파이프라인.
+    """특허 PDF 분석 파이프라인 진입점.
+
+    OCR 캐시를 확인하고 RunPod 작업을 등록한 뒤 다음 단계 task를 예약하고 끝난다.
+    최종 보고서 JSON은 마지막 단계(check_jdpatent_status)가 이 task_id의 결과로 기록한다.
+    WORKER_RUNTIME=asyncio이면 파이프라인 전체를 asyncio runtime에 넘기고 끝나며,
+    결과는 runtime의 coroutine이 같은 방식으로 기록한다.
 
     Args:
         pdf_bytes_b64: 미사용 (S3 전환 시 제거 예정)
         request_id: API에서 전달받은 요청 추적 ID
         original_filename: 사용자가 업로드한 원본 파일명
-        pdf_url: S3 presigned URL
+        pdf_url: 업로드 시점에 발급된 PDF 다운로드 URL
         country: 특허 국가 코드 ('KR' 또는 'US')
-        s3_key: OCR 완료 후 삭제할 S3 오브젝트 키
+        s3_key: PDF 저장소 키 (OCR 완료 후 삭제, 이름은 하위 호환용)
+        pdf_sha256: 업로드된 PDF의 SHA-256 (중복 제거/캐시 키)
+        storage_backend: PDF를 저장한 저장소 백엔드 이름 (기본: settings.PDF_STORAGE_BACKEND)
+        page_count: 업로드 시 사전 검사(preflight)로 확인한 페이지 수 (모르면 None)
+        processing_lane: 사전 검사로 정한 처리 lane (small / standard / large)
+    """
+    ctx = new_pipeline_context(
+        self.request.id,
+        request_id=request_id,
+        original_filename=original_filename,
+        pdf_url=pdf_url,
+        country=country,
+        s3_key=s3_key,
+        pdf_sha256=pdf_sha256,
+        storage_backend=storage_backend,
+        page_count=page_count,
+        processing_lane=processing_lane,
+    )
+    # API 수락 제어(admission)가 진행 중 파이프라인 수와 평균 처리 시간을 알 수 있도록 기록
+    mark_task_started(ctx["task_id"])
 
-    Returns:
-        최종 보고서 JSON dict
+    if settings.WORKER_RUNTIME == "asyncio":
+        _run_stage(ctx, _start_on_async_runtime, ctx, pdf_bytes_b64)
+    else:
+        _run_stage(ctx, _start_pipeline, ctx, pdf_bytes_b64)
+    # 결과는 마지막 단계(또는 asyncio runtime)가 기록하므로 root task 자신의 결과 저장은 건너뛴다.
+    raise Ignore()
+
+
+def _start_on_async_runtime(ctx: dict[str, Any], pdf_bytes_b64: str | None) -> None:
+    """파이프라인 coroutine을 asyncio runtime에 넘기고 바로 반환한다.
+
+    runtime이 ASYNC_WORKER_MAX_INFLIGHT만큼 차 있으면 자리가 날 때까지 기다리므로, threads pool의
+    스레드는 동시 파이프라인 수가 아니라 메시지 수신 수만큼만 있으면 된다.
     """
-    with logger.contextualize(request_id=request_id, task_id=self.request.id):
-        try:
-            return _run_pipeline(
-                self,
-                pdf_bytes_b64,
-                original_filename=original_filename,
-                pdf_url=pdf_url,
-                country=country,
-                s3_key=s3_key,
-            )
-        except SoftTimeLimitExceeded:
-            logger.bind(
-                event="analysis_pipeline_failed",
-                failure_reason="soft_time_limit_exceeded",
-            ).error("분석 파이프라인 실패")
-            raise
-        except Exception as e:
-            logger.bind(
-                event="analysis_pipeline_failed",
-                failure_reason="unhandled_exception",
-            ).exception(f"분석 파이프라인 예외 발생: {e}")
-            raise
-
-
-def _run_pipeline(
-    task,
-    pdf_bytes_b64: str | None,
-    original_filename: str | None = None,
-    pdf_url: str | None = None,
-    country: str | None = None,
-    s3_key: str | None = None,
-) -> dict:
-    """RunPod 텍스트 추출 후 JDPatent 비동기 작업을 위임."""
+    get_async_runtime().submit(run_pipeline_async, ctx, pdf_bytes_b64)
 
-    task.update_state(state="PARSING", meta={"msg": "PDF 파싱 중"})
 
-    # analyze 단계에서 plain S3 URL이 넘어오더라도, worker에서 presigned URL을
-    # 재생성해 RunPod 접근 403을 방지한다.
-    effective_pdf_url = pdf_url
-    if s3_key:
-        try:
-            effective_pdf_url = generate_presigned_get_url(s3_key)
-            logger.bind(
-                event="s3_presigned_url_regenerated",
-                task_id=task.request.id,
-                s3_key=s3_key,
-            ).debug("S3 presigned URL 재생성 완료")
-        except Exception as exc:
-            logger.bind(
-                event="s3_presigned_url_regenerate_failed",
-                task_id=task.request.id,
-                s3_key=s3_key,
-            ).warning(f"S3 presigned URL 재생성 실패, 기존 URL 사용: {exc}")
+def _start_pipeline(ctx: dict[str, Any], pdf_bytes_b64: str | None) -> None:
+    _store_state(ctx, "PARSING", parsing_meta(ctx))
+
+    # 같은 PDF를 이미 OCR한 적이 있으면 RunPod(GPU) 단계를 건너뛴다.
+    text = get_cached_ocr_text(ctx["pdf_sha256"], ctx["country"])
+    if text is not None:
+        ctx["ocr_cache_hit"] = True
+        release_storage(ctx)
+        _hand_off_ocr_text(ctx, text)
+        _dispatch(detect_patent_type_stage, ctx)
+        return
 
-    dump_file_path = f"{settings.RUNPOD_OCR_DUMP_DIR.rstrip('/')}/{task.request.id}.json"
     try:
-        text = parse_pdf_via_runpod(
+        ctx["runpod_job"] = submit_runpod_ocr_job(
             pdf_bytes_b64,
-            pdf_url=effective_pdf_url,
-            filename=original_filename,
-            dump_file_path=dump_file_path,
-            patent_origin=country,
+            pdf_url=reissue_download_url(ctx),
+            filename=ctx["original_filename"],
+            patent_origin=ctx["country"],
+            page_count=ctx["page_count"],
         )
-    finally:
-        # OCR 성공/실패 무관하게 S3 파일 즉시 삭제
-        if s3_key:
-            delete_pdf(s3_key)
-
-    patent_type_info = detect_patent_type(text)
-
-    task.update_state(state="JDPATENT_SUBMIT", meta={"msg": "JDPatent 작업 등록 중"})
-    submit_jdpatent_job(
-        task_id=task.request.id,
-        raw_text=text,
-        user_id=original_filename or task.request.id,
+    except BaseException:
+        release_storage(ctx)
+        raise
+    _await_runpod(ctx)
+
+
+@celery_app.task(name="app.worker.tasks.check_ocr_status", **_STAGE_TASK_OPTIONS)
+def check_ocr_status(self, ctx: dict[str, Any], claimed: bool = False) -> None:
+    """RunPod OCR 상태를 한 번 확인하고, 진행 중이면 자신을 다시 예약한다.
+
+    완료 webhook을 등록한 작업은 API의 webhook 수신 라우트가 claimed=True로 바로 예약한다.
+    """
+    _run_stage(ctx, _check_ocr_status, ctx, claimed)
+
+
+def _check_ocr_status(ctx: dict[str, Any], claimed: bool) -> None:
+    job = ctx["runpod_job"]
+    if job.get("webhook") and not claimed and not claim_waiter(job["job_id"]):
+        # webhook이 이미 이 작업의 상태 확인을 예약했다 (fallback 조회 생략).
+        return
+    try:
+        text = None
+        status_data = get_webhook_status(job["job_id"]) if job.get("webhook") else None
+        if status_data is None and job.get("stream"):
+            status_data, text = _read_ocr_stream(ctx)
+        if text is None:
+            if status_data is None:
+                status_data = fetch_runpod_ocr_status(job)
+            text = resolve_runpod_ocr_status(job, status_data, dump_file_path=ctx["dump_file_path"])
+        if text is None and time.time() >= runpod_ocr_deadline(job):
+            raise_runpod_ocr_timeout(job)
+    except BaseException:
+        # OCR 성공/실패 무관하게 원본 PDF 즉시 삭제
+        release_storage(ctx)
+        raise
+
+    if text is None:
+        _await_runpod(ctx)
+        return
+
+    release_storage(ctx)
+    put_cached_ocr_text(ctx["pdf_sha256"], ctx["country"], text)
+    _hand_off_ocr_text(ctx, text)
+    if early_patent_type(ctx) is not None:
+        # 스트리밍 중 앞면으로 타입을 이미 감지했으면 감지 단계를 건너뛴다.
+        _dispatch(submit_jdpatent_stage, ctx)
+        return
+    _dispatch(detect_patent_type_stage, ctx)
+
+
+def _hand_off_ocr_text(ctx: dict[str, Any], text: str) -> None:
+    """OCR 텍스트를 한 번 저장하고 context에는 키만 남긴다 (단계 메시지에 본문을 싣지 않는다)."""
+    ctx["ocr_text_key"] = store_pipeline_ocr_text(ctx["task_id"], text)
+    ctx["ocr_text_length"] = len(text)
+
+
+def _read_ocr_stream(ctx: dict[str, Any]) -> tuple[dict[str, Any] | None, str | None]:
+    """/stream에서 새 페이지를 모으고 진행률을 기록한다.
+
+    Returns:
+        (상태 응답, OCR 텍스트). 모든 페이지가 모였으면 텍스트를 반환한다.
+        완료됐지만 페이지 수를 확인할 수 없으면 (None, None)으로 /status 조회에 맡긴다.
+    """
+    job = ctx["runpod_job"]
+    stream_data = fetch_runpod_ocr_stream(job)
+    pages = read_runpod_stream(job, stream_data)
+    added = save_stream_pages(job["job_id"], pages)
+    if added:
+        job["pages_done"] += added
+        detect_front_page_type(ctx, pages)
+        _store_state(ctx, "PARSING", parsing_meta(ctx))
+
+    pages_total = job["pages_total"]
+    if job["last_status"] == "COMPLETED" or (pages_total and job["pages_done"] >= pages_total):
+        buffer = load_stream_buffer(job["job_id"], pages_total)
+        if buffer.complete():
+            delete_stream_pages(job["job_id"])
+            return None, finish_runpod_stream(job, buffer.text(), dump_file_path=ctx["dump_file_path"])
+        if job["last_status"] == "COMPLETED":
+            delete_stream_pages(job["job_id"])
+            return None, None
+    return stream_data, None
+
+
+def _await_runpod(ctx: dict[str, Any]) -> None:
+    """다음 OCR 상태 확인을 예약한다.
+
+    webhook을 등록한 작업은 context를 Redis에 맡겨 webhook이 바로 깨울 수 있게 하고,
+    /status 조회는 fallback 간격으로만 예약한다.
+    """
+    job = ctx["runpod_job"]
+    if job.get("webhook"):
+        register_waiter(job["job_id"], ctx)
+        # 맡기기 전에 webhook이 이미 도착했으면 fallback 간격을 기다리지 않는다.
+        if get_webhook_status(job["job_id"]) is not None and claim_waiter(job["job_id"]):
+            _dispatch(check_ocr_status, ctx, True)
+            return
+    _dispatch(check_ocr_status, ctx, countdown=runpod_poll_interval(job))
+
+
+@celery_app.task(name="app.worker.tasks.detect_patent_type_stage", **_STAGE_TASK_OPTIONS)
+def detect_patent_type_stage(self, ctx: dict[str, Any]) -> None:
+    """OCR 텍스트에서 특허 타입/Kind Code를 감지한다."""
+    _run_stage(ctx, _detect_patent_type, ctx)
+
+
+def _detect_patent_type(ctx: dict[str, Any]) -> None:
+    ctx["patent_type_info"] = detect_patent_type(load_pipeline_ocr_text(ctx["ocr_text_key"]))
+    _dispatch(submit_jdpatent_stage, ctx)
+
+
+@celery_app.task(name="app.worker.tasks.submit_jdpatent_stage", **_STAGE_TASK_OPTIONS)
+def submit_jdpatent_stage(self, ctx: dict[str, Any]) -> None:
+    """JDPatent에 리포트 생성 작업을 등록한다."""
+    _run_stage(ctx, _submit_jdpatent, ctx)
+
+
+def _submit_jdpatent(ctx: dict[str, Any]) -> None:
+    patent_type_info = ctx["patent_type_info"]
+    _store_state(ctx, "JDPATENT_SUBMIT", {"msg": "JDPatent 작업 등록 중"})
+    ctx["jdpatent_job"] = submit_jdpatent_job(
+        task_id=ctx["task_id"],
+        raw_text=load_pipeline_ocr_text(ctx["ocr_text_key"]),
+        user_id=ctx["original_filename"] or ctx["task_id"],
         patent_type=patent_type_info["patent_type"],
         patent_kind_code=patent_type_info["patent_kind_code"],
     )
+    # 텍스트는 이후 단계에서 쓰지 않는다.
+    delete_pipeline_ocr_text(ctx.pop("ocr_text_key"))
+
+    _store_state(ctx, "JDPATENT_PROCESSING", {"msg": "JDPatent 결과 대기 중"})
+    _await_jdpatent(ctx)
+
+
+@celery_app.task(name="app.worker.tasks.check_jdpatent_status", **_STAGE_TASK_OPTIONS)
+def check_jdpatent_status(self, ctx: dict[str, Any], claimed: bool = False) -> None:
+    """JDPatent 작업 상태를 한 번 확인하고, 진행 중이면 자신을 다시 예약한다.
+
+    완료 callback을 등록한 작업은 API의 callback 수신 라우트가 claimed=True로 바로 예약한다.
+    """
+    _run_stage(ctx, _check_jdpatent_status, ctx, claimed)
+
+
+def _check_jdpatent_status(ctx: dict[str, Any], claimed: bool) -> None:
+    job = ctx["jdpatent_job"]
+    task_id = job["task_id"]
+    if job["callback"] and not claimed and not claim_jdpatent_waiter(task_id):
+        # callback이 이미 이 작업의 상태 확인을 예약했다 (fallback 조회 생략).
+        return
+    data = get_jdpatent_callback(task_id) if job["callback"] else None
+    if data is None:
+        data = fetch_jdpatent_job(job)
+    result = resolve_jdpatent_job(job, data)
+    if result is None:
+        # 단계 task가 여러 프로세스에 걸쳐 실행되므로 마감은 등록 시각(wall clock) 기준이다.
+        elapsed = round(time.time() - job["submitted_at"], 3)
+        if elapsed > settings.JDPATENT_POLL_TIMEOUT_SECONDS:
+            raise_jdpatent_timeout(task_id, elapsed)
+        _await_jdpatent(ctx)
+        return
+
+    complete_pipeline(ctx, result)
+
+
+def _await_jdpatent(ctx: dict[str, Any]) -> None:
+    """다음 JDPatent 상태 확인을 예약한다 (callback 사용 시 _await_runpod와 같은 방식)."""
+    job = ctx["jdpatent_job"]
+    task_id = job["task_id"]
+    if job["callback"]:
+        register_jdpatent_waiter(task_id, ctx)
+        if get_jdpatent_callback(task_id) is not None and claim_jdpatent_waiter(task_id):
+            _dispatch(check_jdpatent_status, ctx, True)
+            return
+    _dispatch(check_jdpatent_status, ctx, countdown=jdpatent_poll_interval(job))
+
+
+# ---------------------------------------------------------------------------
+# 단계 공통 처리
+# ---------------------------------------------------------------------------
+def _run_stage(ctx: dict[str, Any], stage, *args) -> None:
+    """단계 함수를 실행하고, 실패하면 root task를 FAILURE로 기록한다.
+
+    실패를 root에 기록한 뒤에는 예외를 다시 던지지 않는다. 단계 task 자체의 결과는
+    저장하지 않으므로(ignore_result) 다시 던지면 같은 실패가 로그에만 두 번 남는다.
+    """
+    with logger.contextualize(request_id=ctx["request_id"], task_id=ctx["task_id"]):
+        try:
+            if time.time() > ctx["deadline"]:
+                raise SoftTimeLimitExceeded(
+                    f"pipeline deadline exceeded ({PIPELINE_SOFT_TIME_LIMIT_SECONDS}s)"
+                )
+            stage(*args)
+        except SoftTimeLimitExceeded as exc:
+            log_pipeline_failed(exc, soft_time_limit=True, stage=stage.__name__)
+            fail_pipeline(ctx, exc)
+        except Exception as exc:
+            log_pipeline_failed(exc, soft_time_limit=False, stage=stage.__name__)
+            fail_pipeline(ctx, exc)
+
+
+def _store_state(ctx: dict[str, Any], state: str, meta: dict[str, Any]) -> None:
+    """root task_id에 진행 상태를 기록한다 (task.update_state와 같은 메타 형식)."""
+    celery_app.backend.store_result(ctx["task_id"], meta, state)
 
-    task.update_state(state="JDPATENT_PROCESSING", meta={"msg": "JDPatent 결과 대기 중"})
-    result = poll_jdpatent_result(task.request.id)
-
-    if isinstance(result, dict):
-        basic_info = result.get("basic_info")
-        if isinstance(basic_info, dict):
-            basic_info["patent_type"] = patent_type_info["patent_type"]
-            basic_info["patent_kind_code"] = patent_type_info["patent_kind_code"]
-        else:
-            result["patent_type"] = patent_type_info["patent_type"]
-            result["patent_kind_code"] = patent_type_info["patent_kind_code"]
-
-    logger.bind(
-        event="analysis_pipeline_succeeded",
-        task_id=task.request.id,
-        ocr_dump_file_path=dump_file_path,
-        patent_type=patent_type_info["patent_type"],
-        patent_kind_code=patent_type_info["patent_kind_code"],
-        ocr_text_length=len(text),
-    ).info("분석 파이프라인 성공")
 
-    return result
+def _dispatch(stage_task, ctx: dict[str, Any], *args, countdown: float | None = None) -> None:
+    # 단계 task는 celery_app의 router가 ctx의 processing_lane에 맞는 단계 큐로 보낸다.
+    stage_task.apply_async(args=(ctx, *args), countdown=countdown)